@@ -1,7 +1,14 @@
 from django.contrib import admin
 
 from common.admin import BaseAdmin
-from .models import MonoBankClient, MonoBankCard, MonoBankStatement
+from .models import (
+    MonoBankClient,
+    MonoBankCard,
+    MonoBankStatement,
+    MonoBankDailyLedger,
+    MonoBankMonthlyLedger,
+    MonoBankPayerLedger,
+)
 from .forms import MonoBankCardAdminForm
 from .services.mono import MonobankService
 from .services.utils import retry_on_many_requests
@@ -17,14 +24,28 @@ class MonoBankClientAdmin(admin.ModelAdmin):
     list_display = ["id", "name", "client_token", "status_token"]
     list_display_links = ("id", "name")
     search_fields = ["name", "client_token"]
-    readonly_fields = ("id", "created_at", "updated_at")
+    readonly_fields = (
+        "id",
+        "webhook_url",
+        "webhook_verified_at",
+        "created_at",
+        "updated_at",
+    )
     # inlines = [MonoCardInline]
     save_on_top = True
     save_as = True
     fieldsets = (
         ("Основні дані", {"fields": ("name", "client_token")}),
+        ("Webhook", {"fields": ("webhook_url", "webhook_verified_at")}),
     ) + BaseAdmin.fieldsets
 
+    def save_model(self, request, obj, form, change):
+        # Новий токен потребує повторної перевірки webhook
+        if change and "client_token" in form.changed_data:
+            obj.webhook_url = None
+            obj.webhook_verified_at = None
+        super().save_model(request, obj, form, change)
+
     @admin.display(description="Статус токену")
     @retry_on_many_requests(retries=3, delay=10)
     def status_token(self, obj):
@@ -76,3 +97,67 @@ class MonoBankStatementAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+class LedgerAdmin(admin.ModelAdmin):
+    """Базова admin-панель для агрегованих підсумків (лише перегляд)"""
+
+    list_filter = ["card"]
+    list_select_related = ["card"]
+
+    @admin.display(description="Надходження, ₴")
+    def income_uah(self, obj):
+        return f"{obj.income / 100:.2f}"
+
+    @admin.display(description="Витрати, ₴")
+    def expense_uah(self, obj):
+        return f"{obj.expense / 100:.2f}"
+
+    @admin.display(description="Комісія, ₴")
+    def commission_uah(self, obj):
+        return f"{obj.commission / 100:.2f}"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MonoBankDailyLedger)
+class MonoBankDailyLedgerAdmin(LedgerAdmin):
+    list_display = [
+        "date",
+        "card",
+        "income_uah",
+        "expense_uah",
+        "commission_uah",
+        "transactions_count",
+    ]
+    date_hierarchy = "date"
+
+
+@admin.register(MonoBankMonthlyLedger)
+class MonoBankMonthlyLedgerAdmin(LedgerAdmin):
+    list_display = [
+        "month",
+        "card",
+        "income_uah",
+        "expense_uah",
+        "commission_uah",
+        "transactions_count",
+    ]
+    date_hierarchy = "month"
+
+
+@admin.register(MonoBankPayerLedger)
+class MonoBankPayerLedgerAdmin(LedgerAdmin):
+    list_display = [
+        "date",
+        "card",
+        "payer_name",
+        "income_uah",
+        "transactions_count",
+    ]
+    search_fields = ["payer_name", "payer_key"]
+    date_hierarchy = "date"
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from bank.services.ledger import MonoBankLedgerService
+
+
+class Command(BaseCommand):
+    help = "Перераховує денні підсумки платників з транзакцій Монобанку"
+
+    def handle(self, *args, **kwargs):
+        count = MonoBankLedgerService.rebuild_payer_ledger()
+        self.stdout.write(
+            self.style.SUCCESS(f"Створено підсумків платників: {count}")
+        )
@@ -15,6 +15,19 @@ class MonoBankClient(BaseModel):
         verbose_name="Токен клієнта",
         help_text="Токен клієнта, для взаємодії з API Монобанку",
     )
+    webhook_url = models.CharField(
+        max_length=300,
+        blank=True,
+        null=True,
+        verbose_name="Webhook URL",
+        help_text="Останній підтверджений webhook клієнта в API Монобанку",
+    )
+    webhook_verified_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Webhook перевірено",
+        help_text="Час останньої перевірки webhook в API Монобанку",
+    )
 
     def __str__(self):
         return self.name
@@ -63,3 +76,132 @@ class MonoBankStatement(models.Model):
         managed = False
         verbose_name = "📜 Операцію"
         verbose_name_plural = "📜 Список операцій"
+
+
+class MonoBankTransaction(models.Model):
+    """Транзакція по картці, отримана через webhook Монобанку"""
+
+    card = models.ForeignKey(
+        MonoBankCard,
+        on_delete=models.CASCADE,
+        verbose_name="Картка",
+        related_name="transactions",
+    )
+    transaction_id = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="ID транзакції",
+    )
+    time = models.DateTimeField(verbose_name="Час транзакції")
+    amount = models.BigIntegerField(
+        verbose_name="Сума", help_text="Сума в копійках"
+    )
+    commission = models.BigIntegerField(
+        default=0, verbose_name="Комісія", help_text="Комісія в копійках"
+    )
+    balance = models.BigIntegerField(
+        default=0, verbose_name="Баланс", help_text="Баланс в копійках"
+    )
+    description = models.CharField(
+        max_length=255, blank=True, verbose_name="Опис"
+    )
+    comment = models.TextField(blank=True, verbose_name="Коментар")
+
+    def __str__(self):
+        return f"{self.card.card_id} - {self.transaction_id}"
+
+    class Meta:
+        ordering = ["-time"]
+        indexes = [models.Index(fields=["card", "time"])]
+        verbose_name = "🧾 Транзакцію"
+        verbose_name_plural = "🧾 Транзакції"
+
+
+class MonoBankLedger(models.Model):
+    """Агреговані показники по картці за період"""
+
+    card = models.ForeignKey(
+        MonoBankCard,
+        on_delete=models.CASCADE,
+        verbose_name="Картка",
+    )
+    income = models.BigIntegerField(
+        default=0, verbose_name="Надходження", help_text="Сума в копійках"
+    )
+    expense = models.BigIntegerField(
+        default=0, verbose_name="Витрати", help_text="Сума в копійках"
+    )
+    transactions_count = models.PositiveIntegerField(
+        default=0, verbose_name="Кількість операцій"
+    )
+    commission = models.BigIntegerField(
+        default=0, verbose_name="Комісія", help_text="Сума в копійках"
+    )
+
+    class Meta:
+        abstract = True
+
+
+class MonoBankDailyLedger(MonoBankLedger):
+    """Денні підсумки по картці"""
+
+    date = models.DateField(verbose_name="Дата")
+
+    def __str__(self):
+        return f"{self.card.card_id} - {self.date}"
+
+    class Meta:
+        ordering = ["-date"]
+        unique_together = ("card", "date")
+        verbose_name = "📅 Денний підсумок"
+        verbose_name_plural = "📅 Денні підсумки"
+
+
+class MonoBankMonthlyLedger(MonoBankLedger):
+    """Місячні підсумки по картці"""
+
+    month = models.DateField(
+        verbose_name="Місяць", help_text="Перший день місяця"
+    )
+
+    def __str__(self):
+        return f"{self.card.card_id} - {self.month:%m.%Y}"
+
+    class Meta:
+        ordering = ["-month"]
+        unique_together = ("card", "month")
+        verbose_name = "🗓 Місячний підсумок"
+        verbose_name_plural = "🗓 Місячні підсумки"
+
+
+class MonoBankPayerLedger(models.Model):
+    """Денні надходження від одного платника на картку"""
+
+    card = models.ForeignKey(
+        MonoBankCard,
+        on_delete=models.CASCADE,
+        verbose_name="Картка",
+    )
+    date = models.DateField(verbose_name="Дата")
+    payer_key = models.CharField(
+        max_length=255,
+        verbose_name="Ключ платника",
+        help_text="Нормалізоване ім'я платника з опису транзакції",
+    )
+    payer_name = models.CharField(max_length=255, verbose_name="Платник")
+    income = models.BigIntegerField(
+        default=0, verbose_name="Надходження", help_text="Сума в копійках"
+    )
+    transactions_count = models.PositiveIntegerField(
+        default=0, verbose_name="Кількість операцій"
+    )
+
+    def __str__(self):
+        return f"{self.payer_name} - {self.date}"
+
+    class Meta:
+        ordering = ["-date"]
+        unique_together = ("card", "date", "payer_key")
+        indexes = [models.Index(fields=["date", "payer_key"])]
+        verbose_name = "🙋 Надходження від платника"
+        verbose_name_plural = "🙋 Надходження від платників"
@@ -0,0 +1,324 @@
+import csv
+import logging
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from bank.models import (
+    MonoBankCard,
+    MonoBankDailyLedger,
+    MonoBankMonthlyLedger,
+    MonoBankPayerLedger,
+    MonoBankTransaction,
+)
+from bank.services.payer_index import normalize_text
+
+logger = logging.getLogger("monobank")
+
+# Службовий префікс в описі вхідного переказу: "Від: Ім'я Прізвище"
+_PAYER_PREFIX_PATTERN = re.compile(r"^\s*(?:від|from)\s*:\s*", re.IGNORECASE)
+_PAYER_TRIM_PATTERN = re.compile(r"[^\w']+")
+
+
+def get_payer_name(description: str) -> str:
+    """Ім'я платника з опису транзакції без службового префікса."""
+    name = _PAYER_PREFIX_PATTERN.sub("", description)
+    return " ".join(name.split()).strip(".,;")
+
+
+def get_payer_key(description: str) -> str:
+    """
+    Стабільний ключ платника: варіанти опису, що відрізняються
+    префіксом, регістром, апострофами чи розділовими знаками, дають
+    однаковий ключ.
+    """
+    name = normalize_text(get_payer_name(description))
+    return " ".join(_PAYER_TRIM_PATTERN.sub(" ", name).split())
+
+
+class MonoBankLedgerService:
+    """Облік транзакцій та інкрементне оновлення агрегатів по картках."""
+
+    @staticmethod
+    def record(
+        account: str, statement_item: Dict[str, Any]
+    ) -> Tuple[Optional[MonoBankTransaction], bool]:
+        """
+        Зберігає транзакцію з webhook та оновлює денні й місячні підсумки.
+        Повторно отримана транзакція не враховується двічі.
+
+        :param account: ID картки в API Монобанку.
+        :param statement_item: Дані транзакції (statementItem).
+        :return: Транзакція (None, якщо її не можна зберегти) та ознака
+            того, що вона отримана вперше.
+        """
+        transaction_id = statement_item.get("id")
+        if not transaction_id:
+            return None, False
+
+        card = MonoBankCard.objects.filter(card_id=account).first()
+        if not card:
+            return None, False
+
+        amount = int(statement_item.get("amount", 0))
+        commission = int(statement_item.get("commissionRate", 0))
+        local_time = timezone.localtime(
+            datetime.fromtimestamp(
+                int(statement_item.get("time", 0)), tz=dt_timezone.utc
+            )
+        )
+
+        with transaction.atomic():
+            statement, created = MonoBankTransaction.objects.get_or_create(
+                transaction_id=transaction_id,
+                defaults={
+                    "card": card,
+                    "time": local_time,
+                    "amount": amount,
+                    "commission": commission,
+                    "balance": int(statement_item.get("balance", 0)),
+                    "description": statement_item.get("description", "")[:255],
+                    "comment": statement_item.get("comment", ""),
+                },
+            )
+            if not created:
+                logger.info("Транзакцію %s вже враховано", transaction_id)
+                return statement, False
+
+            changes = {
+                "income": F("income") + max(amount, 0),
+                "expense": F("expense") + max(-amount, 0),
+                "commission": F("commission") + commission,
+                "transactions_count": F("transactions_count") + 1,
+            }
+            day = local_time.date()
+            daily, _ = MonoBankDailyLedger.objects.get_or_create(
+                card=card, date=day
+            )
+            MonoBankDailyLedger.objects.filter(pk=daily.pk).update(**changes)
+            monthly, _ = MonoBankMonthlyLedger.objects.get_or_create(
+                card=card, month=day.replace(day=1)
+            )
+            MonoBankMonthlyLedger.objects.filter(pk=monthly.pk).update(
+                **changes
+            )
+            if amount > 0:
+                MonoBankLedgerService._add_payer_income(statement)
+
+        return statement, True
+
+    @staticmethod
+    def _add_payer_income(statement: MonoBankTransaction) -> None:
+        """Додає надходження до денного підсумку платника."""
+        payer_key = get_payer_key(statement.description)
+        if not payer_key:
+            return
+        ledger, _ = MonoBankPayerLedger.objects.get_or_create(
+            card_id=statement.card_id,
+            date=timezone.localtime(statement.time).date(),
+            payer_key=payer_key,
+            defaults={"payer_name": get_payer_name(statement.description)},
+        )
+        MonoBankPayerLedger.objects.filter(pk=ledger.pk).update(
+            income=F("income") + statement.amount,
+            transactions_count=F("transactions_count") + 1,
+        )
+
+    @staticmethod
+    def rebuild_payer_ledger() -> int:
+        """
+        Перераховує денні підсумки платників з усіх транзакцій.
+        Повертає кількість створених підсумків.
+        """
+        totals = {}
+        incomes = MonoBankTransaction.objects.filter(amount__gt=0).values_list(
+            "card_id", "time", "description", "amount"
+        )
+        for card_id, moment, description, amount in incomes.iterator(
+            chunk_size=2000
+        ):
+            payer_key = get_payer_key(description)
+            if not payer_key:
+                continue
+            key = (card_id, timezone.localtime(moment).date(), payer_key)
+            ledger = totals.get(key)
+            if ledger is None:
+                ledger = totals[key] = MonoBankPayerLedger(
+                    card_id=card_id,
+                    date=key[1],
+                    payer_key=payer_key,
+                    payer_name=get_payer_name(description),
+                )
+            ledger.income += amount
+            ledger.transactions_count += 1
+
+        with transaction.atomic():
+            MonoBankPayerLedger.objects.all().delete()
+            MonoBankPayerLedger.objects.bulk_create(
+                totals.values(), batch_size=1000
+            )
+        return len(totals)
+
+    @staticmethod
+    def get_monthly_summary(
+        card_id: Optional[str] = None, year: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Повертає місячні підсумки по картках у гривнях."""
+        ledgers = MonoBankMonthlyLedger.objects.all()
+        if card_id:
+            ledgers = ledgers.filter(card__card_id=card_id)
+        if year:
+            ledgers = ledgers.filter(month__year=year)
+
+        return [
+            {
+                "card_id": row["card__card_id"],
+                "month": row["month"].strftime("%Y-%m"),
+                "income": row["income"] / 100,
+                "expense": row["expense"] / 100,
+                "commission": row["commission"] / 100,
+                "count": row["transactions_count"],
+            }
+            for row in ledgers.values(
+                "card__card_id",
+                "month",
+                "income",
+                "expense",
+                "commission",
+                "transactions_count",
+            ).order_by("card__card_id", "month")
+        ]
+
+    @staticmethod
+    def get_top_payers(
+        card_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Повертає платників з найбільшою сумою надходжень.
+        Рахується з денних підсумків платників (MonoBankPayerLedger).
+        """
+        ledgers = MonoBankPayerLedger.objects.all()
+        if card_id:
+            ledgers = ledgers.filter(card__card_id=card_id)
+        if date_from:
+            ledgers = ledgers.filter(date__gte=date_from)
+        if date_to:
+            ledgers = ledgers.filter(date__lte=date_to)
+
+        return [
+            {
+                "payer": row["payer"],
+                "total": row["total"] / 100,
+                "count": row["count"],
+            }
+            for row in ledgers.values("payer_key")
+            .annotate(
+                payer=Max("payer_name"),
+                total=Sum("income"),
+                count=Sum("transactions_count"),
+            )
+            .order_by("-total")[:limit]
+        ]
+
+
+class _Echo:
+    """Псевдо-буфер для csv.writer, який повертає записаний рядок."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+STATEMENT_EXPORT_HEADER = (
+    "Дата",
+    "Картка",
+    "Опис транзакції",
+    "Сума",
+    "Комісія",
+    "Коментар",
+    "Баланс",
+)
+
+
+def iter_statement_csv(
+    card_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    chunk_size: int = 2000,
+) -> Iterator[str]:
+    """
+    Генерує CSV-рядки виписки з бази, не завантажуючи всю історію в пам'ять.
+
+    :param card_id: ID картки в API Монобанку.
+    :param date_from: Початкова дата (включно).
+    :param date_to: Кінцева дата (включно).
+    :param chunk_size: Кількість рядків, що зчитуються з бази за раз.
+    """
+    writer = csv.writer(_Echo())
+    yield "\ufeff" + writer.writerow(STATEMENT_EXPORT_HEADER)
+
+    rows = (
+        _filter_transactions(card_id, date_from, date_to)
+        .order_by("time", "id")
+        .values_list(
+            "time",
+            "card__card_id",
+            "description",
+            "amount",
+            "commission",
+            "comment",
+            "balance",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    for (
+        created,
+        card,
+        description,
+        amount,
+        commission,
+        comment,
+        balance,
+    ) in rows:
+        yield writer.writerow(
+            (
+                timezone.localtime(created).strftime("%d.%m.%Y %H:%M:%S"),
+                card,
+                description,
+                f"{amount / 100:.2f}",
+                f"{commission / 100:.2f}",
+                comment,
+                f"{balance / 100:.2f}",
+            )
+        )
+
+
+def _filter_transactions(
+    card_id: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+):
+    """Фільтрує транзакції за карткою та періодом."""
+    transactions = MonoBankTransaction.objects.all()
+    if card_id:
+        transactions = transactions.filter(card__card_id=card_id)
+    # Межі періоду як datetime, щоб використовувався індекс (card, time)
+    if date_from:
+        transactions = transactions.filter(
+            time__gte=timezone.make_aware(
+                datetime.combine(date_from, time.min)
+            )
+        )
+    if date_to:
+        transactions = transactions.filter(
+            time__lt=timezone.make_aware(
+                datetime.combine(date_to + timedelta(days=1), time.min)
+            )
+        )
+    return transactions
@@ -8,6 +8,7 @@ import monobank
 
 from bank.models import MonoBankCard
 import bank.resources.bot_msg_templates as bmt
+from bank.services.payer_index import get_payer_match_index
 from bank.services.utils import retry_on_many_requests
 
 logger = logging.getLogger("monobank")
@@ -81,6 +82,19 @@ class MonobankService:
 
         return self.create_webhook(webhook_url)
 
+    def reconcile_webhook(self, webhook_url: str) -> bool:
+        """
+        Перевіряє webhook клієнта і створює його лише тоді,
+        коли поточна адреса відрізняється від потрібної.
+        """
+        current_webhook = self.is_webhook_configured()
+
+        if current_webhook == webhook_url:
+            logger.info("Webhook is up to date: %s", current_webhook)
+            return True
+
+        return self.create_webhook(webhook_url)
+
     def get_credit_card_ids(self) -> List[Tuple[str, str]]:
         """Отримує ідентифікатори кредитних рахунків та їх деталі."""
         try:
@@ -284,13 +298,21 @@ class MonoBankChatIDProvider:
             return None
 
     def get_payer_chat_id(self, comment: Optional[str]) -> Optional[int]:
-        """Видобуває числовий ідентифікатор платника з коментаря."""
+        """
+        Визначає платника за коментарем: спершу явний числовий ідентифікатор,
+        далі за індексом учасників клубу (username, ім'я, нечіткий збіг).
+        """
         if not comment:
             return None
 
         if match := self._USER_ID_PATTERN.search(comment):
             return int(match.group(1))
-        return None
+
+        try:
+            return get_payer_match_index().match(comment)
+        except Exception as e:
+            logger.warning("Не вдалося визначити платника за індексом: %s", e)
+            return None
 
 
 class MonoBankContextFormatter:
@@ -0,0 +1,81 @@
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from profiles.models import ClubUser
+
+logger = logging.getLogger("monobank")
+
+
+@dataclass(frozen=True)
+class PayerProfile:
+    """Дані платника для персоналізованого повідомлення."""
+
+    full_name: str
+    username: str
+    photo: Optional[str]
+    is_stale: bool = False
+
+    @property
+    def display_name(self) -> str:
+        """Ім'я для відображення у повідомленні."""
+        if self.username:
+            return f"{self.full_name} (@{self.username})"
+        return self.full_name
+
+
+class PayerProfileResolver:
+    """
+    Визначає дані платника з ClubUser без запитів до Telegram API.
+
+    Дані вважаються застарілими, якщо з моменту останньої синхронізації
+    минуло більше ніж max_age, або синхронізації ще не було.
+    """
+
+    def __init__(self, max_age: Optional[timedelta] = None):
+        self.max_age = max_age or timedelta(
+            seconds=settings.PAYER_PROFILE_MAX_AGE
+        )
+
+    def resolve(self, telegram_id: int) -> Optional[PayerProfile]:
+        """Повертає дані платника або None, якщо користувача немає в базі."""
+        user = (
+            ClubUser.objects.filter(telegram_id=telegram_id)
+            .only(
+                "first_name",
+                "last_name",
+                "telegram_username",
+                "telegram_first_name",
+                "telegram_last_name",
+                "telegram_photo_file_id",
+                "telegram_synced_at",
+            )
+            .first()
+        )
+        if not user:
+            return None
+
+        return PayerProfile(
+            full_name=self._get_full_name(user),
+            username=user.telegram_username or "",
+            photo=user.telegram_photo_file_id,
+            is_stale=self.is_stale(user),
+        )
+
+    def is_stale(self, user: ClubUser) -> bool:
+        """Перевіряє, чи потрібно оновити дані користувача з Telegram."""
+        if not user.telegram_synced_at:
+            return True
+        return timezone.now() - user.telegram_synced_at > self.max_age
+
+    @staticmethod
+    def _get_full_name(user: ClubUser) -> str:
+        """Повне ім'я з Telegram або з профілю клубу."""
+        telegram_name = " ".join(
+            filter(None, [user.telegram_first_name, user.telegram_last_name])
+        )
+        return telegram_name or f"{user.first_name} {user.last_name}".strip()
@@ -0,0 +1,186 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from common.services.cache_versions import get_cache_version
+from profiles.models import ClubUser
+
+PAYER_INDEX_NAMESPACE = "payer_match_index"
+
+# Поля ClubUser, з яких будується індекс
+INDEX_FIELDS = (
+    "telegram_id",
+    "username",
+    "telegram_username",
+    "first_name",
+    "last_name",
+    "telegram_first_name",
+    "telegram_last_name",
+)
+
+_USERNAME_PATTERN = re.compile(r"@([a-z0-9_]{3,32})", re.IGNORECASE)
+_NUMBER_PATTERN = re.compile(r"\b\d{6,12}\b")
+_WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+_APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'", "`": "'", "‘": "'"})
+
+
+def normalize_text(value: str) -> str:
+    """Приводить текст до нижнього регістру та уніфікує апострофи."""
+    return value.casefold().translate(_APOSTROPHES).replace("ё", "е")
+
+
+def extract_words(value: str) -> List[str]:
+    """Повертає слова тексту без цифр та розділових знаків."""
+    return _WORD_PATTERN.findall(normalize_text(value))
+
+
+def trigrams(value: str) -> Set[str]:
+    """Множина триграм рядка (як у pg_trgm: кожне слово з відступами)."""
+    result = set()
+    for word in value.split():
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class PayerMatchIndex:
+    """
+    Індекс учасників клубу для пошуку платника за коментарем до платежу.
+
+    Шукає за Telegram ID, @username та іменем (у будь-якому порядку
+    слів), а також нечітко за триграмами імені. Якщо коментар однаково
+    добре відповідає кільком учасникам, платник не визначається.
+    """
+
+    MIN_SIMILARITY = 0.6
+
+    def __init__(self, users: Iterable[Tuple]):
+        self._telegram_ids: Set[int] = set()
+        self._usernames: Dict[str, int] = {}
+        self._names: Dict[str, Set[int]] = defaultdict(set)
+        self._name_trigrams: Dict[str, Set[str]] = {}
+        self._trigram_names: Dict[str, Set[str]] = defaultdict(set)
+
+        for user in users:
+            self._add_user(*user)
+
+    def _add_user(
+        self,
+        telegram_id: int,
+        username: Optional[str],
+        telegram_username: Optional[str],
+        *names: Optional[str],
+    ) -> None:
+        self._telegram_ids.add(telegram_id)
+        for name in (username, telegram_username):
+            if name:
+                self._usernames[normalize_text(name)] = telegram_id
+
+        first_name, last_name, tg_first_name, tg_last_name = names
+        for first, last in (
+            (first_name, last_name),
+            (tg_first_name, tg_last_name),
+        ):
+            first_words = extract_words(first or "")
+            last_words = extract_words(last or "")
+            if not first_words or not last_words:
+                continue
+            for words in (first_words + last_words, last_words + first_words):
+                key = " ".join(words)
+                self._names[key].add(telegram_id)
+                if key not in self._name_trigrams:
+                    key_trigrams = trigrams(key)
+                    self._name_trigrams[key] = key_trigrams
+                    for trigram in key_trigrams:
+                        self._trigram_names[trigram].add(key)
+
+    def match(self, comment: Optional[str]) -> Optional[int]:
+        """Повертає Telegram ID платника або None."""
+        if not comment:
+            return None
+
+        for username in _USERNAME_PATTERN.findall(comment):
+            if telegram_id := self._usernames.get(normalize_text(username)):
+                return telegram_id
+
+        for number in _NUMBER_PATTERN.findall(comment):
+            if int(number) in self._telegram_ids:
+                return int(number)
+
+        words = extract_words(comment)
+        phrases = [" ".join(words[i : i + 2]) for i in range(len(words) - 1)]
+
+        exact = set()
+        for phrase in phrases:
+            exact.update(self._names.get(phrase, ()))
+        if len(exact) == 1:
+            return exact.pop()
+        if exact:
+            return None
+
+        return self._fuzzy_match(phrases)
+
+    def _fuzzy_match(self, phrases: List[str]) -> Optional[int]:
+        """Нечіткий пошук імені за подібністю триграм (коефіцієнт Жаккара)."""
+        best_score, best_ids = 0.0, set()
+        for phrase in phrases:
+            phrase_trigrams = trigrams(phrase)
+            candidates = set()
+            for trigram in phrase_trigrams:
+                candidates.update(self._trigram_names.get(trigram, ()))
+
+            for key in candidates:
+                key_trigrams = self._name_trigrams[key]
+                score = len(phrase_trigrams & key_trigrams) / len(
+                    phrase_trigrams | key_trigrams
+                )
+                if score > best_score:
+                    best_score, best_ids = score, set(self._names[key])
+                elif score == best_score:
+                    best_ids |= self._names[key]
+
+        if best_score >= self.MIN_SIMILARITY and len(best_ids) == 1:
+            return best_ids.pop()
+        return None
+
+
+_index: Optional[PayerMatchIndex] = None
+_index_version: Optional[int] = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _is_index_fresh(version: int) -> bool:
+    return (
+        _index is not None
+        and _index_version == version
+        and time.monotonic() - _index_built_at < settings.PAYER_INDEX_MAX_AGE
+    )
+
+
+def get_payer_match_index() -> PayerMatchIndex:
+    """
+    Повертає індекс поточного процесу.
+    Індекс перебудовується після зміни версії (зміни профілів) або,
+    якщо версія недоступна чи скинута разом із кешем, не рідше ніж
+    раз на PAYER_INDEX_MAX_AGE секунд.
+    """
+    global _index, _index_version, _index_built_at
+
+    version = get_cache_version(PAYER_INDEX_NAMESPACE)
+    if _is_index_fresh(version):
+        return _index
+
+    with _index_lock:
+        if not _is_index_fresh(version):
+            users = ClubUser.objects.filter(is_active=True).values_list(
+                *INDEX_FIELDS
+            )
+            _index = PayerMatchIndex(users)
+            _index_version = version
+            _index_built_at = time.monotonic()
+    return _index
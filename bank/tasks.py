@@ -1,21 +1,41 @@
 import asyncio
 import logging
-from typing import List, NoReturn, Tuple, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, NoReturn, Tuple, Optional
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from celery import shared_task
 
 from bank.models import MonoBankClient
 from bank.services.mono import MonobankService
+from bank.services.payer import PayerProfile, PayerProfileResolver
+from bank.services.payer_index import PAYER_INDEX_NAMESPACE
+from common.services.cache_versions import bump_cache_version
+from profiles.models import ClubUser
 from robot.config import ROBOT
 from robot.services.extend import TelegramService
 
 logger = logging.getLogger("monobank")
 
+# Мінімальний інтервал між оновленнями даних одного платника (секунди)
+PAYER_REFRESH_LOCK_TIMEOUT = 60 * 10
+
 
 @shared_task(expires=60 * 60)
 def create_monobank_webhooks() -> NoReturn:
-    """Celery-завдання для налаштування вебхуків усіх клієнтів MonoBank."""
+    """
+    Celery-завдання для узгодження вебхуків усіх клієнтів MonoBank.
+
+    Клієнти, чий webhook уже перевірено на поточну адресу протягом
+    MONOBANK_WEBHOOK_VERIFY_TTL, пропускаються без запитів до API.
+    Решта токенів перевіряються паралельно, не більше
+    MONOBANK_WEBHOOK_CONCURRENCY одночасно.
+    """
 
     if not hasattr(settings, "BASE_URL"):
         logger.error("BASE_URL не встановлено в налаштуваннях")
@@ -23,33 +43,70 @@ def create_monobank_webhooks() -> NoReturn:
 
     webhook_path = settings.MONOBANK_WEBHOOK_PATH
     webhook_url = f"{settings.BASE_URL}{webhook_path}"
-    active_clients = MonoBankClient.objects.filter(cards__is_active=True)
-    total_clients = active_clients.count()
-    clients_iterator = active_clients.iterator()
+    verified_after = timezone.now() - timedelta(
+        seconds=settings.MONOBANK_WEBHOOK_VERIFY_TTL
+    )
 
-    if not total_clients:
+    active_clients = MonoBankClient.objects.filter(
+        cards__is_active=True
+    ).distinct()
+    # Один токен може належати кільком записам клієнтів
+    clients_by_token: Dict[str, List[MonoBankClient]] = defaultdict(list)
+    for client in active_clients:
+        clients_by_token[client.client_token].append(client)
+
+    if not clients_by_token:
         logger.info("Немає клієнтів для налаштування вебхуків")
         return
 
-    logger.info("Початок налаштування вебхуків для %s клієнтів", total_clients)
+    pending_tokens = [
+        token
+        for token, clients in clients_by_token.items()
+        if not all(
+            client.webhook_url == webhook_url
+            and client.webhook_verified_at
+            and client.webhook_verified_at >= verified_after
+            for client in clients
+        )
+    ]
+    total_tokens = len(clients_by_token)
+
+    if not pending_tokens:
+        logger.info("Вебхуки всіх %s клієнтів актуальні", total_tokens)
+        return
+
+    logger.info(
+        "Початок налаштування вебхуків: %s з %s клієнтів потребують перевірки",
+        len(pending_tokens),
+        total_tokens,
+    )
+
+    def reconcile(token: str) -> bool:
+        return MonobankService(token).reconcile_webhook(webhook_url)
+
+    with ThreadPoolExecutor(
+        max_workers=settings.MONOBANK_WEBHOOK_CONCURRENCY
+    ) as executor:
+        results = list(executor.map(reconcile, pending_tokens))
 
     success_count, failure_count = 0, 0
-    for client in clients_iterator:
-        if MonobankService(client.client_token).setup_webhook(webhook_url):
-            logger.info(
-                "Webhook успішно налаштовано для клієнта %s", client.name
+    for token, is_success in zip(pending_tokens, results):
+        names = ", ".join(c.name for c in clients_by_token[token])
+        if is_success:
+            MonoBankClient.objects.filter(client_token=token).update(
+                webhook_url=webhook_url,
+                webhook_verified_at=timezone.now(),
             )
+            logger.info("Webhook успішно налаштовано для клієнта %s", names)
             success_count += 1
         else:
-            logger.error(
-                "Помилка налаштування webhook для клієнта %s", client.name
-            )
+            logger.error("Помилка налаштування webhook для клієнта %s", names)
             failure_count += 1
 
     logger.info(
         "Налаштування завершено. Успішно: %s/%s, Помилки: %s",
         success_count,
-        total_clients,
+        len(pending_tokens),
         failure_count,
     )
 
@@ -61,6 +118,9 @@ def send_telegram_message(
     """
     Завдання Celery для надсилання повідомлення.
 
+    Дані платника беруться з ClubUser. Якщо вони застарілі, оновлення
+    з Telegram виконується окремим фоновим завданням.
+
     :param message: текст повідомлення
     :param chat_ids: список чатів, до яких треба надіслати повідомлення
     :param payer_user_id: user_id платника (необов'язковий)
@@ -70,11 +130,12 @@ def send_telegram_message(
         user_id: int, sender
     ) -> Tuple[Optional[str], str, str]:
         """
-        Отримує фото профілю та повне ім'я платника.
+        Отримує фото профілю та повне ім'я платника з Telegram.
+        Використовується лише для платників, яких немає в базі.
 
         :param user_id: Telegram user_id платника
         :param sender: TelegramService інстанс для взаємодії з API
-        :return: Кортеж (фото, повне ім'я)
+        :return: Кортеж (фото, повне ім'я, username)
         """
         try:
             photo = await sender.get_user_profile_photo(user_id)
@@ -86,20 +147,34 @@ def send_telegram_message(
             logger.warning("Не вдалося отримати дані платника: %s", error)
             return None, "", ""
 
+    @sync_to_async
+    def resolve_payer(user_id: int) -> Optional[PayerProfile]:
+        """Отримує дані платника з бази та планує оновлення за потреби."""
+        profile = PayerProfileResolver().resolve(user_id)
+        if profile and profile.is_stale:
+            schedule_payer_profile_refresh(user_id)
+        return profile
+
     async def main() -> None:
         async with ROBOT as bot:
             sender = TelegramService(bot)
 
             # Отримуємо дані платника, якщо user_id передано
-            photo_payer, full_name, username = None, "", ""
+            photo_payer, display_name = None, ""
             if payer_user_id:
-                photo_payer, full_name, username = await get_payer_details(
-                    payer_user_id, sender
-                )
+                profile = await resolve_payer(payer_user_id)
+                if profile:
+                    photo_payer = profile.photo
+                    display_name = profile.display_name
+                else:
+                    photo_payer, full_name, username = await get_payer_details(
+                        payer_user_id, sender
+                    )
+                    display_name = PayerProfile(
+                        full_name=full_name, username=username, photo=None
+                    ).display_name
 
             # Форматуємо повідомлення
-            formatted_username = f"{full_name} (@{username})" if username else ""
-            display_name = formatted_username or full_name
             formatted_message = (
                 message.format(name=display_name) if payer_user_id else message
             )
@@ -109,10 +184,20 @@ def send_telegram_message(
 
             # Надсилання повідомлення
             try:
-                await sender.send_message(
-                    formatted_message, chat_ids, photo_payer
+                is_sent = await sender.send_message(
+                    formatted_message,
+                    chat_ids,
+                    photo_payer,
+                    chat_action=False,
                 )
-                logger.info("Повідомлення успішно надіслано")
+                if not is_sent and photo_payer:
+                    # Збережений file_id міг стати недійсним
+                    schedule_payer_profile_refresh(payer_user_id, force=True)
+                    is_sent = await sender.send_message(
+                        formatted_message, chat_ids, chat_action=False
+                    )
+                if is_sent:
+                    logger.info("Повідомлення успішно надіслано")
             except Exception as e:
                 logger.error("Помилка під час надсилання повідомлення: %s", e)
 
@@ -121,3 +206,50 @@ def send_telegram_message(
         loop.run_until_complete(main())
     except Exception as e:
         logger.error("Помилка виконання основного циклу asyncio: %s", e)
+
+
+def schedule_payer_profile_refresh(user_id: int, force: bool = False) -> None:
+    """
+    Ставить у чергу оновлення даних платника з Telegram.
+    Повторні виклики протягом PAYER_REFRESH_LOCK_TIMEOUT ігноруються.
+    Помилка кешу чи черги лише записується в журнал, щоб не завадити
+    надсиланню повідомлення.
+    """
+    lock_key = f"bank:payer_profile_refresh:{user_id}"
+    try:
+        if force:
+            cache.delete(lock_key)
+        if cache.add(lock_key, 1, timeout=PAYER_REFRESH_LOCK_TIMEOUT):
+            refresh_payer_profile.delay(user_id)
+    except Exception as e:
+        logger.warning(
+            "Не вдалося запланувати оновлення платника %s: %s", user_id, e
+        )
+
+
+@shared_task(expires=60 * 60)
+def refresh_payer_profile(user_id: int) -> NoReturn:
+    """Завдання Celery для оновлення даних платника з Telegram."""
+
+    async def main() -> None:
+        async with ROBOT as bot:
+            sender = TelegramService(bot)
+            chat = await bot.get_chat(user_id)
+            photo = await sender.get_user_profile_photo(user_id)
+
+            await ClubUser.objects.filter(telegram_id=user_id).aupdate(
+                telegram_username=chat.username,
+                telegram_first_name=chat.first_name,
+                telegram_last_name=chat.last_name,
+                telegram_photo_file_id=photo,
+                telegram_synced_at=timezone.now(),
+            )
+            # Оновлення через QuerySet не викликає сигналів моделі
+            await sync_to_async(bump_cache_version)(PAYER_INDEX_NAMESPACE)
+            logger.info("Дані платника %s оновлено з Telegram", user_id)
+
+    try:
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(main())
+    except Exception as e:
+        logger.error("Не вдалося оновити дані платника %s: %s", user_id, e)
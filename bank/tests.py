@@ -0,0 +1,218 @@
+import json
+from datetime import date
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from bank.models import MonoBankCard, MonoBankClient, MonoBankTransaction
+from bank.services import payer_index
+from bank.services.ledger import MonoBankLedgerService
+from bank.services.payer_index import PayerMatchIndex, get_payer_match_index
+from bank.tasks import schedule_payer_profile_refresh
+from profiles.models import ClubUser
+
+
+class PayerMatchIndexTests(SimpleTestCase):
+    """Тести пошуку платника за коментарем до платежу"""
+
+    def setUp(self):
+        self.index = PayerMatchIndex(
+            [
+                (123456701, "ivan", None, "Іван", "Петренко", None, None),
+                (
+                    123456702,
+                    "maria_k",
+                    "mariak",
+                    "Марія",
+                    "Коваленко",
+                    None,
+                    None,
+                ),
+            ]
+        )
+
+    def test_matches_username_with_at_sign(self):
+        self.assertEqual(self.index.match("Внесок від @maria_k"), 123456702)
+        self.assertEqual(self.index.match("@MariaK за травень"), 123456702)
+
+    def test_ignores_bare_username(self):
+        self.assertIsNone(self.index.match("ivan за травень"))
+
+    def test_matches_full_name(self):
+        self.assertEqual(self.index.match("Петренко Іван, внесок"), 123456701)
+
+    def test_matches_telegram_id(self):
+        self.assertEqual(self.index.match("Оплата 123456702"), 123456702)
+        self.assertIsNone(self.index.match("Оплата 999999999"))
+
+
+class PeriodParamsTests(TestCase):
+    """Тести обробки періоду у звітах по виписці"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = ClubUser.objects.create(
+            username="admin", telegram_id=1, is_staff=True
+        )
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_impossible_date_returns_bad_request(self):
+        for name in (
+            "bank_admin:monobank_statement_export",
+            "bank_admin:monobank_analytics",
+        ):
+            with self.subTest(view=name):
+                response = self.client.get(
+                    reverse(name), {"date_from": "2024-02-30"}
+                )
+                self.assertEqual(response.status_code, 400)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+)
+class MonobankWebhookTests(TestCase):
+    """Тести обробки webhook з транзакціями Монобанку"""
+
+    @classmethod
+    def setUpTestData(cls):
+        client = MonoBankClient.objects.create(
+            name="Клуб",
+            client_token="token",
+            webhook_url="https://example.com",
+        )
+        MonoBankCard.objects.create(
+            client=client, card_id="card", chat_id=-100500
+        )
+
+    def post_statement(self):
+        payload = {
+            "type": "StatementItem",
+            "data": {
+                "account": "card",
+                "statementItem": {
+                    "id": "tx-1",
+                    "time": 1714557600,
+                    "description": "Внесок",
+                    "mcc": 4829,
+                    "amount": 50000,
+                    "operationAmount": 50000,
+                    "currencyCode": 980,
+                    "commissionRate": 0,
+                    "cashbackAmount": 0,
+                    "balance": 150000,
+                    "comment": "Внесок",
+                },
+            },
+        }
+        return self.client.post(
+            reverse("bank:monobank_webhook"),
+            json.dumps(payload),
+            content_type="application/json",
+        )
+
+    @mock.patch("bank.views.send_telegram_message.delay")
+    def test_repeated_delivery_is_not_notified_again(self, send_message):
+        self.assertEqual(self.post_statement().status_code, 200)
+        self.assertEqual(send_message.call_count, 1)
+
+        self.assertEqual(self.post_statement().status_code, 200)
+        self.assertEqual(send_message.call_count, 1)
+        self.assertEqual(MonoBankTransaction.objects.count(), 1)
+
+
+class SchedulePayerProfileRefreshTests(SimpleTestCase):
+    """Тести планування оновлення даних платника"""
+
+    @mock.patch("bank.tasks.refresh_payer_profile.delay")
+    @mock.patch("bank.tasks.cache")
+    def test_cache_error_does_not_raise(self, cache, refresh):
+        cache.add.side_effect = ConnectionError("Redis недоступний")
+
+        with self.assertLogs("monobank", level="WARNING"):
+            schedule_payer_profile_refresh(123456789, force=True)
+
+        refresh.assert_not_called()
+
+
+@override_settings(PAYER_INDEX_MAX_AGE=600)
+@mock.patch("bank.services.payer_index.get_cache_version", return_value=0)
+class PayerMatchIndexRebuildTests(TestCase):
+    """Перебудова індексу платників без зміни версії в кеші"""
+
+    def setUp(self):
+        payer_index._index = None
+        self.addCleanup(setattr, payer_index, "_index", None)
+
+    @mock.patch("bank.services.payer_index.time.monotonic")
+    def test_rebuilds_after_max_age(self, monotonic, get_version):
+        monotonic.return_value = 1000.0
+        index = get_payer_match_index()
+
+        monotonic.return_value = 1599.0
+        self.assertIs(get_payer_match_index(), index)
+
+        ClubUser.objects.create(
+            username="late", telegram_id=123456789, first_name="Олена"
+        )
+        monotonic.return_value = 1600.0
+        rebuilt = get_payer_match_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.match("Оплата 123456789"), 123456789)
+
+
+class TopPayersTests(TestCase):
+    """Тести найбільших платників з денних підсумків"""
+
+    @classmethod
+    def setUpTestData(cls):
+        client = MonoBankClient.objects.create(
+            name="Клуб",
+            client_token="token",
+            webhook_url="https://example.com",
+        )
+        MonoBankCard.objects.create(client=client, card_id="card")
+        items = (
+            ("Від: Іван Петренко", 50000, 1714557600),
+            ("ІВАН ПЕТРЕНКО", 30000, 1714644000),
+            ("Від:  Іван Петренко.", 20000, 1717236000),
+            ("Від: Марія Коваленко", 60000, 1714557600),
+            ("Оренда залу", -40000, 1714557600),
+        )
+        for number, (description, amount, moment) in enumerate(items):
+            MonoBankLedgerService.record(
+                "card",
+                {
+                    "id": f"tx-{number}",
+                    "time": moment,
+                    "description": description,
+                    "amount": amount,
+                },
+            )
+
+    def assert_top_payers(self):
+        self.assertEqual(
+            MonoBankLedgerService.get_top_payers("card"),
+            [
+                {"payer": "Іван Петренко", "total": 1000.0, "count": 3},
+                {"payer": "Марія Коваленко", "total": 600.0, "count": 1},
+            ],
+        )
+        self.assertEqual(
+            MonoBankLedgerService.get_top_payers(
+                "card", date_from=date(2024, 5, 2), date_to=date(2024, 5, 31)
+            ),
+            [{"payer": "ІВАН ПЕТРЕНКО", "total": 300.0, "count": 1}],
+        )
+
+    def test_groups_description_variants(self):
+        self.assert_top_payers()
+
+    def test_rebuild_matches_incremental_totals(self):
+        MonoBankLedgerService.rebuild_payer_ledger()
+        self.assert_top_payers()
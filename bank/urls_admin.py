@@ -1,5 +1,9 @@
 from django.urls import path
-from .views import MonobankStatementView
+from .views import (
+    MonobankStatementView,
+    MonobankStatementExportView,
+    MonobankAnalyticsView,
+)
 
 urlpatterns = [
     path(
@@ -7,6 +11,16 @@ urlpatterns = [
         view=MonobankStatementView.as_view(),
         name="monobank_statement",
     ),
+    path(
+        route="monobankstatement/export/",
+        view=MonobankStatementExportView.as_view(),
+        name="monobank_statement_export",
+    ),
+    path(
+        route="monobankanalytics/",
+        view=MonobankAnalyticsView.as_view(),
+        name="monobank_analytics",
+    ),
 ]
 
 app_name = "bank_admin"
@@ -1,15 +1,20 @@
 import calendar
 import json
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import NoReturn, Tuple, Optional, List
 
 import monobank
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.http import JsonResponse
+from django.http import (
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
+from django.utils.dateparse import parse_date
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
@@ -22,6 +27,7 @@ from bank.services.mono import (
     MonoBankChatIDProvider,
     MonoBankContextFormatter,
 )
+from bank.services.ledger import MonoBankLedgerService, iter_statement_csv
 from bank.tasks import send_telegram_message
 from common.utils import get_personalized_compliment_message
 
@@ -111,6 +117,17 @@ class MonobankWebhookView(View):
         transaction_data = self._extract_transaction_data(data)
         formatter = MonoBankMessageFormatter(transaction_data)
 
+        try:
+            statement, created = MonoBankLedgerService.record(
+                transaction_data["account"], transaction_data["statementItem"]
+            )
+        except Exception as e:
+            logger.error("Не вдалося зберегти транзакцію в облік: %s", e)
+        else:
+            # Повторна доставка webhook: сповіщення вже надіслано
+            if statement is not None and not created:
+                return
+
         chat_ids, payer_chat_id = self._get_chat_ids(transaction_data)
         self._send_notifications(formatter, chat_ids, payer_chat_id)
 
@@ -268,3 +285,58 @@ class MonobankStatementView(View):
             logger.warning("Форма не пройшла валідацію: %s", form.errors)
 
         return render(request, self.template_name, context)
+
+
+def _get_period_params(
+    request,
+) -> Tuple[Optional[str], Optional[date], Optional[date]]:
+    """
+    Отримує картку та період з GET-параметрів запиту.
+    Неіснуюча дата (наприклад, 2024-02-30) викликає ValueError.
+    """
+    return (
+        request.GET.get("card_id") or None,
+        parse_date(request.GET.get("date_from", "")),
+        parse_date(request.GET.get("date_to", "")),
+    )
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class MonobankStatementExportView(View):
+    """Потокове вивантаження виписки з бази у форматі CSV."""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            card_id, date_from, date_to = _get_period_params(request)
+        except ValueError:
+            return HttpResponseBadRequest("Некоректна дата періоду")
+        response = StreamingHttpResponse(
+            iter_statement_csv(card_id, date_from, date_to),
+            content_type="text/csv; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="statement_{card_id or "all"}.csv"'
+        )
+        return response
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class MonobankAnalyticsView(View):
+    """Місячні підсумки по картках та найбільші платники у форматі JSON."""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            card_id, date_from, date_to = _get_period_params(request)
+        except ValueError:
+            return HttpResponseBadRequest("Некоректна дата періоду")
+        year = request.GET.get("year")
+        return JsonResponse(
+            {
+                "monthly": MonoBankLedgerService.get_monthly_summary(
+                    card_id, int(year) if year and year.isdigit() else None
+                ),
+                "top_payers": MonoBankLedgerService.get_top_payers(
+                    card_id, date_from, date_to
+                ),
+            }
+        )
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.safestring import mark_safe
 
 from chronopost.models import ScheduledMessage, WeatherNotification
+from chronopost.services.wakeup import notify_schedule_changed
 from common.admin import BaseAdmin
 
 
@@ -50,10 +51,12 @@ class ScheduledMessageAdmin(BaseAdmin):
     @admin.action(description="✅ Активувати вибрані повідомлення")
     def make_active(self, request, queryset):
         queryset.update(is_active=True)
+        notify_schedule_changed()
 
     @admin.action(description="❎ Деактивувати вибрані повідомлення")
     def make_inactive(self, request, queryset):
         queryset.update(is_active=False)
+        notify_schedule_changed()
 
     def get_image(self, obj):
         """Мініатюра зображення"""
@@ -83,6 +86,10 @@ class WeatherNotificationAdmin(BaseAdmin):
             "Основні дані",
             {"fields": ("title", "chat_id", "text", "is_active")},
         ),
+        (
+            "Місце прогнозу",
+            {"fields": (("latitude", "longitude"),)},
+        ),
         (
             "Зображення",
             {
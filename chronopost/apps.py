@@ -5,3 +5,6 @@ class ChronopostConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "chronopost"
     verbose_name = "Регулярні повідомлення"
+
+    def ready(self):
+        import chronopost.signals  # noqa: F401
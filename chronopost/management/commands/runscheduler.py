@@ -0,0 +1,23 @@
+import asyncio
+import logging
+
+from django.core.management.base import BaseCommand
+
+from chronopost.services.wakeup import WakeupScheduler
+from robot.config import ROBOT
+
+logger = logging.getLogger("schedulers")
+
+
+class Command(BaseCommand):
+    help = "Запускає планувальник запланованих повідомлень"
+
+    def handle(self, *args, **kwargs):
+        async def main() -> None:
+            async with ROBOT as bot:
+                await WakeupScheduler(bot).run()
+
+        try:
+            asyncio.run(main())
+        except (KeyboardInterrupt, SystemExit):
+            logger.error("Планувальник був вимкнений!")
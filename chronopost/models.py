@@ -5,7 +5,7 @@ from django.db import models
 from django.utils import timezone
 
 from chronopost.services.url_validator import CustomURLValidator
-from common.models import BaseModel
+from common.models import BaseModel, CoordinatesMixin
 from chronopost.enums import PeriodicityChoices
 
 
@@ -73,10 +73,23 @@ class ScheduledMessage(BaseModel):
         default=True,
         verbose_name="Активне",
     )
+    locked_until = models.DateTimeField(
+        verbose_name="Заблоковано до",
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Час, до якого повідомлення обробляє один з обробників",
+    )
 
     class Meta:
         verbose_name = "Заплановане сповіщення"
         verbose_name_plural = "📩 Заплановані сповіщення"
+        indexes = [
+            models.Index(
+                fields=["is_active", "scheduled_time"],
+                name="scheduled_active_time_idx",
+            ),
+        ]
 
     def __str__(self):
         # Конвертуємо час у локальний часовий пояс
@@ -86,7 +99,7 @@ class ScheduledMessage(BaseModel):
         )
 
 
-class WeatherNotification(BaseModel):
+class WeatherNotification(BaseModel, CoordinatesMixin):
     """Модель для збереження сповіщень про погоду."""
 
     def get_upload_path(self, filename):
@@ -19,3 +19,17 @@ forecast_text = text(
     "🫧 /weather_now",
     sep="\n",
 )
+
+# Підсумок невдалих надсилань прогнозу для адміністратора
+forecast_failures_text = text(
+    hbold("Не вдалося надіслати прогноз погоди ({count}):"),
+    "{failures}",
+    sep="\n",
+)
+
+# Прогноз погоди на час тренування
+training_forecast_text = text(
+    hbold("🌦 Прогноз погоди на тренування «{title}»"),
+    "{forecast}",
+    sep="\n",
+)
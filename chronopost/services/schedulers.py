@@ -1,38 +1,93 @@
 import asyncio
 import logging
-from typing import List, Optional
+from datetime import timedelta
+from typing import List, Optional, Tuple
 from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.types import (
-    FSInputFile,
     InlineKeyboardMarkup,
     InlineKeyboardButton,
 )
 from asgiref.sync import sync_to_async
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from chronopost.enums import PeriodicityChoices
 from chronopost.models import ScheduledMessage
 from common.utils import clean_tag_message
+from robot.services.message_layout import build_message_requests
+from robot.tgbot.services.throttled_sender import ThrottledSender
 
 logger = logging.getLogger("schedulers")
 
 
 class MessageScheduler:
-    def __init__(self, bot: Bot):
+    def __init__(self, bot: Bot, sender: Optional[ThrottledSender] = None):
         self.bot = bot
+        self.sender = sender or ThrottledSender()
         self.now = timezone.now()
 
     @sync_to_async
     def fetch_scheduled_messages(self) -> List[ScheduledMessage]:
-        """Отримує список активних запланованих повідомлень, час яких настав або минув."""
-        messages = ScheduledMessage.objects.filter(
-            scheduled_time__lte=self.now, is_active=True
-        )
-        count = messages.count()
-        if count > 0:
-            logger.info("Отримано %d повідомлень.", count)
-        return list(messages)
+        """Захоплює активні повідомлення, час яких настав або минув."""
+        messages = self.claim_due_messages(self.now)
+        if messages:
+            logger.info("Отримано %d повідомлень.", len(messages))
+        return messages
+
+    @staticmethod
+    def get_due_messages(now):
+        """Активні незахоплені повідомлення, час яких настав або минув."""
+        return ScheduledMessage.objects.filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lte=now),
+            is_active=True,
+            scheduled_time__lte=now,
+        ).order_by("scheduled_time")
+
+    @staticmethod
+    def claim_due_messages(
+        now, limit: Optional[int] = None
+    ) -> List[ScheduledMessage]:
+        """
+        Атомарно захоплює повідомлення до надсилання на час оренди.
+
+        Захоплене повідомлення не потрапить до інших обробників, доки
+        оренда не завершиться, тому кілька обробників можуть працювати
+        паралельно без повторного надсилання. На PostgreSQL
+        використовується SELECT ... FOR UPDATE SKIP LOCKED, на інших
+        базах - умовний UPDATE кожного рядка.
+        """
+        limit = limit or settings.SCHEDULED_MESSAGE_BATCH_SIZE
+        lease_until = now + timedelta(seconds=settings.SCHEDULED_MESSAGE_LEASE)
+        due = MessageScheduler.get_due_messages(now)
+
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                messages = list(
+                    due.select_for_update(skip_locked=True)[:limit]
+                )
+                ScheduledMessage.objects.filter(
+                    id__in=[msg.id for msg in messages]
+                ).update(locked_until=lease_until)
+        else:
+            candidates = due.values_list("id", flat=True)[:limit]
+            claimed = [
+                msg_id
+                for msg_id in candidates
+                if due.filter(id=msg_id).update(locked_until=lease_until)
+            ]
+            messages = list(
+                ScheduledMessage.objects.filter(id__in=claimed).order_by(
+                    "scheduled_time"
+                )
+            )
+
+        for msg in messages:
+            msg.locked_until = lease_until
+        return messages
 
     @staticmethod
     def _create_keyboard(
@@ -53,31 +108,25 @@ class MessageScheduler:
         return None
 
     async def _send_single_message(self, message: ScheduledMessage) -> bool:
-        """Відправляє одне повідомлення та повертає успішність операції."""
+        """
+        Відправляє одне повідомлення та повертає успішність операції.
+        TelegramRetryAfter передається далі для відкладення повідомлення.
+        """
+
+        requests = build_message_requests(
+            self.bot,
+            message.chat_id,
+            clean_tag_message(message.text),
+            photo_path=message.photo.path if message.photo else None,
+            reply_markup=self._create_keyboard(message),
+        )
 
         try:
-            keyboard = self._create_keyboard(message)
-            if message.photo:
-                await self.bot.send_chat_action(
-                    chat_id=message.chat_id, action="upload_photo"
-                )
-                photo_file = FSInputFile(message.photo.path)
-                await self.bot.send_photo(
-                    chat_id=message.chat_id,
-                    photo=photo_file,
-                    caption=clean_tag_message(message.text)[:1024],
-                    reply_markup=keyboard,
-                )
-            else:
-                await self.bot.send_chat_action(
-                    chat_id=message.chat_id, action="typing"
-                )
-                await self.bot.send_message(
-                    chat_id=message.chat_id,
-                    text=clean_tag_message(message.text)[:4096],
-                    reply_markup=keyboard,
-                )
+            for request in requests:
+                await self.sender.send(message.chat_id, request)
             return True
+        except TelegramRetryAfter:
+            raise
         except Exception as e:
             logger.error(
                 "Помилка надсилання повідомлення ID %s (chat ID: %s, text: %s): %s",
@@ -91,25 +140,53 @@ class MessageScheduler:
     async def send_messages(
         self, messages: List[ScheduledMessage]
     ) -> List[ScheduledMessage]:
-        """Асинхронно надсилає повідомлення через Telegram-бота."""
+        """
+        Надсилає повідомлення через Telegram-бота з обмеженням швидкості.
+        Повідомлення, для яких Telegram попросив зачекати, відкладаються.
+        """
 
         tasks = [self._send_single_message(msg) for msg in messages]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        successful = [
-            msg for msg, result in zip(messages, results) if result is True
-        ]
-        failed = [
-            msg for msg, result in zip(messages, results) if result is not True
-        ]
+        successful, postponed, failed = [], [], []
+        for msg, result in zip(messages, results):
+            if result is True:
+                successful.append(msg)
+            elif isinstance(result, TelegramRetryAfter):
+                postponed.append((msg, result.retry_after))
+            else:
+                failed.append(msg)
 
         if successful:
             logger.info("Успішно надіслано %d повідомлень.", len(successful))
+        if postponed:
+            logger.warning("Відкладено %d повідомлень.", len(postponed))
+            await self._postpone_messages(postponed)
         if failed:
             logger.error("Не вдалося надіслати %d повідомлень.", len(failed))
+            await self._release_messages(failed)
 
         return successful
 
+    @sync_to_async
+    def _postpone_messages(
+        self, postponed: List[Tuple[ScheduledMessage, int]]
+    ) -> None:
+        """Продовжує оренду до часу, коли Telegram дозволить надсилання."""
+        now = timezone.now()
+        for msg, retry_after in postponed:
+            msg.locked_until = now + timedelta(seconds=retry_after)
+        ScheduledMessage.objects.bulk_update(
+            [msg for msg, _ in postponed], ["locked_until"]
+        )
+
+    @sync_to_async
+    def _release_messages(self, messages: List[ScheduledMessage]) -> None:
+        """Знімає оренду, щоб повідомлення було повторено наступного разу."""
+        ScheduledMessage.objects.filter(
+            id__in=[msg.id for msg in messages]
+        ).update(locked_until=None)
+
     async def update_periodic_messages(
         self, successful_messages: List[ScheduledMessage]
     ) -> None:
@@ -148,9 +225,10 @@ class MessageScheduler:
             msg.scheduled_time += delta
             while msg.scheduled_time <= self.now:
                 msg.scheduled_time += delta
+            msg.locked_until = None
 
         ScheduledMessage.objects.bulk_update(
-            messages, ["scheduled_time"], batch_size=500
+            messages, ["scheduled_time", "locked_until"], batch_size=500
         )
         logger.info(
             "Оновлено %d повідомлень з новими scheduled_time.", len(messages)
@@ -166,7 +244,7 @@ class MessageScheduler:
 
         ScheduledMessage.objects.filter(
             id__in=[msg.id for msg in messages]
-        ).update(is_active=False)
+        ).update(is_active=False, locked_until=None)
         logger.info("Деактивовані %d разових повідомлень.", len(messages))
 
     async def process_messages(self) -> None:
@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from aiogram import Bot
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from chronopost.models import ScheduledMessage
+from chronopost.services.schedulers import MessageScheduler
+
+logger = logging.getLogger("schedulers")
+
+WAKEUP_CHANNEL = "chronopost:scheduled_messages"
+
+_publisher: Optional[redis.Redis] = None
+
+
+def notify_schedule_changed() -> None:
+    """Сповіщає планувальник про зміну запланованих повідомлень."""
+    global _publisher
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(
+                settings.SCHEDULER_REDIS_URL,
+                socket_timeout=1,
+                socket_connect_timeout=1,
+            )
+        _publisher.publish(WAKEUP_CHANNEL, 1)
+    except Exception as e:
+        logger.warning("Не вдалося сповістити планувальник: %s", e)
+
+
+class WakeupScheduler:
+    """
+    Планувальник, що прокидається в час найближчого повідомлення.
+
+    Тримає в пам'яті мін-купу часу спрацювання активних повідомлень та
+    спить до найближчого з них. Про зміни повідомлень дізнається через
+    Redis pub/sub, тому база не опитується без потреби. На випадок
+    втрачених сповіщень сон обмежено SCHEDULER_MAX_SLEEP.
+    """
+
+    def __init__(self, bot: Bot):
+        self.scheduler = MessageScheduler(bot)
+        self.heap: List[Tuple[datetime, int]] = []
+        self.changed = asyncio.Event()
+        self.max_sleep = settings.SCHEDULER_MAX_SLEEP
+        self.retry_delay = timedelta(seconds=settings.SCHEDULER_RETRY_DELAY)
+        self.not_before: Optional[datetime] = None
+
+    @sync_to_async
+    def _load_fire_times(self) -> List[Tuple[datetime, int]]:
+        """Повертає найближчі часи спрацювання активних повідомлень."""
+        close_old_connections()
+        rows = (
+            ScheduledMessage.objects.filter(is_active=True)
+            .order_by("scheduled_time")
+            .values_list("id", "scheduled_time", "locked_until")[
+                : settings.SCHEDULED_MESSAGE_BATCH_SIZE
+            ]
+        )
+        # Захоплене іншим обробником повідомлення - після завершення оренди
+        return [
+            (max(scheduled_time, locked_until or scheduled_time), msg_id)
+            for msg_id, scheduled_time, locked_until in rows
+        ]
+
+    async def rebuild(self) -> None:
+        """Перебудовує купу часу спрацювання з бази."""
+        self.heap = await self._load_fire_times()
+        heapq.heapify(self.heap)
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """Час найближчого спрацювання з урахуванням затримки повтору."""
+        if not self.heap:
+            return None
+        fire_time = self.heap[0][0]
+        if self.not_before and fire_time < self.not_before:
+            return self.not_before
+        return fire_time
+
+    def _get_sleep_timeout(self) -> float:
+        """Кількість секунд до найближчого спрацювання."""
+        fire_time = self.next_fire_time()
+        if fire_time is None:
+            return self.max_sleep
+        seconds = (fire_time - timezone.now()).total_seconds()
+        return min(max(seconds, 0), self.max_sleep)
+
+    async def fire(self) -> None:
+        """Надсилає повідомлення, час яких настав, та оновлює купу."""
+        await self.scheduler.process_messages()
+        await self.rebuild()
+
+        # Невдалі надсилання повторюються не раніше ніж через retry_delay
+        if self.heap and self.heap[0][0] <= self.scheduler.now:
+            self.not_before = timezone.now() + self.retry_delay
+        else:
+            self.not_before = None
+
+    async def listen(self) -> None:
+        """Слухає канал змін і будить планувальник."""
+        while True:
+            client = aioredis.from_url(settings.SCHEDULER_REDIS_URL)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(WAKEUP_CHANNEL)
+                    # Під час перепідключення зміни могли бути пропущені
+                    self.changed.set()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.changed.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Втрачено підключення до Redis: %s", e)
+                await asyncio.sleep(5)
+            finally:
+                await client.aclose()
+
+    async def run(self) -> None:
+        """Основний цикл планувальника."""
+        logger.info("Планувальник запущено.")
+        listener = asyncio.create_task(self.listen())
+        try:
+            await self.rebuild()
+            while True:
+                timeout = self._get_sleep_timeout()
+                try:
+                    await asyncio.wait_for(self.changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+                if self.changed.is_set():
+                    self.changed.clear()
+                    await self.rebuild()
+                    continue
+
+                fire_time = self.next_fire_time()
+                if fire_time and fire_time <= timezone.now():
+                    await self.fire()
+                elif timeout >= self.max_sleep:
+                    # Контрольне оновлення на випадок втрачених сповіщень
+                    await self.rebuild()
+        finally:
+            listener.cancel()
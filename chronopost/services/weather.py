@@ -2,21 +2,37 @@ import logging
 import aiohttp
 import asyncio
 from datetime import datetime, time
-from typing import Dict, List, Optional, Tuple, Any
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from aiogram import Bot
-from aiogram.types import FSInputFile
+from django.conf import settings
+from django.core.cache import cache
 
 import chronopost.resources.bot_msg_templates as bmt
 from common.utils import clean_tag_message
+from robot.services.message_layout import build_message_requests
+from robot.tgbot.services.throttled_sender import ThrottledSender
 
 logger = logging.getLogger("weather_api")
 
 
 class OpenWeatherClient:
-    """Асинхронний клієнт для роботи з OpenWeatherMap API."""
+    """
+    Асинхронний клієнт для роботи з OpenWeatherMap API.
+
+    Прогноз кешується за координатами в Redis та в пам'яті процесу до
+    наступного оновлення прогнозу провайдером (кожні 3 години).
+    Одночасні запити однакових координат виконують один запит до API.
+    """
 
     BASE_URL = "https://api.openweathermap.org/data/2.5/forecast"
+    CACHE_KEY_TEMPLATE = "weather_forecast:{lat:.3f}:{lon:.3f}"
+
+    # Прогнози в пам'яті процесу: ключ -> (час завершення, дані)
+    _local_cache: Dict[str, Tuple[float, Dict]] = {}
+    # Запити до API, що виконуються: ключ -> задача
+    _inflight: Dict[str, asyncio.Task] = {}
 
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -25,12 +41,59 @@ class OpenWeatherClient:
         self, coordinates: Tuple[float, float]
     ) -> Optional[Dict]:
         """Отримує прогноз погоди для заданих координат."""
-        logger.info("Запит погоди для координат %s", coordinates)
-
         if not self._is_valid_coordinates(coordinates):
             logger.error("Некоректні координати: %s", coordinates)
             return None
 
+        key = self.CACHE_KEY_TEMPLATE.format(
+            lat=coordinates[0], lon=coordinates[1]
+        )
+        if data := await self._get_cached(key):
+            return data
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._fetch_and_cache(key, coordinates))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def fetch_many(
+        self, locations: Iterable[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], Optional[Dict]]:
+        """
+        Отримує прогнози для кількох місць одночасно.
+        Для кожного унікального місця виконується лише один запит.
+        """
+        unique = list(dict.fromkeys(tuple(location) for location in locations))
+        results = await asyncio.gather(
+            *(self.fetch_weather_data(location) for location in unique),
+            return_exceptions=True,
+        )
+
+        forecasts = {}
+        for location, result in zip(unique, results):
+            if isinstance(result, Exception):
+                logger.error("Помилка прогнозу для %s: %s", location, result)
+                result = None
+            forecasts[location] = result
+        return forecasts
+
+    async def _fetch_and_cache(
+        self, key: str, coordinates: Tuple[float, float]
+    ) -> Optional[Dict]:
+        """Запитує прогноз в API та зберігає його в кеші."""
+        data = await self._request_weather_data(coordinates)
+        if data:
+            await self._set_cached(key, data)
+        return data
+
+    async def _request_weather_data(
+        self, coordinates: Tuple[float, float]
+    ) -> Optional[Dict]:
+        """Виконує запит прогнозу до OpenWeatherMap API."""
+        logger.info("Запит погоди для координат %s", coordinates)
+
         params = {
             "lat": coordinates[0],
             "lon": coordinates[1],
@@ -57,6 +120,44 @@ class OpenWeatherClient:
 
         return None
 
+    @staticmethod
+    def _get_cache_timeout() -> int:
+        """Секунди до наступного оновлення прогнозу провайдером."""
+        period = settings.WEATHER_CACHE_PERIOD
+        return max(period - int(datetime.now().timestamp()) % period, 60)
+
+    @classmethod
+    async def _get_cached(cls, key: str) -> Optional[Dict]:
+        """Повертає прогноз з пам'яті процесу або з Redis."""
+        if cached := cls._local_cache.get(key):
+            expires_at, data = cached
+            if expires_at > monotonic():
+                return data
+            cls._local_cache.pop(key, None)
+
+        try:
+            data = await cache.aget(key)
+        except Exception as e:
+            logger.warning("Помилка читання прогнозу з кешу: %s", e)
+            return None
+
+        if data:
+            cls._local_cache[key] = (
+                monotonic() + cls._get_cache_timeout(),
+                data,
+            )
+        return data
+
+    @classmethod
+    async def _set_cached(cls, key: str, data: Dict) -> None:
+        """Зберігає прогноз у пам'яті процесу та в Redis."""
+        timeout = cls._get_cache_timeout()
+        cls._local_cache[key] = (monotonic() + timeout, data)
+        try:
+            await cache.aset(key, data, timeout)
+        except Exception as e:
+            logger.warning("Помилка збереження прогнозу в кеші: %s", e)
+
     @staticmethod
     def _is_valid_coordinates(coordinates: Tuple[float, float]) -> bool:
         """Перевіряє валідність координат."""
@@ -110,6 +211,23 @@ class WeatherFormatter:
             )
         ]
 
+    def format_forecast_at(
+        self, forecasts: List[Dict], moment: datetime
+    ) -> Optional[str]:
+        """
+        Форматує прогноз, найближчий до заданого моменту.
+        Повертає None, якщо прогнозу в межах 3 годин немає.
+        """
+        target = moment.timestamp()
+        nearest = min(
+            forecasts,
+            key=lambda entry: abs(entry.get("dt", 0) - target),
+            default=None,
+        )
+        if not nearest or abs(nearest.get("dt", 0) - target) > 3 * 60 * 60:
+            return None
+        return self._format_forecast(nearest)
+
     def _format_forecast(
         self, entry: Dict[str, Any], include_today_only: bool = False
     ) -> str:
@@ -177,36 +295,34 @@ class WeatherFormatter:
 class TelegramNotifier:
     """Нотифікація через Telegram"""
 
-    def __init__(self, bot: Bot, chat_id: int | str):
+    def __init__(
+        self,
+        bot: Bot,
+        chat_id: int | str,
+        sender: Optional[ThrottledSender] = None,
+    ):
         self.bot = bot
         self.chat_id = chat_id
+        self.sender = sender
 
     async def send_message(self, text: str, poster=None):
-        """Надсилає повідомлення в Telegram"""
+        """
+        Надсилає повідомлення в Telegram.
+        Сесію бота відкриває викликач, помилки передаються йому ж.
+        """
 
         logger.info("Спроба надіслати повідомлення до чату %s", self.chat_id)
 
-        try:
-            async with self.bot as bot:
-                if poster:
-                    photo_file = FSInputFile(poster.path)
-                    await self.bot.send_chat_action(
-                        chat_id=self.chat_id, action="upload_photo"
-                    )
-                    await self.bot.send_photo(
-                        chat_id=self.chat_id,
-                        photo=photo_file,
-                        caption=clean_tag_message(text[:1024]),
-                        show_caption_above_media=True,
-                    )
-                else:
-                    await self.bot.send_chat_action(
-                        chat_id=self.chat_id, action="typing"
-                    )
-                    await bot.send_message(
-                        chat_id=self.chat_id,
-                        text=clean_tag_message(text[:4096]),
-                    )
-            logger.info("Message sent to chat %s", self.chat_id)
-        except Exception as e:
-            logger.error("Failed to send message: %s", e)
+        requests = build_message_requests(
+            self.bot,
+            self.chat_id,
+            clean_tag_message(text),
+            photo_path=poster.path if poster else None,
+            show_caption_above_media=True,
+        )
+        for request in requests:
+            if self.sender:
+                await self.sender.send(self.chat_id, request)
+            else:
+                await request()
+        logger.info("Message sent to chat %s", self.chat_id)
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from chronopost.models import ScheduledMessage
+from chronopost.services.wakeup import notify_schedule_changed
+
+
+@receiver(post_save, sender=ScheduledMessage)
+@receiver(post_delete, sender=ScheduledMessage)
+def wake_up_scheduler(sender, **kwargs):
+    """Будить планувальник після збереження змін у базі."""
+    transaction.on_commit(notify_schedule_changed)
@@ -1,6 +1,8 @@
 import asyncio
 import logging
+from functools import partial
 
+from aiogram.utils.text_decorations import html_decoration as html
 from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.utils import timezone
@@ -18,6 +20,8 @@ from celery import shared_task
 
 from chronopost.services.schedulers import MessageScheduler
 from robot.config import ROBOT
+from robot.tgbot.services.throttled_sender import ThrottledSender
+from training_events.models import TrainingEvent
 
 logger = logging.getLogger("chronopost")
 
@@ -40,21 +44,35 @@ def send_scheduled_messages() -> None:
 
 @shared_task(expires=86000)
 def send_weather_forecast():
-    """Завдання Celery для надсилання прогнозу погоди."""
+    """
+    Завдання Celery для надсилання прогнозу погоди.
+
+    Прогноз запитується один раз для кожного унікального місця підписок
+    та сьогоднішніх тренувань. До опублікованих тренувань додається
+    прогноз на час їх початку.
+    """
 
     @sync_to_async
     def fetch_receivers():
         """Асинхронно отримуємо активних підписників."""
         return list(WeatherNotification.objects.filter(is_active=True))
 
-    async def fetch_and_process_weather():
-        """Отримання та обробка прогнозу погоди."""
-
-        api_client = OpenWeatherClient(settings.WEATHER_API_KEY)
-        raw_data = await api_client.fetch_weather_data(
-            settings.CITY_COORDINATES
+    @sync_to_async
+    def fetch_trainings():
+        """Сьогоднішні тренування, опубліковані в чаті."""
+        now = timezone.now()
+        return list(
+            TrainingEvent.objects.filter(
+                date__gt=now,
+                date__date=timezone.localdate(now),
+                is_cancelled=False,
+                message_info__isnull=False,
+            ).select_related("message_info")
         )
 
+    def process_weather(raw_data):
+        """Обробка прогнозу погоди для одного місця."""
+
         if not raw_data:
             logger.warning("No data from API")
             return
@@ -84,45 +102,148 @@ def send_weather_forecast():
             "formatted_data": formatted_data,
         }
 
-    async def send_notifications(receivers, weather_data):
-        """Надсилання повідомлень користувачам."""
+    def build_notifications(receivers, forecasts):
+        """Повідомлення підписникам, для місць яких очікуються опади."""
 
+        weather_by_location = {
+            location: process_weather(raw_data)
+            for location, raw_data in forecasts.items()
+        }
+        notifications = []
         for recipient in receivers:
-            notifier = TelegramNotifier(ROBOT, recipient.chat_id)
-            message = bmt.forecast_text.format(
-                recipient_text=recipient.text,
-                city=weather_data["city"],
-                country=weather_data["country"],
-                current_date=weather_data["current_date"],
-                formatted_data="\n\n".join(weather_data["formatted_data"]),
+            weather_data = weather_by_location.get(recipient.coordinates)
+            if not weather_data:
+                continue
+            notifications.append(
+                (
+                    recipient.chat_id,
+                    bmt.forecast_text.format(
+                        recipient_text=recipient.text,
+                        city=weather_data["city"],
+                        country=weather_data["country"],
+                        current_date=weather_data["current_date"],
+                        formatted_data="\n\n".join(
+                            weather_data["formatted_data"]
+                        ),
+                    ),
+                    recipient.poster,
+                )
             )
+        return notifications
+
+    def build_training_forecasts(trainings, forecasts):
+        """Прогнози на час тренувань у відповідь на їх повідомлення."""
 
-            try:
-                await notifier.send_message(
-                    text=message, poster=recipient.poster
+        formatter = WeatherFormatter()
+        training_forecasts = []
+        for training in trainings:
+            raw_data = forecasts.get(training.coordinates) or {}
+            forecast = formatter.format_forecast_at(
+                raw_data.get("list", []), training.date
+            )
+            if forecast:
+                training_forecasts.append(
+                    (
+                        training.message_info,
+                        bmt.training_forecast_text.format(
+                            title=html.quote(training.title),
+                            forecast=forecast,
+                        ),
+                    )
                 )
-            except Exception as e:
-                logger.error(
-                    f"Не вдалося надіслати повідомлення {recipient.chat_id}: {e}"
+        return training_forecasts
+
+    async def send_notifications(bot, sender, notifications):
+        """
+        Паралельне надсилання повідомлень підписникам через одну сесію бота.
+        Повертає список невдалих надсилань.
+        """
+
+        results = await asyncio.gather(
+            *(
+                TelegramNotifier(bot, chat_id, sender).send_message(
+                    text=message, poster=poster
                 )
-                await ROBOT.send_message(
-                    chat_id=settings.ADMINS_BOT[0],
-                    text=f"Не вдалося надіслати повідомлення {recipient.chat_id}: {e}",
+                for chat_id, message, poster in notifications
+            ),
+            return_exceptions=True,
+        )
+        return [
+            f"{chat_id}: {result}"
+            for (chat_id, _, _), result in zip(notifications, results)
+            if isinstance(result, Exception)
+        ]
+
+    async def send_training_forecasts(bot, sender, training_forecasts):
+        """Надсилання прогнозів до повідомлень тренувань."""
+
+        results = await asyncio.gather(
+            *(
+                sender.send(
+                    message_info.chat_id,
+                    partial(
+                        bot.send_message,
+                        chat_id=message_info.chat_id,
+                        text=text,
+                        reply_to_message_id=message_info.message_id,
+                    ),
                 )
+                for message_info, text in training_forecasts
+            ),
+            return_exceptions=True,
+        )
+        return [
+            f"{message_info.chat_id} (тренування): {result}"
+            for (message_info, _), result in zip(training_forecasts, results)
+            if isinstance(result, Exception)
+        ]
+
+    async def report_failures(bot, failures):
+        """Один звіт про невдалі надсилання для адміністратора."""
+
+        logger.error(
+            "Не вдалося надіслати %d повідомлень: %s",
+            len(failures),
+            "; ".join(failures),
+        )
+        await bot.send_message(
+            chat_id=settings.ADMINS_BOT[0],
+            text=bmt.forecast_failures_text.format(
+                count=len(failures),
+                failures=html.quote("\n".join(failures)[:3500]),
+            ),
+        )
 
     async def main():
-        receivers = await fetch_receivers()
-        if not receivers:
+        receivers, trainings = await asyncio.gather(
+            fetch_receivers(), fetch_trainings()
+        )
+        if not receivers and not trainings:
             logger.info("There are no active subscriptions")
             return {"status": "success", "message": "Немає активних підписок"}
 
-        weather_data = await fetch_and_process_weather()
-        if not weather_data:
+        api_client = OpenWeatherClient(settings.WEATHER_API_KEY)
+        forecasts = await api_client.fetch_many(
+            [item.coordinates for item in (*receivers, *trainings)]
+        )
+        if not any(forecasts.values()):
             return {
                 "status": "error",
                 "message": "Помилка обробки даних погоди",
             }
-        await send_notifications(receivers, weather_data)
+
+        notifications = build_notifications(receivers, forecasts)
+        training_forecasts = build_training_forecasts(trainings, forecasts)
+        sender = ThrottledSender()
+
+        async with ROBOT as bot:
+            failures = await send_notifications(bot, sender, notifications)
+            failures += await send_training_forecasts(
+                bot, sender, training_forecasts
+            )
+            if failures:
+                await report_failures(bot, failures)
+
         return {
             "status": "success",
             "message": "Повідомлення успішно надіслано",
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from chronopost.models import ScheduledMessage
+from chronopost.services.schedulers import MessageScheduler
+from common.testing import QueryPlanTestMixin
+
+
+class ScheduledMessageIndexTests(QueryPlanTestMixin, TestCase):
+    """Вибірка повідомлень до надсилання використовує індекс"""
+
+    ROWS = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now()
+        ScheduledMessage.objects.bulk_create(
+            ScheduledMessage(
+                title=f"Повідомлення {i}",
+                chat_id=1,
+                scheduled_time=cls.now + timedelta(hours=i - 20),
+                text="Текст",
+                is_active=i % 3 == 0,
+            )
+            for i in range(cls.ROWS)
+        )
+        cls.analyze()
+
+    def test_due_scheduled_messages(self):
+        queryset = MessageScheduler.get_due_messages(self.now)
+        self.assertUsesIndex(queryset, "scheduled_active_time_idx")
@@ -5,3 +5,6 @@ class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "common"
     verbose_name = "Загальні моделі"
+
+    def ready(self):
+        import common.signals  # noqa: F401
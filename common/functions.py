@@ -0,0 +1,26 @@
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+class LiteralExtractMixin:
+    """
+    Частина дати, що підставляється в SQL SQLite літералом.
+
+    Django на SQLite компілює Extract у django_date_extract(%s, поле) і
+    передає назву частини дати параметром. Індекс за виразом SQLite
+    зберігає вираз із літералом, а планувальник порівнює вирази
+    текстуально, тож запит із параметром індекс не використовує.
+    lookup_name - константа класу ("month", "day"), тому підставляти її
+    в SQL безпечно. На інших базах даних вираз не змінюється.
+    """
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.lhs)
+        return f"django_date_extract('{self.lookup_name}', {sql})", params
+
+
+class BirthMonth(LiteralExtractMixin, ExtractMonth):
+    """Місяць дати, придатний для індексу за виразом"""
+
+
+class BirthDay(LiteralExtractMixin, ExtractDay):
+    """День дати, придатний для індексу за виразом"""
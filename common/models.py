@@ -1,3 +1,6 @@
+from typing import Tuple
+
+from django.conf import settings
 from django.db import models
 
 from common.enums import GreetingTypeChoices
@@ -19,6 +22,33 @@ class BaseModel(models.Model):
         abstract = True
 
 
+class CoordinatesMixin(models.Model):
+    """Координати місця для прогнозу погоди"""
+
+    latitude = models.FloatField(
+        verbose_name="Широта",
+        blank=True,
+        null=True,
+        help_text="Якщо не вказано, використовуються координати міста",
+    )
+    longitude = models.FloatField(
+        verbose_name="Довгота",
+        blank=True,
+        null=True,
+        help_text="Якщо не вказано, використовуються координати міста",
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def coordinates(self) -> Tuple[float, float]:
+        """Координати місця або координати міста за замовчуванням."""
+        if self.latitude is not None and self.longitude is not None:
+            return self.latitude, self.longitude
+        return tuple(settings.CITY_COORDINATES)
+
+
 class Compliment(BaseModel):
     """ Модель для збереження комплементів """
 
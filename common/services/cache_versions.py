@@ -0,0 +1,56 @@
+import logging
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+
+logger = logging.getLogger("common")
+
+VERSION_KEY_TEMPLATE = "cache_version:{namespace}"
+
+
+def get_cache_version(namespace: str) -> int:
+    """
+    Повертає поточну версію даних простору імен.
+    Версія спільна для всіх процесів, оскільки зберігається в кеші.
+    """
+    key = VERSION_KEY_TEMPLATE.format(namespace=namespace)
+    try:
+        return cache.get_or_set(key, 1, timeout=None)
+    except Exception as e:
+        logger.warning("Не вдалося отримати версію кешу %s: %s", key, e)
+        return 0
+
+
+def get_cache_versions(namespaces: Iterable[str]) -> Dict[str, int]:
+    """
+    Повертає версії кількох просторів імен за одне звернення до кешу.
+    Відсутні версії створюються, не перезаписуючи щойно збільшені.
+    """
+    keys = {
+        VERSION_KEY_TEMPLATE.format(namespace=namespace): namespace
+        for namespace in namespaces
+    }
+    try:
+        versions = cache.get_many(list(keys))
+        missing = [key for key in keys if key not in versions]
+        for key in missing:
+            cache.add(key, 1, timeout=None)
+        if missing:
+            versions.update(cache.get_many(missing))
+    except Exception as e:
+        logger.warning("Не вдалося отримати версії кешу: %s", e)
+        return {namespace: 0 for namespace in keys.values()}
+    return {
+        namespace: versions.get(key, 0) for key, namespace in keys.items()
+    }
+
+
+def bump_cache_version(namespace: str) -> None:
+    """Збільшує версію простору імен, що робить застарілими всі його дані."""
+    key = VERSION_KEY_TEMPLATE.format(namespace=namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+    except Exception as e:
+        logger.warning("Не вдалося оновити версію кешу %s: %s", key, e)
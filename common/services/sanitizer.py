@@ -0,0 +1,109 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from bleach.sanitizer import Cleaner
+
+# Теги, дозволені Telegram у режимі HTML
+DEFAULT_ALLOWED_TAGS = frozenset(
+    ["b", "strong", "i", "em", "u", "ins", "s", "strike", "a", "code", "pre"]
+)
+
+# Символи та HTML-сутності, що замінюються після очищення
+DEFAULT_REPLACE_SYMBOLS = {
+    "&nbsp;": " ",
+    "\u00a0": " ",
+    "&ndash;": "-",
+    "\u2013": "-",
+    "&quot;": '"',
+    "&rsquo;": "'",
+    "&bull;": "*",
+    "&mdash;": "-",
+}
+
+# Максимальна кількість очищених текстів у пам'яті процесу
+CACHE_SIZE = 512
+
+_BR_PATTERN = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_NEWLINE_SPACES_PATTERN = re.compile(r"\s*\n\s*")
+
+_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=16)
+def _get_cleaner(tags: FrozenSet[str]) -> Cleaner:
+    """Екземпляр bleach.Cleaner для набору дозволених тегів."""
+    return Cleaner(tags=tags, strip=True)
+
+
+@lru_cache(maxsize=16)
+def _get_symbols_pattern(symbols: Tuple[Tuple[str, str], ...]):
+    """Регулярний вираз для заміни всіх символів за один прохід."""
+    keys = sorted((key for key, _ in symbols), key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, keys)))
+
+
+def sanitize_html(
+    text: str,
+    allowed_tags: Optional[Iterable[str]] = None,
+    replace_symbols: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Очищає HTML для надсилання в Telegram.
+
+    Результат запам'ятовується за хешем тексту, тому той самий текст,
+    надісланий у кілька чатів, очищається один раз.
+
+    :param text: Вхідний HTML-текст.
+    :param allowed_tags: Дозволені HTML-теги.
+    :param replace_symbols: Словник символів для заміни.
+    :return: Очищений текст.
+    """
+    tags = (
+        DEFAULT_ALLOWED_TAGS
+        if allowed_tags is None
+        else frozenset(allowed_tags)
+    )
+    symbols = tuple(
+        (
+            DEFAULT_REPLACE_SYMBOLS
+            if replace_symbols is None
+            else replace_symbols
+        ).items()
+    )
+    key = (
+        hashlib.blake2b(text.encode(), digest_size=16).digest(),
+        tags,
+        symbols,
+    )
+
+    with _lock:
+        if (cleaned := _cache.get(key)) is not None:
+            _cache.move_to_end(key)
+            return cleaned
+
+        cleaned = _sanitize(text, tags, symbols)
+        _cache[key] = cleaned
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return cleaned
+
+
+def _sanitize(
+    text: str, tags: FrozenSet[str], symbols: Tuple[Tuple[str, str], ...]
+) -> str:
+    """Очищення тексту без кешування."""
+    content = _BR_PATTERN.sub("\n", text)
+    content = _NEWLINE_SPACES_PATTERN.sub("\n", content)
+    content = _get_cleaner(tags).clean(content)
+
+    if symbols:
+        replacements = dict(symbols)
+        content = _get_symbols_pattern(symbols).sub(
+            lambda match: replacements[match.group(0)], content
+        )
+    return content
@@ -0,0 +1,77 @@
+import random
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from common.enums import GreetingTypeChoices
+from common.models import Compliment, Greeting
+from common.services.cache_versions import get_cache_version
+
+COMPLIMENT_POOL_NAMESPACE = "text_pool:compliment"
+GREETING_POOL_NAMESPACE = "text_pool:greeting"
+
+
+class TextPool:
+    """
+    Набір текстів для випадкового вибору без запитів до бази.
+
+    Вибір уникає нещодавно використаних текстів: останні recent_size
+    обраних записів не повторюються, доки в пулі є інші варіанти.
+    """
+
+    def __init__(self, items: List[Tuple[int, str]], recent_size: int = 10):
+        self.items = items
+        self._recent = deque(maxlen=min(recent_size, len(items) // 2))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def choice(self) -> Optional[str]:
+        """Повертає випадковий текст або None, якщо пул порожній."""
+        if not self.items:
+            return None
+
+        with self._lock:
+            while True:
+                item_id, text = random.choice(self.items)
+                if item_id not in self._recent:
+                    break
+            if self._recent.maxlen:
+                self._recent.append(item_id)
+        return text
+
+
+_pools: Dict[Tuple[str, Optional[str]], Tuple[int, TextPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(namespace: str, queryset, key: Optional[str] = None) -> TextPool:
+    """Повертає пул процесу, перечитуючи його лише після зміни версії."""
+    version = get_cache_version(namespace)
+    cached = _pools.get((namespace, key))
+    if cached and cached[0] == version:
+        return cached[1]
+
+    with _pools_lock:
+        cached = _pools.get((namespace, key))
+        if not cached or cached[0] != version:
+            pool = TextPool(list(queryset.values_list("id", "text")))
+            cached = _pools[(namespace, key)] = (version, pool)
+    return cached[1]
+
+
+def get_compliment_pool() -> TextPool:
+    """Пул усіх компліментів."""
+    return _get_pool(COMPLIMENT_POOL_NAMESPACE, Compliment.objects.all())
+
+
+def get_greeting_pool(
+    event_type: str = GreetingTypeChoices.BIRTHDAY,
+) -> TextPool:
+    """Пул активних привітань певного типу події."""
+    return _get_pool(
+        GREETING_POOL_NAMESPACE,
+        Greeting.objects.filter(event_type=event_type, is_active=True),
+        key=event_type,
+    )
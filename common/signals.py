@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.models import Compliment, Greeting
+from common.services.cache_versions import bump_cache_version
+from common.services.text_pool import (
+    COMPLIMENT_POOL_NAMESPACE,
+    GREETING_POOL_NAMESPACE,
+)
+
+
+@receiver(post_save, sender=Compliment)
+@receiver(post_delete, sender=Compliment)
+def invalidate_compliment_pool(sender, **kwargs):
+    """Позначає пул компліментів застарілим."""
+    bump_cache_version(COMPLIMENT_POOL_NAMESPACE)
+
+
+@receiver(post_save, sender=Greeting)
+@receiver(post_delete, sender=Greeting)
+def invalidate_greeting_pool(sender, **kwargs):
+    """Позначає пули привітань застарілими."""
+    bump_cache_version(GREETING_POOL_NAMESPACE)
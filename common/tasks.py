@@ -23,13 +23,7 @@ def send_birthday_greetings():
 
     @sync_to_async
     def fetch_users():
-        return list(
-            ClubUser.objects.filter(
-                data_of_birth__day=today.day,
-                data_of_birth__month=today.month,
-                is_active=True,
-            )
-        )
+        return list(ClubUser.get_birthday_users(today))
 
     async def format_user_display_name(
         user: ClubUser, telegram_service: TelegramService
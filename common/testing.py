@@ -0,0 +1,22 @@
+from django.db import connection
+
+
+class QueryPlanTestMixin:
+    """Перевірка плану запиту (EXPLAIN) у тестах індексів"""
+
+    @staticmethod
+    def analyze():
+        """Оновлює статистику таблиць для планувальника."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        if connection.vendor == "sqlite":
+            self.assertIn(f"USING INDEX {index_name}", plan)
+        elif connection.vendor == "postgresql":
+            self.assertRegex(
+                plan, rf"(Bitmap )?Index (Only )?Scan (using|on) {index_name}"
+            )
+        else:
+            self.skipTest(f"EXPLAIN для {connection.vendor} не перевіряється")
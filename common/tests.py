@@ -0,0 +1,13 @@
+from django.test import SimpleTestCase
+
+from common.utils import get_random_birthday_sticker
+
+
+class BirthdayStickerTests(SimpleTestCase):
+    """Тести вибору наліпки для привітання з днем народження"""
+
+    def test_returns_sticker_file_id(self):
+        sticker = get_random_birthday_sticker()
+
+        self.assertIsInstance(sticker, str)
+        self.assertTrue(sticker.startswith("CAACAgIAAxkBAAJa"))
@@ -1,11 +1,10 @@
-import re
+import random
 import uuid
 
-import bleach
-
 from bank.resources.bot_msg_templates import compliment_text
 from common.enums import GreetingTypeChoices
-from common.models import Compliment, Greeting
+from common.services.sanitizer import sanitize_html
+from common.services.text_pool import get_compliment_pool, get_greeting_pool
 
 
 def clean_tag_message(
@@ -19,51 +18,7 @@ def clean_tag_message(
     :param replace_symbols: Словник для заміни символів. Ключ - символ для заміни, значення - на що заміняти.
     :return: Очищений текст.
     """
-
-    # Замінюємо <br> на \n
-    content = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-
-    # Очищаємо зайві пробіли навколо переносів
-    content = re.sub(r"\n\s+", "\n", content)
-    content = re.sub(r"\s+\n", "\n", content)
-
-    # За замовчуванням дозволяються певні теги
-    if allowed_tags is None:
-        allowed_tags = [
-            "b",
-            "strong",
-            "i",
-            "em",
-            "u",
-            "ins",
-            "s",
-            "strike",
-            "a",
-            "code",
-            "pre",
-        ]
-
-    # За замовчуванням замінюємо певні символи
-    if replace_symbols is None:
-        replace_symbols = {
-            "&nbsp;": " ",
-            "\u00a0": " ",
-            "&ndash;": "-",
-            "\u2013": "-",
-            "&quot;": '"',
-            "&rsquo;": "'",
-            "&bull;": "*",
-            "&mdash;": "-",
-        }
-
-    # Очищення HTML-тегів
-    cleaned_text = bleach.clean(content, tags=allowed_tags, strip=True)
-
-    # Замінюємо символи за допомогою словника
-    for symbol, replacement in replace_symbols.items():
-        cleaned_text = cleaned_text.replace(symbol, replacement)
-
-    return cleaned_text
+    return sanitize_html(text, allowed_tags, replace_symbols)
 
 
 def generate_upload_filename(instance, filename: str) -> str:
@@ -73,34 +28,19 @@ def generate_upload_filename(instance, filename: str) -> str:
     return new_filename
 
 
-from django.db.models import Count
-import random
-
-
 def get_random_compliment() -> str:
     """Функція для отримання випадкового компліменту з бази даних."""
-    count = Compliment.objects.aggregate(count=Count("id"))["count"]
-
-    if count and count > 0:
-        random_index = random.randint(0, count - 1)
-        compliment = Compliment.objects.all()[random_index]
-        return compliment.text
-    return "Дякуємо, що ми разом! Ви чудові!"
+    compliment = get_compliment_pool().choice()
+    return compliment or "Дякуємо, що ми разом! Ви чудові!"
 
 
-def get_random_greeting() -> str:
+def get_random_greeting(event_type: str = GreetingTypeChoices.BIRTHDAY) -> str:
     """Функція для отримання випадкового привітання з бази даних."""
-    count = Greeting.objects.filter(
-        event_type=GreetingTypeChoices.BIRTHDAY, is_active=True
-    ).aggregate(count=Count("id"))["count"]
-
-    if count and count > 0:
-        random_index = random.randint(0, count - 1)
-        greeting = Greeting.objects.filter(
-            event_type=GreetingTypeChoices.BIRTHDAY, is_active=True
-        )[random_index]
-        return greeting.text
-    return "Зі святом! Нехай цей день буде сповнений тепла, посмішок і незабутніх емоцій!"
+    greeting = get_greeting_pool(event_type).choice()
+    return (
+        greeting
+        or "Зі святом! Нехай цей день буде сповнений тепла, посмішок і незабутніх емоцій!"
+    )
 
 
 def get_personalized_compliment_message() -> str:
@@ -1,3 +1,6 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from django.views import generic
 
 from training_events.services.statistics_service import StatisticsService
@@ -9,14 +12,16 @@ class HomeView(generic.TemplateView):
 
     template_name = "club/home.html"
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    async def get(self, request, *args, **kwargs):
+        # Користувач потрібен для карток, тож завантажуємо його заздалегідь
+        request.user = await request.auser()
+        context = self.get_context_data(**kwargs)
 
-        # Найближчі тренування (максимум 6)
-        context["upcoming_trainings"] = (
-            TrainingService.get_upcoming_trainings(limit=6)
+        # Картки найближчих тренувань (максимум 6) та загальна статистика
+        # клубу не залежать одне від одного
+        context["upcoming_cards"], statistics = await asyncio.gather(
+            TrainingService.get_upcoming_cards(request.user, limit=6),
+            sync_to_async(StatisticsService.get_club_statistics)(),
         )
-
-        # Загальна статистика клубу
-        context.update(StatisticsService.get_club_statistics())
-        return context
+        context.update(statistics)
+        return self.render_to_response(context)
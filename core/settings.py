@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Installed apps
     "django_celery_beat",
     "tinymce",
@@ -103,6 +104,9 @@ DATABASES = {
         "PORT": os.environ.get("SQL_PORT", "5432"),
     }
 }
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Тестова база у файлі, щоб потоки в тестах мали спільні дані
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "test_db.sqlite3"}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -164,10 +168,79 @@ TELEGRAM_BOT_TOKEN = env.str("TELEGRAM_BOT_TOKEN")  # Bot token
 DEFAULT_CHAT_ID = env.int("DEFAULT_CHAT_ID")  # Default chat ID
 ADMINS_BOT = env.list("ADMINS_BOT", subcast=int)
 TELEGRAM_WEBHOOK_URL = env.str("BASE_URL") + env.str("TELEGRAM_WEBHOOK_PATH")
+# Максимальна кількість одночасних запитів до Telegram API в процесі
+TELEGRAM_SEND_CONCURRENCY = env.int("TELEGRAM_SEND_CONCURRENCY", default=5)
+# Максимальна кількість повідомлень за секунду для всього бота
+# (ліміт Telegram - 30)
+TELEGRAM_SEND_RATE = env.int("TELEGRAM_SEND_RATE", default=25)
+# Кількість процесів, що одночасно надсилають через ThrottledSender
+# (задача beat, runscheduler, задача погоди). Обмежувач швидкості
+# працює в пам'яті процесу, тому кожен отримує TELEGRAM_SEND_RATE /
+# TELEGRAM_SEND_PROCESSES. Інтервал між повідомленнями в один чат
+# теж дотримується лише в межах процесу.
+TELEGRAM_SEND_PROCESSES = env.int("TELEGRAM_SEND_PROCESSES", default=3)
+# Мінімальний інтервал між повідомленнями в один чат (секунди)
+TELEGRAM_CHAT_SEND_INTERVAL = env.float(
+    "TELEGRAM_CHAT_SEND_INTERVAL", default=1.0
+)
+# Термін зберігання file_id завантажених у Telegram файлів (секунди)
+TELEGRAM_FILE_ID_TTL = env.int(
+    "TELEGRAM_FILE_ID_TTL", default=60 * 60 * 24 * 30
+)
+# Інтервал збереження метрик надсилань у Redis (секунди)
+TELEGRAM_METRICS_FLUSH_INTERVAL = env.int(
+    "TELEGRAM_METRICS_FLUSH_INTERVAL", default=10
+)
+# Найбільша кількість різних чатів у метриках процесу між збереженнями
+TELEGRAM_METRICS_MAX_CHATS = env.int(
+    "TELEGRAM_METRICS_MAX_CHATS", default=1000
+)
+# Файл для запису метрик процесу (наприклад, для тестів)
+TELEGRAM_METRICS_FILE = env.str("TELEGRAM_METRICS_FILE", default="")
+# Токен доступу до ендпоінта метрик (Authorization: Bearer <token>)
+TELEGRAM_METRICS_TOKEN = env.str("TELEGRAM_METRICS_TOKEN", default="")
 
 # Bank settings
 BASE_URL = env.str("BASE_URL")
 MONOBANK_WEBHOOK_PATH = env.str("MONOBANK_WEBHOOK_PATH")
+# Термін актуальності перевіреного webhook Монобанку (секунди)
+MONOBANK_WEBHOOK_VERIFY_TTL = env.int(
+    "MONOBANK_WEBHOOK_VERIFY_TTL", default=60 * 60 * 24 * 7
+)
+# Кількість клієнтів, які налаштовуються одночасно
+MONOBANK_WEBHOOK_CONCURRENCY = env.int(
+    "MONOBANK_WEBHOOK_CONCURRENCY", default=4
+)
+# Термін актуальності даних платника з Telegram (секунди)
+PAYER_PROFILE_MAX_AGE = env.int("PAYER_PROFILE_MAX_AGE", default=60 * 60 * 24)
+# Найбільший вік індексу платників у пам'яті процесу (секунди)
+PAYER_INDEX_MAX_AGE = env.int("PAYER_INDEX_MAX_AGE", default=60 * 10)
+
+# Scheduled messages settings
+# Час, на який обробник захоплює повідомлення для надсилання (секунди)
+SCHEDULED_MESSAGE_LEASE = env.int("SCHEDULED_MESSAGE_LEASE", default=60 * 5)
+# Максимальна кількість повідомлень, що захоплюються за один раз
+SCHEDULED_MESSAGE_BATCH_SIZE = env.int(
+    "SCHEDULED_MESSAGE_BATCH_SIZE", default=100
+)
+# Максимальний час очікування планувальника між перевірками (секунди)
+SCHEDULER_MAX_SLEEP = env.int("SCHEDULER_MAX_SLEEP", default=60 * 5)
+# Затримка перед повторною спробою невдалого надсилання (секунди)
+SCHEDULER_RETRY_DELAY = env.int("SCHEDULER_RETRY_DELAY", default=30)
+
+# Training events settings
+# Максимальний термін зберігання статистики клубу в кеші (секунди)
+TRAINING_STATISTICS_CACHE_TTL = env.int(
+    "TRAINING_STATISTICS_CACHE_TTL", default=60 * 15
+)
+# Термін зберігання відрендерених карток тренувань у кеші (секунди)
+TRAINING_CARD_CACHE_TTL = env.int(
+    "TRAINING_CARD_CACHE_TTL", default=60 * 60 * 24
+)
+# Термін зберігання значень фільтрів списку тренувань у кеші (секунди)
+TRAINING_FACETS_CACHE_TTL = env.int(
+    "TRAINING_FACETS_CACHE_TTL", default=60 * 60 * 24
+)
 
 # REDIS connection
 REDIS_HOST = "0.0.0.0"
@@ -205,6 +278,16 @@ BOT_STORAGE_URL = (
     else None
 )
 
+# Scheduler redis settings (сповіщення про зміну запланованих повідомлень)
+SCHEDULER_REDIS_URL = REDIS_URL_TEMPLATE.format(
+    host=REDIS_HOST, port=REDIS_PORT, db=3
+)
+
+# Telegram metrics redis settings (спільні метрики надсилань усіх процесів)
+TELEGRAM_METRICS_REDIS_URL = REDIS_URL_TEMPLATE.format(
+    host=REDIS_HOST, port=REDIS_PORT, db=3
+)
+
 # Celery settings
 CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 3600}
 CELERY_ACCEPT_CONTENT = ["application/json"]
@@ -216,6 +299,8 @@ CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 # OpenWeatherMap settings
 WEATHER_API_KEY = env.str("WEATHER_API_KEY")
 CITY_COORDINATES = env.list("CITY_COORDINATES", subcast=float)
+# Інтервал оновлення прогнозу провайдером, на який кешується прогноз (секунди)
+WEATHER_CACHE_PERIOD = env.int("WEATHER_CACHE_PERIOD", default=60 * 60 * 3)
 
 # TinyMCE settings
 TINYMCE_DEFAULT_CONFIG = {
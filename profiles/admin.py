@@ -34,6 +34,7 @@ class ProfileAdmin(UserAdmin):
         "telegram_photo",
         "get_tg_photo",
         "telegram_language_code",
+        "telegram_synced_at",
         "last_login",
         "date_joined",
     )
@@ -73,6 +74,7 @@ class ProfileAdmin(UserAdmin):
                     "telegram_last_name",
                     "get_tg_photo",
                     "telegram_language_code",
+                    "telegram_synced_at",
                 ),
             },
         ),
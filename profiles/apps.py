@@ -5,3 +5,6 @@ class ProfilesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "profiles"
     verbose_name = "Учасники клубу"
+
+    def ready(self):
+        import profiles.signals  # noqa: F401
@@ -3,7 +3,8 @@ import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import RegexValidator
-from django.contrib.auth.models import AbstractUser
+
+from common.functions import BirthDay, BirthMonth
 
 
 class TelegramProfileMixin(models.Model):
@@ -53,6 +54,19 @@ class TelegramProfileMixin(models.Model):
         blank=True,
         help_text="Мова користувача в Telegram (наприклад, 'en', 'uk')",
     )
+    telegram_photo_file_id = models.CharField(
+        verbose_name="File ID фото в Telegram",
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Ідентифікатор файлу фото профілю в Telegram",
+    )
+    telegram_synced_at = models.DateTimeField(
+        verbose_name="Синхронізовано з Telegram",
+        null=True,
+        blank=True,
+        help_text="Час останнього оновлення даних з Telegram",
+    )
 
     class Meta:
         abstract = True  # Робимо модель абстрактною
@@ -95,6 +109,17 @@ class ClubUser(AbstractUser, TelegramProfileMixin):
         ["username"]
     )  # Використовуємо telegram_id для авторизації
 
+    @classmethod
+    def get_birthday_users(cls, date):
+        """
+        Активні користувачі з днем народження в date. Умова використовує
+        ті самі вирази, що й індекс clubuser_birthday_idx.
+        """
+        return cls.objects.annotate(
+            birth_month=BirthMonth("data_of_birth"),
+            birth_day=BirthDay("data_of_birth"),
+        ).filter(birth_month=date.month, birth_day=date.day, is_active=True)
+
     def __str__(self):
         return (
             f"{self.first_name} {self.last_name} ({self.username})"
@@ -105,3 +130,12 @@ class ClubUser(AbstractUser, TelegramProfileMixin):
     class Meta:
         verbose_name = "Користувача"
         verbose_name_plural = "Користувачі"
+        indexes = [
+            # Пошук іменинників за місяцем і днем народження
+            models.Index(
+                BirthMonth("data_of_birth"),
+                BirthDay("data_of_birth"),
+                condition=models.Q(is_active=True),
+                name="clubuser_birthday_idx",
+            ),
+        ]
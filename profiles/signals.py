@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bank.services.payer_index import INDEX_FIELDS, PAYER_INDEX_NAMESPACE
+from common.services.cache_versions import bump_cache_version
+from profiles.models import ClubUser
+
+# Поля, зміна яких впливає на індекс платників
+PAYER_INDEX_FIELDS = {*INDEX_FIELDS, "is_active"}
+
+
+@receiver(post_save, sender=ClubUser)
+@receiver(post_delete, sender=ClubUser)
+def invalidate_payer_match_index(sender, update_fields=None, **kwargs):
+    """
+    Позначає індекс платників застарілим після зміни профілю.
+    Збереження без полів індексу (наприклад, часу входу) ігноруються.
+    """
+    if update_fields and not PAYER_INDEX_FIELDS & set(update_fields):
+        return
+    bump_cache_version(PAYER_INDEX_NAMESPACE)
@@ -1,3 +1,73 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from bank.services.payer_index import PAYER_INDEX_NAMESPACE
+from common.services.cache_versions import get_cache_version
+from common.testing import QueryPlanTestMixin
+from profiles.models import ClubUser
+
+
+class BirthdayIndexTests(QueryPlanTestMixin, TestCase):
+    """Пошук іменинників використовує індекс за місяцем і днем"""
+
+    ROWS = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        ClubUser.objects.bulk_create(
+            ClubUser(
+                username=f"user{i}",
+                telegram_id=i + 1,
+                data_of_birth=date(1990, i % 12 + 1, i % 28 + 1),
+                is_active=i % 5 != 0,
+            )
+            for i in range(cls.ROWS)
+        )
+        cls.analyze()
+
+    def test_birthday_users(self):
+        queryset = ClubUser.get_birthday_users(date.today())
+        self.assertUsesIndex(queryset, "clubuser_birthday_idx")
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+)
+class PayerIndexInvalidationTests(TestCase):
+    """Тести інвалідації індексу платників після зміни профілю"""
+
+    def setUp(self):
+        self.user = ClubUser.objects.create(
+            username="runner",
+            telegram_id=1,
+            first_name="Іван",
+            last_name="Петренко",
+        )
+        self.version = get_cache_version(PAYER_INDEX_NAMESPACE)
+
+    def test_login_keeps_index(self):
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+
+        self.assertEqual(
+            get_cache_version(PAYER_INDEX_NAMESPACE), self.version
+        )
+
+    def test_name_change_invalidates_index(self):
+        self.user.last_name = "Коваленко"
+        self.user.save(update_fields=["last_name"])
+
+        self.assertNotEqual(
+            get_cache_version(PAYER_INDEX_NAMESPACE), self.version
+        )
+
+    def test_full_save_invalidates_index(self):
+        self.user.save()
+
+        self.assertNotEqual(
+            get_cache_version(PAYER_INDEX_NAMESPACE), self.version
+        )
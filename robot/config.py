@@ -6,6 +6,7 @@ from aiogram.enums import ParseMode
 from environs import Env
 
 from core.settings import TELEGRAM_BOT_TOKEN
+from robot.services.telemetry import TelemetryMiddleware
 
 # Створіть об'єкт ENV.
 # Об'єкт ENV буде використовуватися для читання змінних середовища.
@@ -36,3 +37,5 @@ ROBOT = Bot(
     token=TELEGRAM_BOT_TOKEN,
     default=DefaultBotProperties(parse_mode=ParseMode.HTML),
 )
+# Метрики всіх запитів надсилання через спільну сесію бота
+ROBOT.session.middleware(TelemetryMiddleware())
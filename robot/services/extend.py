@@ -6,6 +6,7 @@ from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
 
 from common.utils import clean_tag_message
 from core.settings import DEFAULT_CHAT_ID
+from robot.services.message_layout import send_message_layout
 
 logger = logging.getLogger("robot")
 
@@ -22,6 +23,7 @@ class TelegramService:
         chat_ids: List[int],
         photo: Optional[str] = None,
         above_media: bool = False,
+        chat_action: bool = True,
     ) -> bool:
         """
         Відправляє повідомлення в зазначені чати
@@ -30,6 +32,8 @@ class TelegramService:
         :param chat_ids: список чатів
         :param photo: фото повідомлення
         :param above_media: відображати повідомлення над зображенням
+        :param chat_action: показувати статус набору перед відправленням
+            (окремий виклик Bot API на кожен чат)
         """
         if not chat_ids:
             return False
@@ -37,24 +41,23 @@ class TelegramService:
         success = False
         for chat_id in chat_ids:
             try:
-                if photo:
+                if chat_action:
                     await self.bot.send_chat_action(
-                        chat_id=chat_id, action="upload_photo"
-                    )
-                    await self.bot.send_photo(
                         chat_id=chat_id,
+                        action="upload_photo" if photo else "typing",
+                    )
+                if photo:
+                    await send_message_layout(
+                        self.bot,
+                        chat_id,
+                        clean_tag_message(message),
                         photo=photo,
-                        caption=clean_tag_message(message)[:1024],
                         protect_content=True,
                         show_caption_above_media=above_media,
                     )
                 else:
-                    await self.bot.send_chat_action(
-                        chat_id=chat_id, action="typing"
-                    )
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=clean_tag_message(message)[:4096],
+                    await send_message_layout(
+                        self.bot, chat_id, clean_tag_message(message)
                     )
                 success = True
             except TelegramAPIError as e:
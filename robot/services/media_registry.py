@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Dict, Optional, Tuple, Union
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, Message
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("robot")
+
+FILE_ID_KEY_TEMPLATE = "telegram_file_id:{bot_id}:{digest}"
+
+# Хеші вмісту файлів процесу: шлях -> (mtime, розмір, хеш)
+_digests: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _get_file_digest(path: str) -> str:
+    """
+    Повертає хеш шляху та вмісту файлу.
+    Файл перечитується лише після зміни часу модифікації або розміру.
+    """
+    stat = os.stat(path)
+    cached = _digests.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    file_hash = hashlib.blake2b(path.encode(), digest_size=16)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    digest = file_hash.hexdigest()
+    _digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+class MediaRegistry:
+    """
+    Реєстр file_id файлів, уже завантажених у Telegram.
+
+    Перше надсилання завантажує файл і запам'ятовує отриманий file_id за
+    ключем зі шляху та хешу вмісту. Наступні надсилання того самого файлу
+    використовують file_id. Якщо Telegram його відхиляє, файл
+    завантажується повторно.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    async def send_photo(
+        self, chat_id: Union[int, str], path: str, **kwargs
+    ) -> Message:
+        """
+        Надсилає фото з диска, використовуючи збережений file_id.
+
+        :param chat_id: ID чату.
+        :param path: Шлях до файлу зображення.
+        :param kwargs: Інші параметри Bot.send_photo.
+        """
+        path = str(path)
+        key = await self._get_key(path)
+        file_id = await self._get_file_id(key)
+
+        if file_id:
+            try:
+                return await self.bot.send_photo(
+                    chat_id=chat_id, photo=file_id, **kwargs
+                )
+            except TelegramBadRequest as e:
+                logger.warning(
+                    "file_id для %s відхилено, повторне завантаження: %s",
+                    path,
+                    e,
+                )
+                await self._forget(key)
+
+        message = await self.bot.send_photo(
+            chat_id=chat_id, photo=FSInputFile(path), **kwargs
+        )
+        if key and message.photo:
+            await self._remember(key, message.photo[-1].file_id)
+        return message
+
+    async def _get_key(self, path: str) -> Optional[str]:
+        """Ключ кешу для файлу або None, якщо файл не вдалося прочитати."""
+        try:
+            digest = await asyncio.to_thread(_get_file_digest, path)
+        except OSError as e:
+            logger.warning("Не вдалося прочитати файл %s: %s", path, e)
+            return None
+        return FILE_ID_KEY_TEMPLATE.format(bot_id=self.bot.id, digest=digest)
+
+    @staticmethod
+    async def _get_file_id(key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        try:
+            return await cache.aget(key)
+        except Exception as e:
+            logger.warning("Помилка читання file_id з кешу: %s", e)
+            return None
+
+    @staticmethod
+    async def _remember(key: str, file_id: str) -> None:
+        try:
+            await cache.aset(key, file_id, settings.TELEGRAM_FILE_ID_TTL)
+        except Exception as e:
+            logger.warning("Помилка збереження file_id у кеші: %s", e)
+
+    @staticmethod
+    async def _forget(key: str) -> None:
+        try:
+            await cache.adelete(key)
+        except Exception as e:
+            logger.warning("Помилка видалення file_id з кешу: %s", e)
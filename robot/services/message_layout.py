@@ -0,0 +1,247 @@
+import html
+import re
+from functools import partial
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from robot.services.media_registry import MediaRegistry
+
+# Ліміти Telegram (у символах UTF-16 після розбору HTML)
+MESSAGE_LIMIT = 4096
+CAPTION_LIMIT = 1024
+
+_TOKEN_PATTERN = re.compile(r"(<[^>]*>)")
+_TAG_PATTERN = re.compile(r"<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9-]*)[^>]*?(/?)\s*>")
+_ATOM_PATTERN = re.compile(r"&(?:#\d+|#x[0-9a-fA-F]+|[a-zA-Z]+);|.", re.DOTALL)
+
+# Межі для розриву тексту в порядку пріоритету
+_BREAKS = ("\n\n", "\n", " ")
+
+
+def visible_length(text: str) -> int:
+    """Довжина тексту так, як її рахує Telegram: без тегів, у UTF-16."""
+    plain = html.unescape(_TOKEN_PATTERN.sub("", text))
+    return len(plain.encode("utf-16-le")) // 2
+
+
+def _atom_length(atom: str) -> int:
+    """Довжина символу або HTML-сутності у UTF-16."""
+    if len(atom) > 1:
+        atom = html.unescape(atom)
+    return len(atom.encode("utf-16-le")) // 2
+
+
+def _find_cut(text: str, room: int) -> Tuple[int, int]:
+    """
+    Шукає позицію розриву текстового фрагмента, що вміщує room символів.
+
+    Повертає позицію та її пріоритет (індекс у _BREAKS або len(_BREAKS)
+    для розриву посеред слова). Межа абзацу, рядка чи слова обирається,
+    лише якщо вона не надто близько до початку фрагмента.
+    """
+    length = 0
+    last_fit = 0
+    last_break = {separator: 0 for separator in _BREAKS}
+
+    for match in _ATOM_PATTERN.finditer(text):
+        length += _atom_length(match.group(0))
+        if length > room:
+            break
+        end = match.end()
+        last_fit = end
+        for separator in _BREAKS:
+            if text.endswith(separator, 0, end):
+                last_break[separator] = end
+
+    for priority, separator in enumerate(_BREAKS):
+        if last_break[separator] and last_break[separator] * 2 >= last_fit:
+            return last_break[separator], priority
+    return last_fit, len(_BREAKS)
+
+
+def _get_break_priority(text: str) -> int:
+    """Пріоритет розриву після текстового фрагмента."""
+    for priority, separator in enumerate(_BREAKS):
+        if text.endswith(separator):
+            return priority
+    return len(_BREAKS)
+
+
+def split_html(
+    text: str, limit: int = MESSAGE_LIMIT, first_limit: Optional[int] = None
+) -> List[str]:
+    """
+    Розбиває HTML-текст на частини, кожна з яких вміщується в ліміт.
+
+    Розриви робляться між абзацами, рядками або словами. Відкриті на
+    місці розриву теги закриваються в кінці частини та відкриваються
+    знову на початку наступної, тож кожна частина - валідний HTML.
+
+    :param text: HTML-текст, дозволений Telegram.
+    :param limit: Ліміт символів частини.
+    :param first_limit: Окремий ліміт першої частини (наприклад, підпису).
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    stack: List[Tuple[str, str]] = []
+    length = 0
+    # Найкраща межа між фрагментами поточної частини:
+    # (пріоритет, позиція в current, довжина до неї, відкриті теги)
+    best_break: Optional[Tuple[int, int, int, List[Tuple[str, str]]]] = None
+
+    def get_limit() -> int:
+        return limit if chunks or first_limit is None else first_limit
+
+    def flush(position: Optional[int] = None, tags=None) -> None:
+        """Завершує частину в позиції position (за замовчуванням - в кінці)."""
+        nonlocal length, best_break
+        tags = stack if tags is None else tags
+        head = current if position is None else current[:position]
+        tail = [] if position is None else current[position:]
+
+        closing = "".join(f"</{name}>" for name, _ in reversed(tags))
+        chunk = ("".join(head) + closing).strip()
+        if html.unescape(_TOKEN_PATTERN.sub("", chunk)).strip():
+            chunks.append(chunk)
+
+        current[:] = [tag for _, tag in tags] + tail
+        length = visible_length("".join(tail))
+        best_break = None
+
+    for token in _TOKEN_PATTERN.split(text):
+        if not token:
+            continue
+
+        if tag := _TAG_PATTERN.fullmatch(token):
+            is_closing, name, self_closing = tag.groups()
+            name = name.lower()
+            if is_closing:
+                for index in range(len(stack) - 1, -1, -1):
+                    if stack[index][0] == name:
+                        del stack[index]
+                        break
+            elif not self_closing:
+                stack.append((name, token))
+            current.append(token)
+            continue
+
+        while token:
+            room = get_limit() - length
+            token_length = visible_length(token)
+            if token_length <= room:
+                current.append(token)
+                length += token_length
+                priority = _get_break_priority(token)
+                if priority < len(_BREAKS) and (
+                    best_break is None or priority <= best_break[0]
+                ):
+                    best_break = (priority, len(current), length, stack[:])
+                break
+
+            cut, priority = _find_cut(token, room)
+            if (
+                best_break
+                and best_break[0] < priority
+                and best_break[2] * 2 >= get_limit()
+            ):
+                # Краща межа є раніше - завершуємо частину на ній
+                flush(best_break[1], best_break[3])
+                continue
+
+            if cut == 0:
+                if length == 0:
+                    # Ліміт менший за один символ - пропускаємо його
+                    token = token[_ATOM_PATTERN.match(token).end() :]
+                    continue
+                flush()
+                continue
+
+            current.append(token[:cut])
+            token = token[cut:]
+            flush()
+
+    flush()
+    return chunks
+
+
+MessageRequest = Callable[[], Awaitable[Message]]
+
+
+def build_message_requests(
+    bot: Bot,
+    chat_id: Union[int, str],
+    text: str,
+    *,
+    photo: Optional[str] = None,
+    photo_path: Optional[str] = None,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+    show_caption_above_media: bool = False,
+    **kwargs,
+) -> List[MessageRequest]:
+    """
+    Готує мінімальний набір запитів для надсилання повідомлення.
+
+    Довгий текст розбивається на кілька повідомлень, а завеликий підпис
+    фото - на підпис і наступні текстові повідомлення. Клавіатура
+    додається до останнього повідомлення.
+
+    :param bot: Екземпляр бота.
+    :param chat_id: ID чату.
+    :param text: Очищений HTML-текст.
+    :param photo: file_id або InputFile фото.
+    :param photo_path: Шлях до фото на диску (надсилається через MediaRegistry).
+    :param reply_markup: Клавіатура повідомлення.
+    :param show_caption_above_media: Показувати підпис над фото.
+    :param kwargs: Спільні параметри всіх запитів (наприклад, protect_content).
+    """
+    has_photo = bool(photo or photo_path)
+    chunks = split_html(
+        text, MESSAGE_LIMIT, CAPTION_LIMIT if has_photo else None
+    )
+    requests: List[MessageRequest] = []
+
+    if has_photo:
+        caption = chunks.pop(0) if chunks else None
+        photo_kwargs = dict(
+            chat_id=chat_id,
+            caption=caption,
+            reply_markup=None if chunks else reply_markup,
+            show_caption_above_media=show_caption_above_media,
+            **kwargs,
+        )
+        if photo_path:
+            requests.append(
+                partial(
+                    MediaRegistry(bot).send_photo,
+                    path=photo_path,
+                    **photo_kwargs,
+                )
+            )
+        else:
+            requests.append(
+                partial(bot.send_photo, photo=photo, **photo_kwargs)
+            )
+
+    for index, chunk in enumerate(chunks, start=1):
+        requests.append(
+            partial(
+                bot.send_message,
+                chat_id=chat_id,
+                text=chunk,
+                reply_markup=reply_markup if index == len(chunks) else None,
+                **kwargs,
+            )
+        )
+    return requests
+
+
+async def send_message_layout(
+    bot: Bot, chat_id: Union[int, str], text: str, **kwargs
+) -> List[Message]:
+    """Надсилає повідомлення, розбите build_message_requests, по черзі."""
+    return [
+        await request()
+        for request in build_message_requests(bot, chat_id, text, **kwargs)
+    ]
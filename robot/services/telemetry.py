@@ -0,0 +1,386 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import redis.asyncio as aioredis
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger("robot")
+
+# Ключ хешу Redis із сумарними метриками всіх процесів
+METRICS_KEY = "telegram_metrics"
+# Ключ хешу Redis із метриками чатів за добу (дата в кінці ключа)
+CHAT_METRICS_KEY = "telegram_metrics:chats:{day}"
+# Метрики чатів зберігаються дві доби, щоб хеш не зростав безмежно
+CHAT_METRICS_TTL = 2 * 24 * 60 * 60
+# Мітка, під якою враховуються чати понад ліміт процесу
+OTHER_CHAT = "other"
+
+# Межі кошиків гістограми затримок (секунди)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Методи API, що надсилають повідомлення
+TRACKED_PREFIXES = ("send", "copy", "forward")
+
+# Час очікування Redis, щоб збереження метрик не затримувало надсилання
+REDIS_TIMEOUT = 1
+
+_SEPARATOR = "|"
+_CHAT_PREFIX = "chat_"
+
+# Клієнти Redis процесу: з'єднання прив'язані до циклу подій
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_redis_client() -> aioredis.Redis:
+    """Спільний клієнт Redis метрик для поточного циклу подій."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = aioredis.from_url(
+            settings.TELEGRAM_METRICS_REDIS_URL, socket_timeout=REDIS_TIMEOUT
+        )
+        _clients[loop] = client
+    return client
+
+
+def _chat_metrics_key(day: date) -> str:
+    return CHAT_METRICS_KEY.format(day=day.isoformat())
+
+
+def _format_bucket(index: int) -> str:
+    """Мітка le кошика гістограми."""
+    if index >= len(LATENCY_BUCKETS):
+        return "+Inf"
+    return str(LATENCY_BUCKETS[index])
+
+
+class SendTelemetry:
+    """
+    Агрегатор метрик надсилань у пам'яті процесу.
+
+    Запис лише збільшує лічильники під блокуванням. Накопичені зміни
+    періодично додаються до спільного хешу Redis у фоновому завданні,
+    а за потреби сумарні метрики процесу записуються у файл.
+
+    Лічильники чатів ведуться за поточну добу. Між двома збереженнями
+    процес враховує не більше TELEGRAM_METRICS_MAX_CHATS різних чатів,
+    решта потрапляє до мітки OTHER_CHAT.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._totals: Counter = Counter()
+        self._chats = set()
+        self._day = timezone.localdate()
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        method: str,
+        chat_id: Optional[int | str],
+        duration: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Записує результат одного запиту.
+
+        :param method: Назва методу API (наприклад, sendMessage).
+        :param chat_id: ID чату або None.
+        :param duration: Тривалість запиту (секунди).
+        :param error: Виняток запиту або None у разі успіху.
+        """
+        bucket = _format_bucket(bisect_left(LATENCY_BUCKETS, duration))
+        status = "ok" if error is None else type(error).__name__
+
+        with self._lock:
+            pending = self._pending
+            pending[_SEPARATOR.join(("latency_bucket", method, bucket))] += 1
+            pending[_SEPARATOR.join(("latency_sum", method))] += duration
+            pending[_SEPARATOR.join(("requests", method, status))] += 1
+            if isinstance(error, TelegramRetryAfter):
+                pending[_SEPARATOR.join(("retry_after", method))] += 1
+                pending[
+                    _SEPARATOR.join(("retry_after_seconds", method))
+                ] += error.retry_after
+            if chat_id is not None:
+                chat = self._track_chat(str(chat_id))
+                pending[_SEPARATOR.join(("chat_requests", chat))] += 1
+                if error is not None:
+                    pending[_SEPARATOR.join(("chat_errors", chat))] += 1
+
+    def _track_chat(self, chat: str) -> str:
+        """Мітка чату з урахуванням ліміту чатів (під блокуванням)."""
+        if chat in self._chats:
+            return chat
+        if len(self._chats) >= settings.TELEGRAM_METRICS_MAX_CHATS:
+            return OTHER_CHAT
+        self._chats.add(chat)
+        return chat
+
+    def snapshot(self) -> Dict[str, float]:
+        """Сумарні метрики процесу, включно з ще не збереженими."""
+        with self._lock:
+            return dict(self._totals + self._pending)
+
+    def is_flush_due(self) -> bool:
+        return (
+            time.monotonic() - self._last_flush
+            >= settings.TELEGRAM_METRICS_FLUSH_INTERVAL
+        )
+
+    def schedule_flush(self) -> None:
+        """
+        Запускає збереження метрик фоновим завданням, щоб повільний
+        або недоступний Redis не затримував надсилання.
+        """
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Додає накопичені зміни до Redis та файлу метрик."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            deltas, self._pending = self._pending, Counter()
+            self._chats = set()
+            today = timezone.localdate()
+            if today != self._day:
+                # Лічильники чатів ведуться за добу, як і в Redis
+                self._day = today
+                for field in list(self._totals):
+                    if field.startswith(_CHAT_PREFIX):
+                        del self._totals[field]
+            self._totals.update(deltas)
+        if not deltas:
+            return
+
+        try:
+            await self._save_deltas(deltas, today)
+        except Exception as e:
+            logger.warning("Помилка збереження метрик у Redis: %s", e)
+            with self._lock:
+                self._totals.subtract(deltas)
+                self._pending.update(deltas)
+
+        if settings.TELEGRAM_METRICS_FILE:
+            self.dump(settings.TELEGRAM_METRICS_FILE)
+
+    @staticmethod
+    async def _save_deltas(deltas: Counter, day: date) -> None:
+        chat_key = _chat_metrics_key(day)
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            for field, value in deltas.items():
+                key = (
+                    chat_key if field.startswith(_CHAT_PREFIX) else METRICS_KEY
+                )
+                pipe.hincrbyfloat(key, field, value)
+            pipe.expire(chat_key, CHAT_METRICS_TTL)
+            await pipe.execute()
+
+    def dump(self, path: str) -> None:
+        """Записує сумарні метрики процесу у файл JSON."""
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(self.snapshot(), file, indent=2, sort_keys=True)
+        except OSError as e:
+            logger.warning("Помилка запису метрик у файл %s: %s", path, e)
+
+
+telemetry = SendTelemetry()
+
+
+class TelemetryMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сесії бота, що вимірює всі запити надсилання.
+
+    Підключається до спільного екземпляра бота, тому охоплює розсилки,
+    заплановані повідомлення, сповіщення та відповіді обробників.
+    """
+
+    def __init__(self, recorder: SendTelemetry = telemetry):
+        self.recorder = recorder
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        api_method = method.__api_method__
+        if not api_method.startswith(TRACKED_PREFIXES):
+            return await make_request(bot, method)
+
+        error = None
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.recorder.record(
+                api_method,
+                getattr(method, "chat_id", None),
+                time.perf_counter() - started,
+                error,
+            )
+            if self.recorder.is_flush_due():
+                self.recorder.schedule_flush()
+
+
+async def load_metrics() -> Dict[str, float]:
+    """
+    Метрики всіх процесів із Redis (лічильники чатів - за поточну добу).
+    Якщо Redis недоступний, повертаються метрики поточного процесу.
+    """
+    await telemetry.flush()
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.hgetall(METRICS_KEY)
+            pipe.hgetall(_chat_metrics_key(timezone.localdate()))
+            totals, chats = await pipe.execute()
+    except Exception as e:
+        logger.warning("Помилка читання метрик з Redis: %s", e)
+        return telemetry.snapshot()
+    return {
+        field.decode(): float(value)
+        for raw in (totals, chats)
+        for field, value in raw.items()
+    }
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.6f}"
+
+
+def _format_labels(**labels: str) -> str:
+    return ",".join(
+        f'{name}="{value}"' for name, value in sorted(labels.items())
+    )
+
+
+def render_prometheus(metrics: Dict[str, float]) -> str:
+    """
+    Форматує метрики у текстовий формат Prometheus.
+
+    Лічильники окремих чатів виводяться лише для чатів із помилками,
+    щоб кількість рядів не зростала разом із кількістю отримувачів.
+    """
+    grouped: Dict[str, Dict[tuple, float]] = {}
+    for field, value in metrics.items():
+        name, *labels = field.split(_SEPARATOR)
+        grouped.setdefault(name, {})[tuple(labels)] = value
+
+    lines: List[str] = []
+
+    def add(
+        metric: str,
+        kind: str,
+        description: str,
+        samples: Iterable[tuple],
+    ) -> None:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(
+                f"{metric}{suffix}{{{labels}}} {_format_value(value)}"
+            )
+
+    buckets = grouped.get("latency_bucket", {})
+    sums = grouped.get("latency_sum", {})
+    histogram = []
+    for method in sorted({method for method, _ in buckets}):
+        cumulative = 0
+        for index in range(len(LATENCY_BUCKETS) + 1):
+            le = _format_bucket(index)
+            cumulative += buckets.get((method, le), 0)
+            histogram.append(
+                ("_bucket", _format_labels(method=method, le=le), cumulative)
+            )
+        histogram.append(("_count", _format_labels(method=method), cumulative))
+        histogram.append(
+            ("_sum", _format_labels(method=method), sums.get((method,), 0))
+        )
+    add(
+        "telegram_send_duration_seconds",
+        "histogram",
+        "Тривалість запитів надсилання до Telegram API.",
+        histogram,
+    )
+
+    add(
+        "telegram_send_requests_total",
+        "counter",
+        "Кількість запитів надсилання за методом та результатом.",
+        (
+            ("", _format_labels(method=method, status=status), value)
+            for (method, status), value in sorted(
+                grouped.get("requests", {}).items()
+            )
+        ),
+    )
+    add(
+        "telegram_send_retry_after_total",
+        "counter",
+        "Кількість відповідей RetryAfter (перевищення ліміту).",
+        (
+            ("", _format_labels(method=method), value)
+            for (method,), value in sorted(
+                grouped.get("retry_after", {}).items()
+            )
+        ),
+    )
+    add(
+        "telegram_send_retry_after_seconds_total",
+        "counter",
+        "Сумарна затримка, запитана Telegram у RetryAfter.",
+        (
+            ("", _format_labels(method=method), value)
+            for (method,), value in sorted(
+                grouped.get("retry_after_seconds", {}).items()
+            )
+        ),
+    )
+
+    chat_errors = grouped.get("chat_errors", {})
+    chat_requests = grouped.get("chat_requests", {})
+    add(
+        "telegram_chat_requests_total",
+        "counter",
+        "Кількість запитів надсилання в чати, що мали помилки.",
+        (
+            ("", _format_labels(chat_id=chat_id), chat_requests.get(key, 0))
+            for key in sorted(chat_errors)
+            for chat_id in key
+        ),
+    )
+    add(
+        "telegram_chat_errors_total",
+        "counter",
+        "Кількість помилок надсилання за чатом.",
+        (
+            ("", _format_labels(chat_id=chat_id), value)
+            for key, value in sorted(chat_errors.items())
+            for chat_id in key
+        ),
+    )
+    return "\n".join(lines) + "\n"
@@ -1,3 +1,96 @@
-from django.test import TestCase
+import asyncio
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from robot.services.extend import TelegramService
+from robot.services.telemetry import (
+    OTHER_CHAT,
+    SendTelemetry,
+    TelemetryMiddleware,
+    get_redis_client,
+)
+from robot.tgbot.services.throttled_sender import ThrottledSender
+
+
+class TelegramServiceSendMessageTests(SimpleTestCase):
+    """Тести надсилання повідомлень через TelegramService"""
+
+    def setUp(self):
+        self.bot = mock.AsyncMock()
+        patcher = mock.patch(
+            "robot.services.extend.send_message_layout",
+            new_callable=mock.AsyncMock,
+        )
+        self.send_layout = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_sends_chat_action_by_default(self):
+        sent = await TelegramService(self.bot).send_message("Привіт", [1, 2])
+
+        self.assertTrue(sent)
+        self.assertEqual(self.bot.send_chat_action.await_count, 2)
+        self.assertEqual(self.send_layout.await_count, 2)
+
+    async def test_skips_chat_action_when_disabled(self):
+        sent = await TelegramService(self.bot).send_message(
+            "Оплата", [1, 2], photo="file_id", chat_action=False
+        )
+
+        self.assertTrue(sent)
+        self.bot.send_chat_action.assert_not_awaited()
+        self.assertEqual(self.send_layout.await_count, 2)
+
+
+@override_settings(TELEGRAM_METRICS_FILE="")
+class SendTelemetryTests(SimpleTestCase):
+    """Тести збору метрик надсилань"""
+
+    async def test_flush_does_not_delay_send(self):
+        recorder = SendTelemetry()
+        saving = asyncio.Event()
+
+        async def slow_save(*args):
+            saving.set()
+            await asyncio.sleep(60)
+
+        method = mock.Mock(__api_method__="sendMessage", chat_id=1)
+        make_request = mock.AsyncMock(return_value="sent")
+        with (
+            mock.patch.object(recorder, "_save_deltas", slow_save),
+            mock.patch.object(recorder, "is_flush_due", return_value=True),
+        ):
+            response = await asyncio.wait_for(
+                TelemetryMiddleware(recorder)(make_request, None, method), 1
+            )
+            await asyncio.wait_for(saving.wait(), 1)
+
+            self.assertEqual(response, "sent")
+            recorder._flush_task.cancel()
+
+    @override_settings(TELEGRAM_METRICS_MAX_CHATS=2)
+    def test_chats_over_limit_are_grouped(self):
+        recorder = SendTelemetry()
+        for chat_id in (1, 2, 3, 4, 1):
+            recorder.record("sendMessage", chat_id, 0.1)
+
+        metrics = recorder.snapshot()
+        self.assertEqual(metrics["chat_requests|1"], 2)
+        self.assertEqual(metrics["chat_requests|2"], 1)
+        self.assertEqual(metrics[f"chat_requests|{OTHER_CHAT}"], 2)
+        self.assertNotIn("chat_requests|3", metrics)
+
+    async def test_redis_client_is_reused(self):
+        self.assertIs(get_redis_client(), get_redis_client())
+
+
+class ThrottledSenderTests(SimpleTestCase):
+    """Тести обмежень швидкості надсилання"""
+
+    @override_settings(TELEGRAM_SEND_RATE=30, TELEGRAM_SEND_PROCESSES=3)
+    def test_rate_is_split_between_processes(self):
+        self.assertEqual(ThrottledSender()._bucket.rate, 10)
+
+    @override_settings(TELEGRAM_SEND_RATE=30, TELEGRAM_SEND_PROCESSES=3)
+    def test_explicit_rate_is_kept(self):
+        self.assertEqual(ThrottledSender(rate=5)._bucket.rate, 5)
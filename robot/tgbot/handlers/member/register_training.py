@@ -12,12 +12,16 @@ from robot.tgbot.keyboards import user as kb
 from robot.tgbot.keyboards import staff as kb_staff
 from robot.tgbot.misc.validators import is_private_chat
 from robot.tgbot.text import user_template as mt
+from training_events.enums import (
+    RegistrationStatusChoices as RegistrationStatus,
+)
 from training_events.models import (
     TrainingEvent,
     TrainingRegistration,
     TrainingDistance,
     TrainingMessage,
 )
+from training_events.services.registration_service import RegistrationService
 
 reg_training_router = Router()
 
@@ -72,6 +76,45 @@ async def send_creator_training_notification(
     )
 
 
+async def answer_registration_not_completed(
+    callback: types.CallbackQuery,
+    status: RegistrationStatus,
+    training: TrainingEvent,
+    distance: TrainingDistance,
+):
+    """Пояснює учаснику, чому реєстрацію не виконано."""
+    if status == RegistrationStatus.WAITLISTED:
+        await callback.answer(
+            text="⏳ Вільних місць немає. Вас додано до листа очікування!",
+            show_alert=True,
+        )
+        await callback.message.bot.send_message(
+            chat_id=callback.from_user.id,
+            text=mt.format_waitlist_template.format(
+                title=training.title,
+                distance=distance.distance,
+                date=timezone.localtime(training.date).strftime(
+                    "%d.%m.%Y 🕑 %H:%M"
+                ),
+            ),
+        )
+    elif status == RegistrationStatus.ALREADY_WAITLISTED:
+        await callback.answer(
+            text="⏳ Ви вже в листі очікування на це тренування!",
+            show_alert=True,
+        )
+    elif status == RegistrationStatus.ALREADY_REGISTERED:
+        await callback.answer(
+            text="⚠️ Ви вже зареєстровані на це тренування!",
+            show_alert=True,
+        )
+    else:
+        await callback.answer(
+            text="⚠️ Реєстрація на це тренування недоступна!",
+            show_alert=True,
+        )
+
+
 @reg_training_router.callback_query(F.data.startswith("register_training_"))
 async def register_training(callback: types.CallbackQuery):
     """Реєстрація на тренування"""
@@ -145,23 +188,22 @@ async def register_training(callback: types.CallbackQuery):
 
         # Якщо тільки одна дистанція - реєструємо відразу
         distance: TrainingDistance = await training.distances.afirst()
+        if distance is None:
+            await callback.answer(
+                text="⚠️ Для цього тренування ще немає доступних дистанцій!",
+                show_alert=True,
+            )
+            return
 
-        # Перевіряємо максимальну кількість учасників
-        if distance.max_participants != 0:
-            if (
-                await training.registrations.acount()
-                >= distance.max_participants
-            ):
-                await callback.answer(
-                    text="⚠️ Вибачте, максимальна кількість учасників вже зареєстрована!",
-                    show_alert=True,
-                )
-                return
-
-        # Створюємо реєстрацію
-        await TrainingRegistration.objects.acreate(
-            training=training, participant=participant, distance=distance
+        # Реєструємо з атомарним резервуванням місця на дистанції
+        result = await sync_to_async(RegistrationService.register)(
+            training, participant, distance
         )
+        if result.status != RegistrationStatus.REGISTERED:
+            await answer_registration_not_completed(
+                callback, result.status, training, distance
+            )
+            return
 
         logger.info(
             "Користувач %s (ID: %s) зареєстрований на тренування %s",
@@ -291,31 +333,16 @@ async def register_for_distance(callback: types.CallbackQuery):
         )
         return
 
-    # Перевіряємо кількість учасників
-    if distance.max_participants != 0:
-        if await training.registrations.acount() >= distance.max_participants:
-            await callback.answer(
-                text="⚠️ Вибачте, максимальна кількість учасників на цю дистанцію вже зареєстрована!",
-                show_alert=True,
-            )
-            return
-
-    # Перевіряємо повторну реєстрацію
-    existing_registration = await TrainingRegistration.objects.filter(
-        training=training, participant=participant
-    ).aexists()
-    if existing_registration:
-        await callback.answer(
-            text="⚠️ Ви вже зареєстровані на це тренування!",
-            show_alert=True,
+    # Реєструємо з атомарним резервуванням місця на дистанції
+    result = await sync_to_async(RegistrationService.register)(
+        training, participant, distance
+    )
+    if result.status != RegistrationStatus.REGISTERED:
+        await answer_registration_not_completed(
+            callback, result.status, training, distance
         )
         return
 
-    # Створюємо реєстрацію
-    await TrainingRegistration.objects.acreate(
-        training=training, participant=participant, distance=distance
-    )
-
     logger.info(
         "Користувач %s (ID: %s) зареєстрований на тренування %s, дистанція %s km",
         user_full_name or "",
@@ -394,71 +421,66 @@ async def unregister_training(message: types.Message):
         )
         return
 
-    # Шукаємо реєстрацію
-    try:
-        registration = await TrainingRegistration.objects.aget(
-            training=training, participant=participant
-        )
-        await registration.adelete()
-
-        logger.info(
-            "Користувач %s (ID: %s) скасував реєстрацію на тренування %s",
-            user_full_name or "",
-            user_id,
-            training.title,
+    # Скасовуємо реєстрацію, звільнене місце отримує лист очікування
+    if not await sync_to_async(RegistrationService.unregister)(
+        training, participant
+    ):
+        await message.bot.send_message(
+            chat_id=user_id,
+            text="⚠️ Ви не були зареєстровані на це тренування!",
         )
+        return
 
-        # Отримуємо оновлену кількість учасників
-        participants_count = await training.registrations.acount()
+    logger.info(
+        "Користувач %s (ID: %s) скасував реєстрацію на тренування %s",
+        user_full_name or "",
+        user_id,
+        training.title,
+    )
 
-        # Оновлюємо клавіатуру в оригінальному повідомленні (якщо є інформація)
-        try:
-            training_message = await TrainingMessage.objects.aget(
-                training=training
-            )
-            new_keyboard = kb_staff.register_training_keyboard(
-                int(training_id), participants_count
-            )
-            await message.bot.edit_message_reply_markup(
-                chat_id=training_message.chat_id,
-                message_id=training_message.message_id,
-                reply_markup=new_keyboard,
-            )
-        except TrainingMessage.DoesNotExist:
-            logger.warning(
-                "Інформація про повідомлення тренування не знайдена для training_id: %s",
-                training_id,
-            )
-        except Exception as e:
-            logger.warning("Не вдалося оновити клавіатуру тренування: %s", e)
+    # Отримуємо оновлену кількість учасників
+    participants_count = await training.registrations.acount()
 
-        # Відправляємо повідомлення про скасовану реєстрацію
-        await message.bot.send_message(
-            chat_id=user_id,
-            text=mt.format_unregister_confirmation.format(
-                title=training.title,
-                date=timezone.localtime(training.date).strftime(
-                    "%d.%m.%Y 🕑 %H:%M"
-                ),
-            ),
+    # Оновлюємо клавіатуру в оригінальному повідомленні (якщо є інформація)
+    try:
+        training_message = await TrainingMessage.objects.aget(
+            training=training
+        )
+        new_keyboard = kb_staff.register_training_keyboard(
+            int(training_id), participants_count
+        )
+        await message.bot.edit_message_reply_markup(
+            chat_id=training_message.chat_id,
+            message_id=training_message.message_id,
+            reply_markup=new_keyboard,
+        )
+    except TrainingMessage.DoesNotExist:
+        logger.warning(
+            "Інформація про повідомлення тренування не знайдена для training_id: %s",
+            training_id,
         )
+    except Exception as e:
+        logger.warning("Не вдалося оновити клавіатуру тренування: %s", e)
 
-        # Відправляємо повідомлення адміністраторам про скасовану реєстрацію
-        msg = mt.format_unregister_template.format(
+    # Відправляємо повідомлення про скасовану реєстрацію
+    await message.bot.send_message(
+        chat_id=user_id,
+        text=mt.format_unregister_confirmation.format(
             title=training.title,
             date=timezone.localtime(training.date).strftime(
                 "%d.%m.%Y 🕑 %H:%M"
             ),
-            participant_name=await get_full_name(message, participant),
-            username=await get_username(message),
-        )
-        await send_creator_training_notification(training, message, msg)
+        ),
+    )
 
-    except TrainingRegistration.DoesNotExist:
-        await message.bot.send_message(
-            chat_id=user_id,
-            text="⚠️ Ви не були зареєстровані на це тренування!",
-        )
+    # Відправляємо повідомлення адміністраторам про скасовану реєстрацію
+    msg = mt.format_unregister_template.format(
+        title=training.title,
+        date=timezone.localtime(training.date).strftime("%d.%m.%Y 🕑 %H:%M"),
+        participant_name=await get_full_name(message, participant),
+        username=await get_username(message),
+    )
+    await send_creator_training_notification(training, message, msg)
 
 
 @reg_training_router.message(Command("my_trainings"))
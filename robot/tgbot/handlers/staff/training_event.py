@@ -6,7 +6,6 @@ from typing import Optional
 from aiogram import types, Router, F, Bot
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from aiogram.types import FSInputFile
 from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -16,6 +15,7 @@ from django.utils.timezone import make_aware
 
 from common.utils import clean_tag_message
 from profiles.models import ClubUser
+from robot.services.media_registry import MediaRegistry
 from robot.tgbot.filters.staff import ClubStaffFilter
 from robot.tgbot.keyboards import staff as kb
 from robot.tgbot.misc import validators
@@ -889,13 +889,12 @@ async def notify_participants(
             if training.poster:
                 relative_path = training.poster.name.lstrip("/")
                 poster_path = Path(settings.MEDIA_ROOT) / relative_path
-                photo_file = FSInputFile(poster_path)
                 await bot.send_chat_action(
                     chat_id=chat_id, action="upload_photo"
                 )
-                await bot.send_photo(
+                await MediaRegistry(bot).send_photo(
                     chat_id=chat_id,
-                    photo=photo_file,
+                    path=poster_path,
                     caption=mt.format_training_cancellation_notice.format(
                         training_title=training.title,
                         training_date=timezone.localtime(
@@ -3,7 +3,6 @@ import logging
 from typing import Any, List, Dict, Union
 
 from aiogram import types
-from aiogram.types import FSInputFile
 from asgiref.sync import sync_to_async
 from django.core.files.base import ContentFile
 
@@ -11,6 +10,7 @@ from common.utils import clean_tag_message
 from core.settings import ADMINS_BOT
 from profiles.models import ClubUser
 from robot.models import DeepLink
+from robot.services.media_registry import MediaRegistry
 from robot.tgbot.text.member_template import msg_press_deeplink_button
 
 logger = logging.getLogger("robot")
@@ -159,9 +159,9 @@ async def process_deep_link(
 
         # Надсилання фото або тексту
         if deep_link_instance.image:
-            await message.bot.send_photo(
+            await MediaRegistry(message.bot).send_photo(
                 chat_id=message.from_user.id,
-                photo=FSInputFile(deep_link_instance.image.path),
+                path=deep_link_instance.image.path,
                 caption=msg[:1024],
                 show_caption_above_media=True,
             )
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, TypeVar, Union
+
+from aiogram.exceptions import TelegramRetryAfter
+from django.conf import settings
+
+logger = logging.getLogger("robot")
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Обмежувач швидкості: не більше rate запитів за секунду."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Чекає, доки з'явиться вільний токен, та забирає його."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated_at is not None:
+                    self._tokens = min(
+                        self.capacity,
+                        self._tokens + (now - self._updated_at) * self.rate,
+                    )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ThrottledSender:
+    """
+    Надсилання запитів до Telegram з урахуванням обмежень API.
+
+    Кількість одночасних запитів обмежує семафор, загальну швидкість -
+    TokenBucket. Запити до одного чату виконуються по черзі та не
+    частіше ніж раз на chat_interval секунд. При TelegramRetryAfter запит
+    повторюється після паузи, а якщо пауза задовга або спроби вичерпано,
+    виняток передається викликачу для повторної постановки в чергу.
+
+    Обмеження діють у межах процесу. Щоб кілька процесів разом не
+    перевищили ліміт бота, типова швидкість - частка TELEGRAM_SEND_RATE
+    (див. per_process_rate).
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        chat_interval: Optional[float] = None,
+        max_retries: int = 2,
+        max_retry_after: int = 30,
+    ):
+        self._semaphore = asyncio.Semaphore(
+            concurrency or settings.TELEGRAM_SEND_CONCURRENCY
+        )
+        self._bucket = TokenBucket(rate or self.per_process_rate())
+        self.chat_interval = (
+            settings.TELEGRAM_CHAT_SEND_INTERVAL
+            if chat_interval is None
+            else chat_interval
+        )
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self._chat_locks: Dict[Union[int, str], asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+        self._last_sent: Dict[Union[int, str], float] = {}
+
+    @staticmethod
+    def per_process_rate() -> float:
+        """Частка загального ліміту швидкості бота для одного процесу."""
+        return settings.TELEGRAM_SEND_RATE / max(
+            settings.TELEGRAM_SEND_PROCESSES, 1
+        )
+
+    async def send(
+        self,
+        chat_id: Union[int, str],
+        request: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Виконує запит до чату з дотриманням обмежень.
+
+        :param chat_id: ID чату, до якого надсилається запит.
+        :param request: Функція без аргументів, що створює корутину запиту.
+        :return: Результат запиту.
+        """
+        async with self._chat_locks[chat_id]:
+            attempt = 0
+            while True:
+                await self._wait_chat_interval(chat_id)
+                try:
+                    async with self._semaphore:
+                        await self._bucket.acquire()
+                        return await request()
+                except TelegramRetryAfter as e:
+                    attempt += 1
+                    if (
+                        attempt > self.max_retries
+                        or e.retry_after > self.max_retry_after
+                    ):
+                        raise
+                    logger.warning(
+                        "Чат %s: перевищено ліміт, повтор через %d с.",
+                        chat_id,
+                        e.retry_after,
+                    )
+                    await asyncio.sleep(e.retry_after)
+                finally:
+                    self._last_sent[chat_id] = (
+                        asyncio.get_running_loop().time()
+                    )
+
+    async def _wait_chat_interval(self, chat_id: Union[int, str]) -> None:
+        """Витримує мінімальний інтервал між запитами до одного чату."""
+        last_sent = self._last_sent.get(chat_id)
+        if last_sent is None:
+            return
+        delay = (
+            last_sent + self.chat_interval - asyncio.get_running_loop().time()
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -54,6 +54,24 @@ format_success_registration_template = text(
     hitalic("✨ Бажаємо успішного тренування! 💪"),
     sep="\n",
 )
+format_waitlist_template = text(
+    hbold("⏳ Місць на дистанції {distance} км немає\n"),
+    "🏃‍♀️ " + hbold("Тренування: ") + "{title}",
+    "📅 " + hbold("Дата: ") + "{date}\n",
+    hitalic("Вас додано до листа очікування. Якщо місце звільниться, "
+            "ми зареєструємо вас автоматично."),
+    sep="\n",
+)
+format_waitlist_promotion_template = text(
+    hbold("🎉 Місце звільнилося!\n"),
+    "Вас переведено з листа очікування та зареєстровано:",
+    "🏃‍♀️ " + hbold("Тренування: ") + "{title}",
+    "📅 " + hbold("Дата: ") + "{date}",
+    "📍 " + hbold("Місце: ") + "{location}",
+    "🎯 " + hbold("Дистанція: ") + "{distance} км\n",
+    "🔙 Відмінити реєстрацію: /unreg_training_{training_id}",
+    sep="\n",
+)
 format_distance_selection_template = text(
     "🏃‍♀️ " + hbold("Тренування:") + " {title}\n",
     "📅 " + hbold("Дата:") + " {date}",
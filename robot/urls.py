@@ -6,6 +6,7 @@ urlpatterns = [
     path(
         "webhook/", view=views.WebhookView.as_view(), name="telegram-webhook"
     ),
+    path("metrics/", view=views.MetricsView.as_view(), name="metrics"),
 ]
 
 app_name = "robot"
@@ -1,12 +1,15 @@
+import hmac
 import json
 import logging
 
+from django.conf import settings
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.http import HttpResponse, HttpRequest
 from django.views.decorators.csrf import csrf_exempt
 
 from robot import bot as robot
+from robot.services.telemetry import load_metrics, render_prometheus
 
 logger = logging.getLogger("robot")
 
@@ -33,3 +36,29 @@ class WebhookView(View):
         except Exception as e:
             logger.exception("Неочікувана помилка при обробці webhook")
             return HttpResponse("Внутрішня помилка сервера", status=500)
+
+
+class MetricsView(View):
+    """
+    Віддає метрики надсилань у Telegram у форматі Prometheus.
+    Доступ - за токеном TELEGRAM_METRICS_TOKEN або для персоналу.
+    """
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not await self._has_access(request):
+            return HttpResponse("Доступ заборонено", status=403)
+
+        metrics = await load_metrics()
+        return HttpResponse(
+            render_prometheus(metrics),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    @staticmethod
+    async def _has_access(request: HttpRequest) -> bool:
+        token = settings.TELEGRAM_METRICS_TOKEN
+        authorization = request.headers.get("Authorization", "")
+        if token and hmac.compare_digest(authorization, f"Bearer {token}"):
+            return True
+        user = await request.auser()
+        return user.is_active and user.is_staff
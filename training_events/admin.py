@@ -9,6 +9,7 @@ from training_events.models import (
     TrainingRegistration,
     TrainingRating,
     TrainingComment,
+    TrainingWaitlistEntry,
 )
 
 
@@ -123,6 +124,7 @@ class TrainingEventAdmin(BaseAdmin):
                     "description",
                     "date",
                     "location",
+                    ("latitude", "longitude"),
                     "poster",
                     "get_image",
                     "created_by",
@@ -197,6 +199,21 @@ class TrainingRegistrationAdmin(BaseAdmin):
     ) + BaseAdmin.fieldsets
 
 
+@admin.register(TrainingWaitlistEntry)
+class TrainingWaitlistEntryAdmin(BaseAdmin):
+    """Клас адмін-панелі для моделі TrainingWaitlistEntry"""
+
+    list_display = ["training", "participant", "distance", "created_at"]
+    search_fields = ["training__title", "participant__username"]
+    list_filter = ["training", "created_at"]
+    fieldsets = (
+        (
+            "Основні дані",
+            {"fields": ("training", "distance", "participant")},
+        ),
+    ) + BaseAdmin.fieldsets
+
+
 @admin.register(TrainingRating)
 class TrainingRatingAdmin(BaseAdmin):
     """Клас адмін-панелі для моделі TrainingRating"""
@@ -5,3 +5,6 @@ class TrainingEventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "training_events"
     verbose_name = "Тренувальні події"
+
+    def ready(self):
+        import training_events.signals  # noqa: F401
@@ -7,4 +7,15 @@ class TrainingMapProcessingStatusChoices(TextChoices):
     PROCESSING = "processing", "В обробці"
     COMPLETED = "completed", "Оброблена"
     FAILED = "failed", "Помилка"
-    WITHOUT_ROUTE = "without_route", "Без маршруту"
\ No newline at end of file
+    WITHOUT_ROUTE = "without_route", "Без маршруту"
+
+
+class RegistrationStatusChoices(TextChoices):
+    """ Результат спроби реєстрації на тренування """
+
+    REGISTERED = "registered", "Зареєстровано"
+    UPDATED = "updated", "Дистанцію змінено"
+    ALREADY_REGISTERED = "already_registered", "Вже зареєстровано"
+    WAITLISTED = "waitlisted", "Додано до листа очікування"
+    ALREADY_WAITLISTED = "already_waitlisted", "Вже в листі очікування"
+    UNAVAILABLE = "unavailable", "Реєстрація недоступна"
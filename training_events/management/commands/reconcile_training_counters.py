@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from training_events.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Перераховує лічильники реєстрацій, оцінок і відгуків тренувань"
+
+    def handle(self, *args, **kwargs):
+        result = reconcile_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Оновлено тренувань: {result['trainings']}, "
+                f"дистанцій: {result['distances']}"
+            )
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from training_events.services.search_service import (
+    ensure_search_backend,
+    fill_search_documents,
+)
+
+
+class Command(BaseCommand):
+    help = "Створює пошукові індекси тренувань та переіндексує тренування"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **kwargs):
+        using = kwargs["database"]
+        filled = fill_search_documents(using)
+        if not ensure_search_backend(using, rebuild=True):
+            raise CommandError("Не вдалося створити пошуковий індекс")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Пошуковий індекс створено, заповнено тренувань: {filled}"
+            )
+        )
@@ -11,14 +11,40 @@ from django.db import models, transaction
 from django.utils import timezone
 from django.utils.timezone import localtime
 
-from common.models import BaseModel
+from common.models import BaseModel, CoordinatesMixin
 from profiles.models import ClubUser
 from training_events.enums import TrainingMapProcessingStatusChoices
+from training_events.services.search_service import build_search_document
 
 logger = logging.getLogger(__name__)
 
 
-class TrainingEvent(BaseModel):
+class CounterFieldsMixin(models.Model):
+    """
+    Захищає лічильники, що оновлюються F-виразами, від перезапису.
+
+    Збереження наявного об'єкта без update_fields записує всі поля, крім
+    COUNTER_FIELDS, тож застаріле значення лічильника в пам'яті не
+    затирає значення в базі.
+    """
+
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    class Meta:
+        abstract = True
+
+
+class TrainingEvent(CounterFieldsMixin, BaseModel, CoordinatesMixin):
     """Модель для групових тренувань"""
 
     def get_upload_path(self, filename):
@@ -66,6 +92,53 @@ class TrainingEvent(BaseModel):
     cancellation_reason = models.TextField(
         verbose_name="Причина скасування", blank=True
     )
+    # Лічильники, що оновлюються сигналами training_events.signals
+    registrations_count = models.PositiveIntegerField(
+        verbose_name="Кількість реєстрацій", default=0, editable=False
+    )
+    ratings_count = models.PositiveIntegerField(
+        verbose_name="Кількість оцінок", default=0, editable=False
+    )
+    ratings_sum = models.PositiveIntegerField(
+        verbose_name="Сума оцінок", default=0, editable=False
+    )
+    comments_count = models.PositiveIntegerField(
+        verbose_name="Кількість відгуків", default=0, editable=False
+    )
+
+    # Текст для повнотекстового пошуку (training_events.services.search_service)
+    search_document = models.TextField(
+        verbose_name="Пошуковий текст", blank=True, default="", editable=False
+    )
+
+    COUNTER_FIELDS = (
+        "registrations_count",
+        "ratings_count",
+        "ratings_sum",
+        "comments_count",
+    )
+    # Поля, з яких складається search_document
+    SEARCH_FIELDS = ("title", "description", "location", "created_by")
+
+    def save(self, *args, **kwargs):
+        self.search_document = self.build_search_document()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(
+            self.SEARCH_FIELDS
+        ):
+            kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
+
+    def build_search_document(self) -> str:
+        """Пошуковий текст з назви, місця, опису та імені організатора"""
+        organizer = self.created_by if self.created_by_id else None
+        return build_search_document(
+            self.title,
+            self.location,
+            organizer and organizer.first_name,
+            organizer and organizer.last_name,
+            self.description,
+        )
 
     def __str__(self):
         local_date = localtime(
@@ -90,20 +163,29 @@ class TrainingEvent(BaseModel):
 
     @property
     def participant_count(self):
-        return self.registrations.count()
+        return self.registrations_count
 
     @property
     def avg_rating(self):
-        ratings = self.ratings.all()
-        if ratings:
-            return sum(r.rating for r in ratings) / len(ratings)
+        if self.ratings_count:
+            return self.ratings_sum / self.ratings_count
         return None
 
     @property
     def has_available_slots(self):
-        if self.distances.max_participants == 0:  # необмежена кількість
-            return True
-        return self.registrations.count() < self.distances.max_participants
+        """
+        Чи є вільні місця хоча б на одній дистанції.
+        Використовує попередньо завантажені дистанції, інакше виконує
+        один запит EXISTS за лічильниками реєстрацій.
+        """
+        if "distances" in getattr(self, "_prefetched_objects_cache", {}):
+            return any(
+                distance.has_available_slots
+                for distance in self.distances.all()
+            )
+        return self.distances.filter(
+            TrainingDistance.available_slots_condition()
+        ).exists()
 
     @property
     def available_distances(self):
@@ -114,9 +196,27 @@ class TrainingEvent(BaseModel):
         ordering = ["date"]
         verbose_name = "👟️ Тренування"
         verbose_name_plural = "👟 Тренування"
-
-
-class TrainingDistance(BaseModel):
+        indexes = [
+            # Список тренувань з пагінацією за (date, id)
+            models.Index(fields=["date", "id"], name="training_date_id_idx"),
+            # Заплановані та сьогоднішні тренування
+            models.Index(
+                fields=["date"],
+                condition=models.Q(is_cancelled=False),
+                name="training_active_date_idx",
+            ),
+            # Тренування, що очікують опитування після завершення
+            models.Index(
+                fields=["date"],
+                condition=models.Q(
+                    is_feedback_sent=False, is_cancelled=False
+                ),
+                name="training_feedback_due_idx",
+            ),
+        ]
+
+
+class TrainingDistance(CounterFieldsMixin, BaseModel):
     """Модель для дистанцій у тренуваннях"""
 
     def get_upload_path(self, filename: str) -> str:
@@ -189,6 +289,25 @@ class TrainingDistance(BaseModel):
         default=TrainingMapProcessingStatusChoices.PENDING,
         blank=True,
     )
+    # Лічильник, що оновлюється сигналами training_events.signals
+    registrations_count = models.PositiveIntegerField(
+        verbose_name="Кількість реєстрацій", default=0, editable=False
+    )
+
+    COUNTER_FIELDS = ("registrations_count",)
+
+    @staticmethod
+    def available_slots_condition() -> models.Q:
+        """Умова запиту для дистанцій, на яких є вільні місця."""
+        return models.Q(max_participants=0) | models.Q(
+            registrations_count__lt=models.F("max_participants")
+        )
+
+    @property
+    def has_available_slots(self):
+        if self.max_participants == 0:  # необмежена кількість
+            return True
+        return self.registrations_count < self.max_participants
 
     def save(self, *args, **kwargs):
         """Перевизначений метод збереження для асинхронного створення візуалізації маршруту"""
@@ -302,6 +421,38 @@ class TrainingRegistration(BaseModel):
         verbose_name_plural = "🧑‍🤝‍🧑 Зареєстровані"
 
 
+class TrainingWaitlistEntry(BaseModel):
+    """Черга очікування на дистанцію без вільних місць"""
+
+    training = models.ForeignKey(
+        verbose_name="Тренування",
+        to=TrainingEvent,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+    )
+    distance = models.ForeignKey(
+        verbose_name="Дистанція",
+        to=TrainingDistance,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+    )
+    participant = models.ForeignKey(
+        verbose_name="Учасник",
+        to=ClubUser,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+    )
+
+    def __str__(self):
+        return f"{self.training.title} - {self.participant.username}"
+
+    class Meta:
+        ordering = ["created_at"]
+        unique_together = ("training", "participant")
+        verbose_name = "⏳ Очікування"
+        verbose_name_plural = "⏳ Лист очікування"
+
+
 class TrainingRating(BaseModel):
     training = models.ForeignKey(
         verbose_name="Тренування",
@@ -0,0 +1,95 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from common.services.cache_versions import (
+    bump_cache_version,
+    get_cache_versions,
+)
+from training_events.models import TrainingEvent
+
+logger = logging.getLogger("training_events")
+
+CARD_NAMESPACE_TEMPLATE = "training_card:{pk}"
+CARD_KEY_TEMPLATE = "training_card:{template}:{pk}:{variant}:v{version}"
+
+
+def get_card_namespace(training_id: int) -> str:
+    """Простір імен версії карток одного тренування."""
+    return CARD_NAMESPACE_TEMPLATE.format(pk=training_id)
+
+
+def invalidate_training_cards(training_id: int) -> None:
+    """
+    Позначає картки тренування застарілими після фіксації транзакції,
+    щоб картку не відрендерили з ще не збережених даних.
+    """
+    transaction.on_commit(
+        lambda: bump_cache_version(get_card_namespace(training_id))
+    )
+
+
+def render_training_cards(
+    template_name: str,
+    training_ids: Iterable[int],
+    load: Callable[[List[int]], Iterable[TrainingEvent]],
+    variants: Optional[Dict[int, str]] = None,
+) -> List[SafeString]:
+    """
+    Повертає HTML карток тренувань у порядку training_ids.
+
+    Картка зберігається в кеші за id тренування, варіантом і версією,
+    яку сигнали збільшують після зміни тренування, його дистанцій,
+    реєстрацій чи оцінок. Тренування завантажуються через load лише
+    для карток, яких немає в кеші.
+
+    :param template_name: Шаблон картки з контекстом training і variant.
+    :param training_ids: Id тренувань.
+    :param load: Завантажує тренування за списком id.
+    :param variants: Варіант картки для тренування, наприклад стан
+        реєстрації користувача або час до початку.
+    """
+    training_ids = list(training_ids)
+    variants = variants or {}
+    versions = get_cache_versions(
+        get_card_namespace(pk) for pk in training_ids
+    )
+    keys = {
+        pk: CARD_KEY_TEMPLATE.format(
+            template=template_name,
+            pk=pk,
+            variant=variants.get(pk, ""),
+            version=versions[get_card_namespace(pk)],
+        )
+        for pk in training_ids
+    }
+
+    try:
+        cards = cache.get_many(list(keys.values()))
+    except Exception as e:
+        logger.warning("Помилка читання карток тренувань з кешу: %s", e)
+        cards = {}
+
+    missing = [pk for pk in training_ids if keys[pk] not in cards]
+    if missing:
+        rendered = {
+            keys[training.pk]: render_to_string(
+                template_name,
+                {"training": training, "variant": variants.get(training.pk)},
+            )
+            for training in load(missing)
+        }
+        try:
+            cache.set_many(rendered, settings.TRAINING_CARD_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Помилка збереження карток тренувань: %s", e)
+        cards.update(rendered)
+
+    return [
+        mark_safe(cards[keys[pk]]) for pk in training_ids if keys[pk] in cards
+    ]
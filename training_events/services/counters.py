@@ -0,0 +1,80 @@
+import logging
+from typing import Dict, Type
+
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+
+from training_events.models import (
+    TrainingComment,
+    TrainingDistance,
+    TrainingEvent,
+    TrainingRating,
+    TrainingRegistration,
+)
+
+logger = logging.getLogger("training_events")
+
+
+def update_counters(model: Type[models.Model], pk: int, **deltas: int) -> None:
+    """
+    Атомарно змінює лічильники об'єкта на вказані величини.
+
+    :param model: Модель з лічильниками.
+    :param pk: Первинний ключ об'єкта.
+    :param deltas: Зміни лічильників, наприклад registrations_count=1.
+    """
+    changes = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+        if delta
+    }
+    if pk and changes:
+        model.objects.filter(pk=pk).update(**changes)
+
+
+def _count_subquery(model: Type[models.Model], field: str, expression):
+    """Підзапит з агрегатом пов'язаних рядків для поля field."""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(value=expression)
+            .values("value")
+        ),
+        0,
+    )
+
+
+def reconcile_counters() -> Dict[str, int]:
+    """
+    Перераховує всі лічильники з пов'язаних рядків.
+    Повертає кількість оновлених тренувань і дистанцій.
+    """
+    with transaction.atomic():
+        trainings = TrainingEvent.objects.update(
+            registrations_count=_count_subquery(
+                TrainingRegistration, "training", Count("pk")
+            ),
+            ratings_count=_count_subquery(
+                TrainingRating, "training", Count("pk")
+            ),
+            ratings_sum=_count_subquery(
+                TrainingRating, "training", Sum("rating")
+            ),
+            comments_count=_count_subquery(
+                TrainingComment, "training", Count("pk")
+            ),
+        )
+        distances = TrainingDistance.objects.update(
+            registrations_count=_count_subquery(
+                TrainingRegistration, "distance", Count("pk")
+            ),
+        )
+    logger.info(
+        "Лічильники перераховано: тренувань %d, дистанцій %d",
+        trainings,
+        distances,
+    )
+    return {"trainings": trainings, "distances": distances}
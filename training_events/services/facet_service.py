@@ -0,0 +1,101 @@
+import logging
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from common.services.cache_versions import get_cache_version
+from training_events.models import TrainingDistance, TrainingEvent
+
+logger = logging.getLogger("training_events")
+
+FACETS_NAMESPACE = "training_facets"
+FACETS_KEY_TEMPLATE = "training_facets:v{version}"
+
+
+def _get_organizer_name(item: Dict[str, Any]) -> str:
+    """Ім'я організатора з рядка values() або ім'я користувача."""
+    full_name = " ".join(
+        filter(
+            None,
+            (item["created_by__first_name"], item["created_by__last_name"]),
+        )
+    )
+    return full_name or item["created_by__username"] or ""
+
+
+class FacetService:
+    """
+    Значення фільтрів списку тренувань (локації, дистанції,
+    організатори) з кількістю тренувань для кожного значення.
+
+    Результат зберігається в кеші з ключем, що містить версію простору
+    імен FACETS_NAMESPACE. Сигнали збільшують версію після створення,
+    зміни чи видалення тренувань і дистанцій або зміни імені
+    організатора.
+    """
+
+    @staticmethod
+    def compute_facets() -> Dict[str, List[Dict[str, Any]]]:
+        """Обчислює значення фільтрів з кількістю тренувань."""
+        locations = (
+            TrainingEvent.objects.values("location")
+            .annotate(count=Count("id"))
+            .order_by("location")
+        )
+        distances = (
+            TrainingDistance.objects.values("distance")
+            .annotate(count=Count("training", distinct=True))
+            .order_by("distance")
+        )
+        organizers = (
+            TrainingEvent.objects.values(
+                "created_by_id",
+                "created_by__first_name",
+                "created_by__last_name",
+                "created_by__username",
+            )
+            .annotate(count=Count("id"))
+            .order_by("created_by__first_name", "created_by__last_name")
+        )
+
+        return {
+            "locations": [
+                {"value": item["location"], "count": item["count"]}
+                for item in locations
+            ],
+            "distances": [
+                {"value": item["distance"], "count": item["count"]}
+                for item in distances
+            ],
+            "organizers": [
+                {
+                    "value": item["created_by_id"],
+                    "label": _get_organizer_name(item),
+                    "count": item["count"],
+                }
+                for item in organizers
+            ],
+        }
+
+    @classmethod
+    def get_facets(cls) -> Dict[str, List[Dict[str, Any]]]:
+        """Отримує значення фільтрів з кешу або обчислює їх."""
+        version = get_cache_version(FACETS_NAMESPACE)
+        key = FACETS_KEY_TEMPLATE.format(version=version)
+        try:
+            facets = cache.get(key)
+        except Exception as e:
+            logger.warning("Помилка читання фільтрів тренувань з кешу: %s", e)
+            return cls.compute_facets()
+
+        if facets is None:
+            facets = cls.compute_facets()
+            try:
+                cache.set(key, facets, settings.TRAINING_FACETS_CACHE_TTL)
+            except Exception as e:
+                logger.warning(
+                    "Помилка збереження фільтрів тренувань в кеші: %s", e
+                )
+        return facets
@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core import signing
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+CURSOR_SALT = "training_events.keyset"
+
+
+@dataclass
+class KeysetPage:
+    """Сторінка результатів з курсорами сусідніх сторінок"""
+
+    object_list: List[Any]
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return parse_datetime(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence, backward: bool = False) -> str:
+    """
+    Підписаний курсор зі значень полів упорядкування.
+
+    :param values: Значення полів упорядкування крайнього рядка.
+    :param backward: Курсор вказує на попередню сторінку.
+    """
+    return signing.dumps(
+        {"v": [_encode_value(value) for value in values], "b": backward},
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def decode_cursor(cursor: str, size: int) -> Optional[Tuple[list, bool]]:
+    """
+    Значення полів і напрямок з курсора або None, якщо курсор недійсний.
+    """
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(data, dict):
+        return None
+    values = data.get("v")
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return [_decode_value(value) for value in values], bool(data.get("b"))
+
+
+def _reverse(ordering: Sequence[str]) -> List[str]:
+    return [
+        field[1:] if field.startswith("-") else f"-{field}"
+        for field in ordering
+    ]
+
+
+def _after(ordering: Sequence[str], values: Sequence) -> Q:
+    """
+    Умова "після рядка зі значеннями values" для упорядкування ordering:
+    (a > x) OR (a = x AND b > y) OR ...
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        step = Q(**{f"{name}__{lookup}": values[index]})
+        for previous, value in zip(ordering[:index], values):
+            step &= Q(**{previous.lstrip("-"): value})
+        condition |= step
+    return condition
+
+
+def _values(obj, ordering: Sequence[str]) -> list:
+    return [getattr(obj, field.lstrip("-")) for field in ordering]
+
+
+def _page_query(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str],
+    per_page: int,
+) -> Tuple[QuerySet, Optional[list], bool]:
+    """Запит на сторінку разом зі значеннями та напрямком курсора."""
+    decoded = decode_cursor(cursor, len(ordering)) if cursor else None
+    values, backward = decoded or (None, False)
+
+    # Попередня сторінка вибирається у зворотному порядку
+    query_ordering = _reverse(ordering) if backward else list(ordering)
+    queryset = queryset.order_by(*query_ordering)
+    if values is not None:
+        queryset = queryset.filter(_after(query_ordering, values))
+    return queryset[: per_page + 1], values, backward
+
+
+def _build_page(
+    objects: list,
+    ordering: Sequence[str],
+    values: Optional[list],
+    backward: bool,
+    per_page: int,
+) -> KeysetPage:
+    has_more = len(objects) > per_page
+    objects = objects[:per_page]
+    if backward:
+        objects.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, values is not None
+
+    next_cursor = previous_cursor = None
+    if objects and has_next:
+        next_cursor = encode_cursor(_values(objects[-1], ordering))
+    if objects and has_previous:
+        previous_cursor = encode_cursor(
+            _values(objects[0], ordering), backward=True
+        )
+    return KeysetPage(
+        object_list=objects,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+    )
+
+
+def paginate_keyset(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str],
+    per_page: int,
+) -> KeysetPage:
+    """
+    Пагінація за курсором (keyset) замість OFFSET.
+
+    Вартість запиту однакова для будь-якої сторінки, бо сусідня
+    сторінка вибирається умовою за значеннями крайнього рядка.
+    Останнє поле ordering має бути унікальним (наприклад, id).
+
+    :param queryset: Вибірка, що містить усі поля ordering.
+    :param ordering: Поля упорядкування, наприклад ("-date", "-id").
+    :param cursor: Курсор з сусідньої сторінки або None.
+    :param per_page: Кількість об'єктів на сторінці.
+    """
+    page_query, values, backward = _page_query(
+        queryset, ordering, cursor, per_page
+    )
+    return _build_page(list(page_query), ordering, values, backward, per_page)
+
+
+async def apaginate_keyset(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str],
+    per_page: int,
+) -> KeysetPage:
+    """Асинхронна версія paginate_keyset."""
+    page_query, values, backward = _page_query(
+        queryset, ordering, cursor, per_page
+    )
+    objects = [obj async for obj in page_query]
+    return _build_page(objects, ordering, values, backward, per_page)
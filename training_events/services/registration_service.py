@@ -0,0 +1,241 @@
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from profiles.models import ClubUser
+from training_events.enums import RegistrationStatusChoices as Status
+from training_events.models import (
+    TrainingDistance,
+    TrainingEvent,
+    TrainingRegistration,
+    TrainingWaitlistEntry,
+)
+
+logger = logging.getLogger("training_events")
+
+
+@dataclass
+class RegistrationResult:
+    """Результат спроби реєстрації"""
+
+    status: Status
+    registration: Optional[TrainingRegistration] = None
+    waitlist_entry: Optional[TrainingWaitlistEntry] = None
+
+
+class RegistrationService:
+    """
+    Реєстрація на тренування з обмеженням кількості учасників.
+
+    Місце на дистанції резервується умовним UPDATE лічильника
+    registrations_count, тож одночасні реєстрації не перевищать
+    max_participants. Якщо місць немає, учасник потрапляє до листа
+    очікування, з якого автоматично переводиться після скасування
+    чужої реєстрації.
+    """
+
+    @staticmethod
+    def reserve_slot(distance_id: int) -> bool:
+        """
+        Атомарно займає місце на дистанції.
+        Повертає False, якщо вільних місць немає.
+        """
+        return bool(
+            TrainingDistance.objects.filter(pk=distance_id)
+            .filter(TrainingDistance.available_slots_condition())
+            .update(registrations_count=F("registrations_count") + 1)
+        )
+
+    @classmethod
+    def register(
+        cls,
+        training: TrainingEvent,
+        participant: ClubUser,
+        distance: TrainingDistance,
+        change_distance: bool = False,
+    ) -> RegistrationResult:
+        """
+        Реєструє учасника на дистанцію або додає до листа очікування.
+
+        :param training: Тренування.
+        :param participant: Учасник.
+        :param distance: Обрана дистанція тренування.
+        :param change_distance: Змінити дистанцію наявної реєстрації.
+        """
+        if training.is_past or training.is_cancelled:
+            return RegistrationResult(Status.UNAVAILABLE)
+
+        try:
+            with transaction.atomic():
+                return cls._register(
+                    training, participant, distance, change_distance
+                )
+        except IntegrityError:
+            # Паралельний запит того самого учасника вже створив запис
+            registration = TrainingRegistration.objects.filter(
+                training=training, participant=participant
+            ).first()
+            if registration:
+                return RegistrationResult(
+                    Status.ALREADY_REGISTERED, registration=registration
+                )
+            return RegistrationResult(
+                Status.ALREADY_WAITLISTED,
+                waitlist_entry=TrainingWaitlistEntry.objects.filter(
+                    training=training, participant=participant
+                ).first(),
+            )
+
+    @classmethod
+    def _register(
+        cls,
+        training: TrainingEvent,
+        participant: ClubUser,
+        distance: TrainingDistance,
+        change_distance: bool,
+    ) -> RegistrationResult:
+        registration = (
+            TrainingRegistration.objects.select_for_update()
+            .filter(training=training, participant=participant)
+            .first()
+        )
+        if registration and (
+            not change_distance or registration.distance_id == distance.id
+        ):
+            return RegistrationResult(
+                Status.ALREADY_REGISTERED, registration=registration
+            )
+
+        if not cls.reserve_slot(distance.id):
+            # Поточна реєстрація зберігається до переведення на нову
+            # дистанцію з листа очікування
+            result = cls._add_to_waitlist(training, participant, distance)
+            result.registration = registration
+            return result
+
+        TrainingWaitlistEntry.objects.filter(
+            training=training, participant=participant
+        ).delete()
+
+        # Місце на дистанції вже враховано під час резервування
+        if registration:
+            registration.distance = distance
+            registration._distance_counted = True
+            registration.save()
+            return RegistrationResult(
+                Status.UPDATED, registration=registration
+            )
+
+        registration = TrainingRegistration(
+            training=training, participant=participant, distance=distance
+        )
+        registration._distance_counted = True
+        registration.save()
+        return RegistrationResult(Status.REGISTERED, registration=registration)
+
+    @staticmethod
+    def _add_to_waitlist(
+        training: TrainingEvent,
+        participant: ClubUser,
+        distance: TrainingDistance,
+    ) -> RegistrationResult:
+        entry, created = TrainingWaitlistEntry.objects.get_or_create(
+            training=training,
+            participant=participant,
+            defaults={"distance": distance},
+        )
+        if not created and entry.distance_id != distance.id:
+            entry.distance = distance
+            entry.save(update_fields=["distance", "updated_at"])
+        return RegistrationResult(
+            Status.WAITLISTED if created else Status.ALREADY_WAITLISTED,
+            waitlist_entry=entry,
+        )
+
+    @staticmethod
+    def unregister(training: TrainingEvent, participant: ClubUser) -> bool:
+        """
+        Скасовує реєстрацію та місце учасника в листі очікування.
+        Звільнене місце займає наступний учасник з листа очікування
+        (сигнал видалення реєстрації викликає promote_waitlist).
+
+        Повертає False, якщо учасник не був зареєстрований.
+        """
+        with transaction.atomic():
+            TrainingWaitlistEntry.objects.filter(
+                training=training, participant=participant
+            ).delete()
+            deleted, _ = TrainingRegistration.objects.filter(
+                training=training, participant=participant
+            ).delete()
+        return bool(deleted)
+
+    @classmethod
+    def promote_waitlist(cls, distance_id: int) -> List[TrainingRegistration]:
+        """
+        Переводить учасників з листа очікування, поки на дистанції є
+        вільні місця. Реєстрацію учасника, що чекав на зміну дистанції,
+        переносить на цю дистанцію. Учасники отримують сповіщення після
+        фіксації транзакції.
+        """
+        from training_events.tasks import notify_waitlist_promotion
+
+        promoted = []
+        with transaction.atomic():
+            entries = (
+                TrainingWaitlistEntry.objects.select_for_update(
+                    skip_locked=True, of=("self",)
+                )
+                .filter(
+                    distance_id=distance_id,
+                    training__is_cancelled=False,
+                    training__date__gt=timezone.now(),
+                )
+                .order_by("created_at")
+            )
+            for entry in entries:
+                registration = (
+                    TrainingRegistration.objects.select_for_update()
+                    .filter(
+                        training_id=entry.training_id,
+                        participant_id=entry.participant_id,
+                    )
+                    .first()
+                )
+                if registration and registration.distance_id == distance_id:
+                    entry.delete()
+                    continue
+                if not cls.reserve_slot(distance_id):
+                    break
+
+                # Учасник чекав на зміну дистанції: переносимо реєстрацію,
+                # а місце на попередній дистанції звільняє сигнал збереження
+                if registration:
+                    registration.distance_id = distance_id
+                else:
+                    registration = TrainingRegistration(
+                        training_id=entry.training_id,
+                        participant_id=entry.participant_id,
+                        distance_id=distance_id,
+                    )
+                registration._distance_counted = True
+                registration.save()
+                entry.delete()
+                promoted.append(registration)
+
+                transaction.on_commit(
+                    lambda pk=registration.pk: notify_waitlist_promotion.delay(
+                        pk
+                    )
+                )
+                logger.info(
+                    "Учасника %s переведено з листа очікування на "
+                    "тренування %s",
+                    entry.participant_id,
+                    entry.training_id,
+                )
+        return promoted
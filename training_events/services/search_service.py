@@ -0,0 +1,284 @@
+import logging
+import re
+from typing import List
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.apps import apps
+from django.db import DatabaseError, connections
+from django.db.models import FloatField, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+logger = logging.getLogger("training_events")
+
+# Таблиця FTS5 для SQLite, що індексує TrainingEvent.search_document
+SQLITE_SEARCH_TABLE = "training_events_search"
+# Індекси Postgres для повнотекстового та триграмного пошуку
+POSTGRES_SEARCH_INDEX = "training_search_document_fts"
+POSTGRES_TRIGRAM_INDEX = "training_search_document_trgm"
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_SPACES_PATTERN = re.compile(r"\s+")
+
+_POSTGRES_SETUP = (
+    f"""
+    CREATE INDEX IF NOT EXISTS {POSTGRES_SEARCH_INDEX}
+    ON training_events_trainingevent
+    USING GIN (
+        to_tsvector('simple'::regconfig, COALESCE(search_document, ''))
+    )
+    """,
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    CREATE INDEX IF NOT EXISTS {POSTGRES_TRIGRAM_INDEX}
+    ON training_events_trainingevent
+    USING GIN (search_document gin_trgm_ops)
+    """,
+)
+
+_SQLITE_SETUP = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_SEARCH_TABLE} USING fts5(
+        search_document,
+        content='training_events_trainingevent',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_ai
+    AFTER INSERT ON training_events_trainingevent BEGIN
+        INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_document)
+        VALUES (new.id, new.search_document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_ad
+    AFTER DELETE ON training_events_trainingevent BEGIN
+        INSERT INTO {SQLITE_SEARCH_TABLE}(
+            {SQLITE_SEARCH_TABLE}, rowid, search_document
+        )
+        VALUES ('delete', old.id, old.search_document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_au
+    AFTER UPDATE OF search_document ON training_events_trainingevent BEGIN
+        INSERT INTO {SQLITE_SEARCH_TABLE}(
+            {SQLITE_SEARCH_TABLE}, rowid, search_document
+        )
+        VALUES ('delete', old.id, old.search_document);
+        INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_document)
+        VALUES (new.id, new.search_document);
+    END
+    """,
+)
+_SQLITE_REBUILD = (
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) "
+    "VALUES ('rebuild')"
+)
+
+# Запити до каталогу, що перевіряють наявність структур пошуку
+_POSTGRES_CHECK = (
+    "SELECT COUNT(*) FROM pg_indexes WHERE indexname IN (%s, %s)",
+    (POSTGRES_SEARCH_INDEX, POSTGRES_TRIGRAM_INDEX),
+    2,
+)
+_SQLITE_CHECK = (
+    "SELECT COUNT(*) FROM sqlite_master WHERE "
+    "(type = 'table' AND name = %s) OR (type = 'trigger' AND name IN "
+    "(%s, %s, %s))",
+    (
+        SQLITE_SEARCH_TABLE,
+        f"{SQLITE_SEARCH_TABLE}_ai",
+        f"{SQLITE_SEARCH_TABLE}_ad",
+        f"{SQLITE_SEARCH_TABLE}_au",
+    ),
+    4,
+)
+
+# Бази даних, для яких структури пошуку вже перевірено: alias -> наявні
+_backends = {}
+
+
+def build_search_document(*parts) -> str:
+    """
+    Текст для пошукового індексу з назви, місця, опису та імені
+    організатора: без HTML, у нижньому регістрі, з одинарними пробілами.
+    """
+    text = " ".join(strip_tags(str(part)) for part in parts if part)
+    return _SPACES_PATTERN.sub(" ", text).strip().lower()
+
+
+def get_search_words(query: str) -> List[str]:
+    """Слова пошукового запиту без спецсимволів синтаксису запитів."""
+    return _WORD_PATTERN.findall(query.lower())
+
+
+def ensure_search_backend(
+    using: str = "default", rebuild: bool = False
+) -> bool:
+    """
+    Створює індекси Postgres або таблицю FTS5 SQLite, якщо їх немає.
+    Повертає False, якщо база даних не підтримує повнотекстовий пошук.
+    Виконує DDL, тому викликається лише з post_migrate або команди
+    setup_training_search, а не під час запиту.
+
+    :param using: Псевдонім бази даних.
+    :param rebuild: Переіндексувати всі тренування в таблиці FTS5.
+    """
+    connection = connections[using]
+    setup = {"postgresql": _POSTGRES_SETUP, "sqlite": _SQLITE_SETUP}.get(
+        connection.vendor
+    )
+    if setup is None:
+        return False
+    if rebuild and connection.vendor == "sqlite":
+        setup = (*setup, _SQLITE_REBUILD)
+
+    try:
+        with connection.cursor() as cursor:
+            for statement in setup:
+                cursor.execute(statement)
+    except DatabaseError as e:
+        logger.warning("Не вдалося створити пошуковий індекс: %s", e)
+        return False
+    return True
+
+
+def fill_search_documents(using: str = "default", only_empty=True) -> int:
+    """
+    Заповнює search_document тренувань (наприклад, після додавання поля).
+    Повертає кількість оновлених тренувань.
+    """
+    model = apps.get_model("training_events", "TrainingEvent")
+    trainings = model.objects.using(using).select_related("created_by")
+    if only_empty:
+        trainings = trainings.filter(search_document="")
+
+    changed = []
+    for training in trainings.iterator(chunk_size=500):
+        document = training.build_search_document()
+        if document != training.search_document:
+            training.search_document = document
+            changed.append(training)
+    model.objects.using(using).bulk_update(
+        changed, ["search_document"], batch_size=500
+    )
+    return len(changed)
+
+
+def search_backend_exists(using: str = "default") -> bool:
+    """
+    Перевіряє за каталогом бази даних, що структури пошуку створено.
+    Нічого не створює: без них пошук виконується звичайним фільтром.
+    """
+    connection = connections[using]
+    check = {"postgresql": _POSTGRES_CHECK, "sqlite": _SQLITE_CHECK}.get(
+        connection.vendor
+    )
+    if check is None:
+        return False
+
+    sql, params, expected = check
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            (found,) = cursor.fetchone()
+    except DatabaseError as e:
+        logger.warning("Не вдалося перевірити пошуковий індекс: %s", e)
+        return False
+    if found != expected:
+        logger.warning(
+            "Пошуковий індекс не створено, виконайте setup_training_search"
+        )
+    return found == expected
+
+
+def _is_backend_ready(using: str) -> bool:
+    if using not in _backends:
+        _backends[using] = search_backend_exists(using)
+    return _backends[using]
+
+
+class TrainingSearch:
+    """
+    Повнотекстовий пошук тренувань за TrainingEvent.search_document.
+
+    Postgres: SearchVector з GIN-індексом і ранжуванням SearchRank; якщо
+    нічого не знайдено (наприклад, через одруківку), використовується
+    триграмна схожість слів. SQLite: таблиця FTS5 з ранжуванням bm25.
+    Інші бази даних шукають кожне слово в search_document.
+
+    Результат має анотацію search_rank: чим більше, тим релевантніше.
+    """
+
+    @classmethod
+    def search(cls, queryset: QuerySet, query: str) -> QuerySet:
+        words = get_search_words(query)
+        if not words:
+            return queryset.annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            )
+
+        using = queryset.db
+        vendor = connections[using].vendor
+        if vendor == "postgresql" and _is_backend_ready(using):
+            return cls._search_postgres(queryset, words)
+        if vendor == "sqlite" and _is_backend_ready(using):
+            return cls._search_sqlite(queryset, words)
+        return cls._search_fallback(queryset, words)
+
+    @staticmethod
+    def _search_postgres(queryset: QuerySet, words: List[str]) -> QuerySet:
+        vector = SearchVector("search_document", config="simple")
+        search_query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            config="simple",
+            search_type="raw",
+        )
+        results = queryset.annotate(search_vector=vector).filter(
+            search_vector=search_query
+        )
+        if results.exists():
+            return results.annotate(
+                search_rank=SearchRank(vector, search_query)
+            )
+
+        phrase = " ".join(words)
+        return queryset.filter(
+            search_document__trigram_word_similar=phrase
+        ).annotate(
+            search_rank=TrigramWordSimilarity(phrase, "search_document")
+        )
+
+    @staticmethod
+    def _search_sqlite(queryset: QuerySet, words: List[str]) -> QuerySet:
+        match = " ".join(f'"{word}"*' for word in words)
+        table = queryset.model._meta.db_table
+        rank = RawSQL(
+            f"SELECT -bm25({SQLITE_SEARCH_TABLE}) FROM {SQLITE_SEARCH_TABLE} "
+            f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s "
+            f'AND {SQLITE_SEARCH_TABLE}.rowid = "{table}"."id"',
+            (match,),
+            output_field=FloatField(),
+        )
+        matched = RawSQL(
+            f"SELECT rowid FROM {SQLITE_SEARCH_TABLE} "
+            f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s",
+            (match,),
+        )
+        return queryset.filter(id__in=matched).annotate(search_rank=rank)
+
+    @staticmethod
+    def _search_fallback(queryset: QuerySet, words: List[str]) -> QuerySet:
+        for word in words:
+            queryset = queryset.filter(search_document__contains=word)
+        return queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
@@ -1,13 +1,35 @@
+import logging
+from typing import Callable, Dict
+
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.db.models import Sum
+
+from common.services.cache_versions import get_cache_version
 from profiles.models import ClubUser
 from training_events.models import TrainingEvent
 
+logger = logging.getLogger("training_events")
+
+STATISTICS_NAMESPACE = "training_statistics"
+STATISTICS_KEY_TEMPLATE = "training_statistics:{name}:v{version}"
+
 
 class StatisticsService:
+    """
+    Статистика клубу та кількість тренувань.
+
+    Значення зберігаються в кеші з ключами, що містять версію простору
+    імен STATISTICS_NAMESPACE. Сигнали збільшують версію після зміни
+    тренувань, дистанцій чи учасників, а термін зберігання не перевищує
+    часу до початку найближчого тренування, коли змінюються лічильники
+    минулих і запланованих тренувань.
+    """
+
     @staticmethod
-    def get_club_statistics():
-        """Отримує статистику клубу"""
+    def compute_club_statistics() -> Dict[str, int]:
+        """Обчислює статистику клубу для головної сторінки."""
         now = timezone.now()
 
         return {
@@ -22,3 +44,85 @@ class StatisticsService:
                 or 0
             ),
         }
+
+    @staticmethod
+    def compute_training_counts() -> Dict[str, int]:
+        """Обчислює кількість усіх, запланованих та минулих тренувань."""
+        now = timezone.now()
+
+        return {
+            "total_trainings": TrainingEvent.objects.count(),
+            "upcoming_trainings": TrainingEvent.objects.filter(
+                date__gte=now, is_cancelled=False
+            ).count(),
+            "past_trainings": TrainingEvent.objects.filter(
+                date__lt=now
+            ).count(),
+        }
+
+    @classmethod
+    def get_club_statistics(cls) -> Dict[str, int]:
+        """Отримує статистику клубу"""
+        return cls._get_cached("club", cls.compute_club_statistics)
+
+    @classmethod
+    def get_training_counts(cls) -> Dict[str, int]:
+        """Отримує кількість тренувань для списку тренувань."""
+        return cls._get_cached("training_counts", cls.compute_training_counts)
+
+    @classmethod
+    def refresh(cls) -> None:
+        """Перераховує всі значення та зберігає їх у кеші."""
+        version = get_cache_version(STATISTICS_NAMESPACE)
+        timeout = cls._get_timeout()
+        for name, compute in cls._get_computations().items():
+            cls._store(name, version, compute(), timeout)
+
+    @classmethod
+    def _get_computations(cls) -> Dict[str, Callable[[], Dict]]:
+        return {
+            "club": cls.compute_club_statistics,
+            "training_counts": cls.compute_training_counts,
+        }
+
+    @classmethod
+    def _get_cached(cls, name: str, compute: Callable[[], Dict]) -> Dict:
+        version = get_cache_version(STATISTICS_NAMESPACE)
+        key = STATISTICS_KEY_TEMPLATE.format(name=name, version=version)
+        try:
+            value = cache.get(key)
+        except Exception as e:
+            logger.warning("Помилка читання статистики з кешу: %s", e)
+            return compute()
+
+        if value is None:
+            value = compute()
+            cls._store(name, version, value, cls._get_timeout())
+        return value
+
+    @staticmethod
+    def _store(name: str, version: int, value: Dict, timeout: int) -> None:
+        key = STATISTICS_KEY_TEMPLATE.format(name=name, version=version)
+        try:
+            cache.set(key, value, timeout)
+        except Exception as e:
+            logger.warning("Помилка збереження статистики в кеші: %s", e)
+
+    @staticmethod
+    def _get_timeout() -> int:
+        """
+        Термін зберігання статистики: не довше за налаштування і не
+        довше, ніж до початку найближчого тренування.
+        """
+        timeout = settings.TRAINING_STATISTICS_CACHE_TTL
+        now = timezone.now()
+        next_training = (
+            TrainingEvent.objects.filter(date__gte=now)
+            .order_by("date")
+            .values_list("date", flat=True)
+            .first()
+        )
+        if next_training:
+            seconds = int((next_training - now).total_seconds()) + 1
+            timeout = min(timeout, seconds)
+        return max(timeout, 1)
@@ -1,7 +1,13 @@
 from datetime import timedelta
-from django.db.models import Count, Sum
+from typing import List
+
+from asgiref.sync import sync_to_async
+from django.db.models import F
 from django.utils import timezone
-from training_events.models import TrainingEvent
+from django.utils.safestring import SafeString
+
+from training_events.models import TrainingEvent, TrainingRegistration
+from training_events.services.card_cache import render_training_cards
 
 
 class TrainingService:
@@ -9,7 +15,7 @@ class TrainingService:
 
     @staticmethod
     def get_upcoming_trainings(limit: int = None):
-        """Отримує найближчі тренування з учасниками
+        """Отримує найближчі тренування з дистанціями
         Args:
             limit (int, optional): Ліміт тренувань.
         """
@@ -18,13 +24,8 @@ class TrainingService:
         trainings = (
             TrainingEvent.objects.filter(date__gt=now, is_cancelled=False)
             .select_related("created_by")
-            .prefetch_related(
-                "distances", "registrations", "registrations__participant"
-            )
-            .annotate(
-                participants_count=Count("registrations", distinct=True),
-                max_participants_total=Sum("distances__max_participants"),
-            )
+            .prefetch_related("distances")
+            .annotate(participants_count=F("registrations_count"))
             .order_by("date")
         )
 
@@ -35,6 +36,59 @@ class TrainingService:
 
         return trainings
 
+    @staticmethod
+    async def get_upcoming_cards(user, limit: int = None) -> List[SafeString]:
+        """Отримує HTML карток найближчих тренувань для користувача
+        Args:
+            user: Поточний користувач.
+            limit (int, optional): Ліміт тренувань.
+        """
+        training_ids = (
+            TrainingEvent.objects.filter(
+                date__gt=timezone.now(), is_cancelled=False
+            )
+            .order_by("date")
+            .values_list("id", flat=True)
+        )
+        if limit is not None:
+            training_ids = training_ids[:limit]
+        training_ids = [pk async for pk in training_ids]
+
+        # Стан реєстрації користувача визначає кнопки картки
+        if user.is_authenticated:
+            registered = {
+                pk
+                async for pk in TrainingRegistration.objects.filter(
+                    participant=user, training_id__in=training_ids
+                ).values_list("training_id", flat=True)
+            }
+            variants = {
+                pk: "registered" if pk in registered else "member"
+                for pk in training_ids
+            }
+        else:
+            variants = dict.fromkeys(training_ids, "anonymous")
+
+        return await sync_to_async(render_training_cards)(
+            "club/training_card.html",
+            training_ids,
+            TrainingService._load_cards,
+            variants,
+        )
+
+    @staticmethod
+    def _load_cards(training_ids: List[int]):
+        """Завантажує тренування для рендерингу карток"""
+        trainings = (
+            TrainingEvent.objects.filter(id__in=training_ids)
+            .select_related("created_by")
+            .prefetch_related("distances")
+            .annotate(participants_count=F("registrations_count"))
+        )
+        for training in trainings:
+            TrainingService._enrich_training_data(training)
+            yield training
+
     @staticmethod
     def _enrich_training_data(training):
         """Додає додаткові обчислені поля до тренування"""
@@ -50,9 +104,6 @@ class TrainingService:
         )
 
         training.max_participants = max_participants
-        training.participants = [
-            reg.participant for reg in training.registrations.all()
-        ]  # список учасників
         distances = [str(d.distance) for d in training.distances.all()]
         training.distance = (
             " | ".join(distances) + " км" if distances else "TBD"
@@ -0,0 +1,235 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from common.services.cache_versions import bump_cache_version
+from profiles.models import ClubUser
+from training_events.models import (
+    TrainingComment,
+    TrainingDistance,
+    TrainingEvent,
+    TrainingRating,
+    TrainingRegistration,
+)
+from training_events.services.card_cache import invalidate_training_cards
+from training_events.services.counters import update_counters
+from training_events.services.facet_service import FACETS_NAMESPACE
+from training_events.services.registration_service import RegistrationService
+from training_events.services.search_service import (
+    ensure_search_backend,
+    fill_search_documents,
+)
+from training_events.services.statistics_service import STATISTICS_NAMESPACE
+
+
+@receiver(post_save, sender=TrainingEvent)
+@receiver(post_delete, sender=TrainingEvent)
+@receiver(post_save, sender=TrainingDistance)
+@receiver(post_delete, sender=TrainingDistance)
+def invalidate_training_statistics(sender, **kwargs):
+    """Позначає статистику тренувань застарілою."""
+    bump_cache_version(STATISTICS_NAMESPACE)
+
+
+@receiver(post_save, sender=TrainingEvent)
+@receiver(post_delete, sender=TrainingEvent)
+@receiver(post_save, sender=TrainingDistance)
+@receiver(post_delete, sender=TrainingDistance)
+def invalidate_training_facets(sender, **kwargs):
+    """Позначає значення фільтрів списку тренувань застарілими."""
+    bump_cache_version(FACETS_NAMESPACE)
+
+
+@receiver(post_save, sender=TrainingEvent)
+@receiver(post_delete, sender=TrainingEvent)
+def invalidate_training_event_cards(sender, instance, **kwargs):
+    """Позначає картки тренування застарілими після його зміни."""
+    invalidate_training_cards(instance.pk)
+
+
+@receiver(post_save, sender=TrainingDistance)
+@receiver(post_delete, sender=TrainingDistance)
+@receiver(post_save, sender=TrainingRegistration)
+@receiver(post_delete, sender=TrainingRegistration)
+@receiver(post_save, sender=TrainingRating)
+@receiver(post_delete, sender=TrainingRating)
+def invalidate_related_training_cards(sender, instance, **kwargs):
+    """
+    Позначає картки тренування застарілими після зміни його дистанцій,
+    реєстрацій чи оцінок.
+    """
+    invalidate_training_cards(instance.training_id)
+
+
+@receiver(post_save, sender=TrainingDistance)
+def promote_waitlist_on_distance_change(sender, instance, created, **kwargs):
+    """Заповнює місця, що з'явилися після збільшення ліміту дистанції."""
+    if not created:
+        transaction.on_commit(
+            partial(RegistrationService.promote_waitlist, instance.pk)
+        )
+
+
+@receiver(post_save, sender=ClubUser)
+@receiver(post_delete, sender=ClubUser)
+def invalidate_member_statistics(sender, update_fields=None, **kwargs):
+    """
+    Позначає статистику застарілою після зміни учасника.
+    Оновлення лише часу входу статистику не змінює.
+    """
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    bump_cache_version(STATISTICS_NAMESPACE)
+
+
+@receiver(post_save, sender=ClubUser)
+def update_organizer_search_documents(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    Оновлює пошуковий текст, картки та фільтри тренувань після зміни
+    імені організатора.
+    """
+    if created or (
+        update_fields and not {"first_name", "last_name"} & set(update_fields)
+    ):
+        return
+
+    trainings = list(TrainingEvent.objects.filter(created_by=instance))
+    for training in trainings:
+        training.created_by = instance
+        training.search_document = training.build_search_document()
+    TrainingEvent.objects.bulk_update(trainings, ["search_document"])
+    for training in trainings:
+        invalidate_training_cards(training.pk)
+    if trainings:
+        bump_cache_version(FACETS_NAMESPACE)
+
+
+@receiver(post_migrate)
+def setup_training_search(sender, using, **kwargs):
+    """Створює пошукові індекси та заповнює пошуковий текст тренувань."""
+    if sender.name != "training_events":
+        return
+    fill_search_documents(using)
+    ensure_search_backend(using, rebuild=True)
+
+
+@receiver(pre_save, sender=TrainingRegistration)
+def remember_registration_distance(sender, instance, **kwargs):
+    """Запам'ятовує попередню дистанцію реєстрації перед зміною."""
+    instance._previous_distance_id = (
+        None
+        if instance._state.adding
+        else sender.objects.filter(pk=instance.pk)
+        .values_list("distance_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=TrainingRegistration)
+def count_saved_registration(sender, instance, created, **kwargs):
+    """Оновлює лічильники реєстрацій тренування та дистанцій."""
+    # Місце, зарезервоване RegistrationService, вже враховано
+    distance_delta = 0 if getattr(instance, "_distance_counted", False) else 1
+    instance._distance_counted = False
+
+    if created:
+        update_counters(
+            TrainingEvent, instance.training_id, registrations_count=1
+        )
+        update_counters(
+            TrainingDistance,
+            instance.distance_id,
+            registrations_count=distance_delta,
+        )
+        return
+
+    previous_distance_id = getattr(instance, "_previous_distance_id", None)
+    if previous_distance_id and previous_distance_id != instance.distance_id:
+        update_counters(
+            TrainingDistance, previous_distance_id, registrations_count=-1
+        )
+        update_counters(
+            TrainingDistance,
+            instance.distance_id,
+            registrations_count=distance_delta,
+        )
+        transaction.on_commit(
+            partial(RegistrationService.promote_waitlist, previous_distance_id)
+        )
+
+
+@receiver(post_delete, sender=TrainingRegistration)
+def count_deleted_registration(sender, instance, **kwargs):
+    """Звільняє місце та пропонує його листу очікування."""
+    update_counters(
+        TrainingEvent, instance.training_id, registrations_count=-1
+    )
+    update_counters(
+        TrainingDistance, instance.distance_id, registrations_count=-1
+    )
+    transaction.on_commit(
+        partial(RegistrationService.promote_waitlist, instance.distance_id)
+    )
+
+
+@receiver(pre_save, sender=TrainingRating)
+def remember_rating(sender, instance, **kwargs):
+    """Запам'ятовує попередню оцінку перед зміною."""
+    instance._previous_rating = (
+        None
+        if instance._state.adding
+        else sender.objects.filter(pk=instance.pk)
+        .values_list("rating", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=TrainingRating)
+def count_saved_rating(sender, instance, created, **kwargs):
+    """Оновлює кількість та суму оцінок тренування."""
+    if created:
+        update_counters(
+            TrainingEvent,
+            instance.training_id,
+            ratings_count=1,
+            ratings_sum=instance.rating,
+        )
+        return
+
+    previous_rating = getattr(instance, "_previous_rating", None)
+    if previous_rating is not None:
+        update_counters(
+            TrainingEvent,
+            instance.training_id,
+            ratings_sum=instance.rating - previous_rating,
+        )
+
+
+@receiver(post_delete, sender=TrainingRating)
+def count_deleted_rating(sender, instance, **kwargs):
+    update_counters(
+        TrainingEvent,
+        instance.training_id,
+        ratings_count=-1,
+        ratings_sum=-instance.rating,
+    )
+
+
+@receiver(post_save, sender=TrainingComment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    if created:
+        update_counters(TrainingEvent, instance.training_id, comments_count=1)
+
+
+@receiver(post_delete, sender=TrainingComment)
+def count_deleted_comment(sender, instance, **kwargs):
+    update_counters(TrainingEvent, instance.training_id, comments_count=-1)
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from robot.config import ROBOT
+from robot.tgbot.text import user_template as mt
+from training_events.models import TrainingRegistration
+from training_events.services.statistics_service import StatisticsService
+
+logger = logging.getLogger("training_events")
+
+
+@shared_task(expires=600)
+def refresh_training_statistics() -> None:
+    """
+    Завдання Celery для періодичного перерахунку статистики клубу.
+    Відвідувачі сторінок отримують уже обчислені значення з кешу.
+    """
+    StatisticsService.refresh()
+    logger.info("Статистику тренувань оновлено")
+
+
+@shared_task(expires=3600)
+def notify_waitlist_promotion(registration_id: int) -> None:
+    """Сповіщає учасника про переведення з листа очікування."""
+
+    registration = (
+        TrainingRegistration.objects.select_related(
+            "training", "distance", "participant"
+        )
+        .filter(pk=registration_id)
+        .first()
+    )
+    if not registration:
+        return
+
+    training = registration.training
+    message = mt.format_waitlist_promotion_template.format(
+        title=training.title,
+        date=timezone.localtime(training.date).strftime("%d.%m.%Y 🕑 %H:%M"),
+        location=training.location,
+        distance=registration.distance.distance,
+        training_id=training.id,
+    )
+
+    async def main() -> None:
+        async with ROBOT as bot:
+            await bot.send_message(
+                chat_id=registration.participant.telegram_id, text=message
+            )
+
+    try:
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(main())
+    except Exception as e:
+        logger.error(
+            "Не вдалося сповістити учасника %s з листа очікування: %s",
+            registration.participant_id,
+            e,
+        )
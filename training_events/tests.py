@@ -0,0 +1,386 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from common.testing import QueryPlanTestMixin
+from profiles.models import ClubUser
+from training_events.enums import RegistrationStatusChoices
+from training_events.models import (
+    TrainingComment,
+    TrainingDistance,
+    TrainingEvent,
+    TrainingRating,
+    TrainingRegistration,
+    TrainingWaitlistEntry,
+)
+from training_events.services import search_service
+from training_events.services.registration_service import RegistrationService
+from training_events.services.search_service import (
+    SQLITE_SEARCH_TABLE,
+    TrainingSearch,
+    search_backend_exists,
+)
+
+
+class RegistrationConcurrencyTests(TransactionTestCase):
+    """Одночасні реєстрації на дистанцію з обмеженою кількістю місць"""
+
+    PARTICIPANTS = 200
+    MAX_PARTICIPANTS = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if connection.vendor == "sqlite":
+            # SQLite допускає лише одну транзакцію запису: потоки чекають
+            # на блокування замість помилки "database is locked"
+            cls._options = connection.settings_dict["OPTIONS"]
+            connection.settings_dict["OPTIONS"] = {
+                **cls._options,
+                "timeout": 60,
+                "transaction_mode": "IMMEDIATE",
+            }
+            connection.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        if connection.vendor == "sqlite":
+            connection.settings_dict["OPTIONS"] = cls._options
+            connection.close()
+        super().tearDownClass()
+
+    def setUp(self):
+        organizer = ClubUser.objects.create(username="org", telegram_id=1)
+        self.training = TrainingEvent.objects.create(
+            title="Тренування",
+            date=timezone.now() + timedelta(days=1),
+            location="Парк",
+            created_by=organizer,
+        )
+        self.distance = TrainingDistance.objects.create(
+            training=self.training,
+            distance=5,
+            max_participants=self.MAX_PARTICIPANTS,
+        )
+        ClubUser.objects.bulk_create(
+            ClubUser(username=f"runner{i}", telegram_id=100 + i)
+            for i in range(self.PARTICIPANTS)
+        )
+        self.participants = list(ClubUser.objects.exclude(pk=organizer.pk))
+
+    def register_concurrently(self):
+        barrier = threading.Barrier(len(self.participants))
+        statuses, errors = [], []
+
+        def register(participant):
+            try:
+                barrier.wait()
+                result = RegistrationService.register(
+                    self.training, participant, self.distance
+                )
+                statuses.append(result.status)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=register, args=(participant,))
+            for participant in self.participants
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return statuses
+
+    @mock.patch("training_events.tasks.notify_waitlist_promotion.delay")
+    def test_overflow_goes_to_waitlist(self, notify):
+        statuses = self.register_concurrently()
+
+        registered = TrainingRegistration.objects.filter(
+            distance=self.distance
+        )
+        self.distance.refresh_from_db()
+        self.assertEqual(registered.count(), self.MAX_PARTICIPANTS)
+        self.assertEqual(
+            self.distance.registrations_count, self.MAX_PARTICIPANTS
+        )
+        self.assertEqual(
+            statuses.count(RegistrationStatusChoices.REGISTERED),
+            self.MAX_PARTICIPANTS,
+        )
+        self.assertEqual(
+            TrainingWaitlistEntry.objects.filter(
+                distance=self.distance
+            ).count(),
+            self.PARTICIPANTS - self.MAX_PARTICIPANTS,
+        )
+
+        # Скасування реєстрації переводить першого з листа очікування
+        first_waiting = TrainingWaitlistEntry.objects.earliest("created_at")
+        RegistrationService.unregister(
+            self.training, registered.first().participant
+        )
+
+        self.distance.refresh_from_db()
+        self.assertEqual(registered.count(), self.MAX_PARTICIPANTS)
+        self.assertEqual(
+            self.distance.registrations_count, self.MAX_PARTICIPANTS
+        )
+        self.assertTrue(
+            registered.filter(
+                participant_id=first_waiting.participant_id
+            ).exists()
+        )
+        self.assertEqual(
+            TrainingWaitlistEntry.objects.count(),
+            self.PARTICIPANTS - self.MAX_PARTICIPANTS - 1,
+        )
+        notify.assert_called_once()
+
+
+class TrainingAvailableSlotsTests(TestCase):
+    """Перевірка вільних місць тренування за лічильниками"""
+
+    def setUp(self):
+        organizer = ClubUser.objects.create(username="org", telegram_id=1)
+        self.training = TrainingEvent.objects.create(
+            title="Тренування",
+            date=timezone.now() + timedelta(days=1),
+            location="Парк",
+            created_by=organizer,
+        )
+        self.distance = TrainingDistance.objects.create(
+            training=self.training, distance=5, max_participants=1
+        )
+        TrainingDistance.objects.create(
+            training=self.training, distance=10, max_participants=1
+        )
+
+    def fill_distances(self):
+        TrainingDistance.objects.update(registrations_count=1)
+
+    def test_single_query_without_prefetch(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.training.has_available_slots)
+
+        self.fill_distances()
+        with self.assertNumQueries(1):
+            self.assertFalse(self.training.has_available_slots)
+
+    def test_uses_prefetched_distances(self):
+        self.fill_distances()
+        training = TrainingEvent.objects.prefetch_related("distances").get(
+            pk=self.training.pk
+        )
+        with self.assertNumQueries(0):
+            self.assertFalse(training.has_available_slots)
+
+    def test_unlimited_distance_has_slots(self):
+        self.fill_distances()
+        self.distance.max_participants = 0
+        self.distance.save()
+
+        self.assertTrue(self.training.has_available_slots)
+
+
+class DistanceChangeWaitlistTests(TestCase):
+    """Зміна дистанції на заповнену через лист очікування"""
+
+    def setUp(self):
+        organizer = ClubUser.objects.create(username="org", telegram_id=1)
+        self.training = TrainingEvent.objects.create(
+            title="Тренування",
+            date=timezone.now() + timedelta(days=1),
+            location="Парк",
+            created_by=organizer,
+        )
+        self.short = TrainingDistance.objects.create(
+            training=self.training, distance=5, max_participants=0
+        )
+        self.long = TrainingDistance.objects.create(
+            training=self.training, distance=10, max_participants=1
+        )
+        self.holder = ClubUser.objects.create(username="holder", telegram_id=2)
+        self.runner = ClubUser.objects.create(username="runner", telegram_id=3)
+        RegistrationService.register(self.training, self.holder, self.long)
+        RegistrationService.register(self.training, self.runner, self.short)
+
+    @mock.patch("training_events.tasks.notify_waitlist_promotion.delay")
+    def test_registration_moves_when_slot_frees(self, notify):
+        result = RegistrationService.register(
+            self.training, self.runner, self.long, change_distance=True
+        )
+
+        self.assertEqual(result.status, RegistrationStatusChoices.WAITLISTED)
+        self.assertEqual(result.registration.distance, self.short)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RegistrationService.unregister(self.training, self.holder)
+
+        registration = TrainingRegistration.objects.get(
+            training=self.training, participant=self.runner
+        )
+        self.assertEqual(registration.distance, self.long)
+        self.assertFalse(TrainingWaitlistEntry.objects.exists())
+        self.short.refresh_from_db()
+        self.long.refresh_from_db()
+        self.assertEqual(self.short.registrations_count, 0)
+        self.assertEqual(self.long.registrations_count, 1)
+        notify.assert_called_once_with(registration.pk)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+)
+class TrainingDetailQueryCountTests(TestCase):
+    """Кількість запитів сторінки тренування не залежить від даних"""
+
+    # Тренування з дистанціями, реєстраціями, оцінками та коментарями
+    ANONYMOUS_QUERIES = 5
+    # Додатково сесія та користувач
+    AUTHENTICATED_QUERIES = ANONYMOUS_QUERIES + 2
+
+    def setUp(self):
+        self.organizer = ClubUser.objects.create(username="org", telegram_id=1)
+        self.user = ClubUser.objects.create(username="user", telegram_id=2)
+
+    def create_training(self, distances, participants):
+        training = TrainingEvent.objects.create(
+            title=f"Тренування {distances}x{participants}",
+            date=timezone.now() - timedelta(days=1),
+            location="Парк",
+            created_by=self.organizer,
+        )
+        training_distances = [
+            TrainingDistance.objects.create(
+                training=training, distance=5 + i, max_participants=0
+            )
+            for i in range(distances)
+        ]
+        runners = [self.user] + [
+            ClubUser.objects.create(
+                username=f"runner{training.pk}_{i}",
+                telegram_id=1000 * training.pk + i,
+            )
+            for i in range(participants - 1)
+        ]
+        for i, runner in enumerate(runners):
+            TrainingRegistration.objects.create(
+                training=training,
+                participant=runner,
+                distance=training_distances[i % distances],
+            )
+            TrainingRating.objects.create(
+                training=training, participant=runner, rating=4
+            )
+            TrainingComment.objects.create(
+                training=training, participant=runner, comment="Дякую!"
+            )
+        return training
+
+    def assert_detail_queries(self, queries):
+        for distances, participants in ((1, 1), (5, 30)):
+            training = self.create_training(distances, participants)
+            url = reverse(
+                "training_events:training_detail", args=[training.pk]
+            )
+            with self.subTest(distances=distances, participants=participants):
+                with self.assertNumQueries(queries):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.context["participants_count"], participants
+                )
+
+    def test_anonymous_user(self):
+        self.assert_detail_queries(self.ANONYMOUS_QUERIES)
+
+    def test_registered_user(self):
+        self.client.force_login(self.user)
+        self.assert_detail_queries(self.AUTHENTICATED_QUERIES)
+
+
+class TrainingSearchBackendTests(TestCase):
+    """Пошук не змінює схему бази даних під час запиту"""
+
+    def setUp(self):
+        organizer = ClubUser.objects.create(username="org", telegram_id=1)
+        self.training = TrainingEvent.objects.create(
+            title="Нічний забіг",
+            date=timezone.now() + timedelta(days=1),
+            location="Парк",
+            created_by=organizer,
+        )
+        search_service._backends.clear()
+        self.addCleanup(search_service._backends.clear)
+
+    def search(self, query):
+        return list(TrainingSearch.search(TrainingEvent.objects.all(), query))
+
+    def test_uses_backend_created_on_migrate(self):
+        self.assertTrue(search_backend_exists())
+        self.assertEqual(self.search("нічн"), [self.training])
+
+    def test_missing_backend_falls_back_to_filter(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Перевіряється на таблиці FTS5 SQLite")
+        with connection.cursor() as cursor:
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER {SQLITE_SEARCH_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE {SQLITE_SEARCH_TABLE}")
+
+        self.assertEqual(self.search("забіг"), [self.training])
+        self.assertFalse(search_backend_exists())
+
+
+class TrainingIndexTests(QueryPlanTestMixin, TestCase):
+    """Найчастіші запити тренувань використовують індекси"""
+
+    ROWS = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now()
+        organizer = ClubUser.objects.create(username="org", telegram_id=1)
+        # Більшість тренувань минули та вже мають опитування
+        TrainingEvent.objects.bulk_create(
+            TrainingEvent(
+                title=f"Тренування {i}",
+                date=cls.now + timedelta(hours=i - cls.ROWS + 100),
+                location="Парк",
+                created_by=organizer,
+                is_cancelled=i % 7 == 0,
+                is_feedback_sent=i < cls.ROWS - 150,
+            )
+            for i in range(cls.ROWS)
+        )
+        cls.analyze()
+
+    def test_upcoming_trainings(self):
+        queryset = TrainingEvent.objects.filter(
+            date__gt=self.now, is_cancelled=False
+        ).order_by("date")
+        self.assertUsesIndex(queryset, "training_active_date_idx")
+
+    def test_feedback_due_trainings(self):
+        queryset = TrainingEvent.objects.filter(
+            date__lte=self.now - timedelta(hours=2),
+            is_feedback_sent=False,
+            is_cancelled=False,
+        )
+        self.assertUsesIndex(queryset, "training_feedback_due_idx")
+
+    def test_training_list_page(self):
+        queryset = TrainingEvent.objects.order_by("-date", "-id")[:11]
+        self.assertUsesIndex(queryset, "training_date_id_idx")
@@ -28,6 +28,11 @@ urlpatterns = [
         views.AddTrainingCommentView.as_view(),
         name="add_training_comment",
     ),
+    path(
+        "facets/",
+        views.TrainingFacetsView.as_view(),
+        name="training_facets",
+    ),
     path("", views.TrainingListView.as_view(), name="training_list"),
 ]
 
@@ -1,12 +1,26 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Avg, Count, Q
+from django.db.models import (
+    Exists,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    prefetch_related_objects,
+)
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
 from django.views.generic import DetailView, View, ListView
 
+from training_events.enums import (
+    RegistrationStatusChoices as RegistrationStatus,
+)
 from training_events.forms import TrainingCommentForm, TrainingRatingForm
 from training_events.models import (
     TrainingEvent,
@@ -15,6 +29,12 @@ from training_events.models import (
     TrainingRating,
     TrainingDistance,
 )
+from training_events.services.card_cache import render_training_cards
+from training_events.services.facet_service import FacetService
+from training_events.services.pagination import apaginate_keyset
+from training_events.services.registration_service import RegistrationService
+from training_events.services.search_service import TrainingSearch
+from training_events.services.statistics_service import StatisticsService
 
 
 class TrainingDetailView(DetailView):
@@ -24,26 +44,75 @@ class TrainingDetailView(DetailView):
     template_name = "training_events/training_detail.html"
     context_object_name = "training"
 
+    async def get(self, request, *args, **kwargs):
+        # Користувач потрібен для контексту, тож завантажуємо його заздалегідь
+        request.user = await request.auser()
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        """Тренування з усіма даними сторінки за один виклик"""
+        try:
+            return await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except TrainingEvent.DoesNotExist:
+            raise Http404("Тренування не знайдено")
+
+    def get_queryset(self):
+        return TrainingEvent.objects.select_related(
+            "created_by"
+        ).prefetch_related(
+            Prefetch(
+                "distances",
+                queryset=TrainingDistance.objects.order_by("distance"),
+            ),
+            Prefetch(
+                "registrations",
+                queryset=TrainingRegistration.objects.select_related(
+                    "participant"
+                ),
+            ),
+            "ratings",
+            Prefetch(
+                "comments",
+                queryset=TrainingComment.objects.select_related(
+                    "participant"
+                ).order_by("-created_at"),
+            ),
+        )
+
     def get_context_data(self, **kwargs):
+        """
+        Контекст сторінки з даних, завантажених у get_queryset.
+        Кількість запитів не залежить від кількості дистанцій та учасників.
+        """
         context = super().get_context_data(**kwargs)
         training = self.object
 
-        registrations = training.registrations.select_related(
-            "participant", "distance"
-        )
-        context["participants_count"] = registrations.count()
-
-        ratings = training.ratings.all()
-        context["average_rating"] = ratings.aggregate(Avg("rating"))[
-            "rating__avg"
-        ]
-        context["ratings_count"] = ratings.count()
+        distances = list(training.distances.all())
+        registrations = list(training.registrations.all())
+        ratings = list(training.ratings.all())
+        comments = list(training.comments.all())
+
+        # Групуємо реєстрації за дистанціями
+        distances_by_id = {distance.id: distance for distance in distances}
+        participants_by_distance = {distance.id: [] for distance in distances}
+        for registration in registrations:
+            registration.distance = distances_by_id[registration.distance_id]
+            participants_by_distance[registration.distance_id].append(
+                registration
+            )
 
-        context["comments"] = (
-            training.comments.filter(is_public=True)
-            .select_related("participant")
-            .order_by("-created_at")
+        context["participants_count"] = len(registrations)
+        context["average_rating"] = (
+            sum(rating.rating for rating in ratings) / len(ratings)
+            if ratings
+            else None
         )
+        context["ratings_count"] = len(ratings)
+        context["comments"] = [
+            comment for comment in comments if comment.is_public
+        ]
 
         user = self.request.user
         user_registration = None
@@ -52,19 +121,33 @@ class TrainingDetailView(DetailView):
         can_rate_and_comment = False
 
         if user.is_authenticated:
-            try:
-                user_registration = registrations.get(participant=user)
-                can_rate_and_comment = training.is_past
-
-                if can_rate_and_comment:
-                    user_rating = training.ratings.filter(
-                        participant=user
-                    ).first()
-                    user_comment = training.comments.filter(
-                        participant=user
-                    ).first()
-            except TrainingRegistration.DoesNotExist:
-                pass
+            user_registration = next(
+                (
+                    registration
+                    for registration in registrations
+                    if registration.participant_id == user.id
+                ),
+                None,
+            )
+            can_rate_and_comment = bool(user_registration) and training.is_past
+
+            if can_rate_and_comment:
+                user_rating = next(
+                    (
+                        rating
+                        for rating in ratings
+                        if rating.participant_id == user.id
+                    ),
+                    None,
+                )
+                user_comment = next(
+                    (
+                        comment
+                        for comment in comments
+                        if comment.participant_id == user.id
+                    ),
+                    None,
+                )
 
         context.update(
             {
@@ -77,14 +160,10 @@ class TrainingDetailView(DetailView):
                 "distances_with_participants": [
                     {
                         "distance": distance,
-                        "participants": registrations.filter(
-                            distance=distance
-                        ),
-                        "count": registrations.filter(
-                            distance=distance
-                        ).count(),
+                        "participants": participants_by_distance[distance.id],
+                        "count": len(participants_by_distance[distance.id]),
                     }
-                    for distance in training.available_distances
+                    for distance in distances
                 ],
             }
         )
@@ -103,37 +182,38 @@ class TrainingRegisterView(LoginRequiredMixin, View):
 
         distance = get_object_or_404(training.distances, id=distance_id)
 
-        if training.is_past or training.is_cancelled:
-            messages.error(
-                request, "Неможливо зареєструватися на це тренування"
-            )
-            return redirect(
-                "training_events:training_events:training_detail",
-                pk=training.id,
-            )
-
-        if 0 < distance.max_participants <= distance.registrations.count():
-            messages.error(request, "На цій дистанції вже немає вільних місць")
-            return redirect("training_events:training_detail", pk=training.id)
-
-        registration, created = TrainingRegistration.objects.get_or_create(
-            training=training,
-            participant=request.user,
-            defaults={"distance": distance},
+        result = RegistrationService.register(
+            training, request.user, distance, change_distance=True
         )
 
-        if created:
+        if result.status == RegistrationStatus.REGISTERED:
             messages.success(
                 request,
                 f'Ви успішно зареєструвалися на тренування "{training.title}"',
             )
+        elif result.status == RegistrationStatus.UPDATED:
+            messages.success(request, "Вашу реєстрацію оновлено")
+        elif result.status == RegistrationStatus.ALREADY_REGISTERED:
+            messages.info(request, "Ви вже зареєстровані на це тренування")
+        elif result.status in (
+            RegistrationStatus.WAITLISTED,
+            RegistrationStatus.ALREADY_WAITLISTED,
+        ):
+            message = (
+                "На цій дистанції вже немає вільних місць. Вас додано до "
+                "листа очікування, і ми зареєструємо вас, щойно місце "
+                "звільниться"
+            )
+            if result.registration:
+                message += (
+                    ". До того часу зберігається ваша реєстрація на "
+                    f"{result.registration.distance.distance} км"
+                )
+            messages.info(request, message)
         else:
-            if registration.distance != distance:
-                registration.distance = distance
-                registration.save()
-                messages.success(request, "Вашу реєстрацію оновлено")
-            else:
-                messages.info(request, "Ви вже зареєстровані на це тренування")
+            messages.error(
+                request, "Неможливо зареєструватися на це тренування"
+            )
 
         return redirect("training_events:training_detail", pk=training.id)
 
@@ -143,13 +223,9 @@ class TrainingUnregisterView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         training = get_object_or_404(TrainingEvent, id=self.kwargs["pk"])
 
-        try:
-            registration = TrainingRegistration.objects.get(
-                training=training, participant=request.user
-            )
-            registration.delete()
+        if RegistrationService.unregister(training, request.user):
             messages.success(request, "Вашу реєстрацію скасовано")
-        except TrainingRegistration.DoesNotExist:
+        else:
             messages.error(request, "Ви не зареєстровані на це тренування")
 
         return redirect("training_events:training_detail", pk=training.id)
@@ -222,6 +298,12 @@ class AddTrainingCommentView(LoginRequiredMixin, View):
         return redirect("training_events:training_detail", pk=training.id)
 
 
+# Упорядкування списку тренувань: новіші спочатку
+LIST_ORDERING = ("-date", "-id")
+# Упорядкування результатів пошуку: релевантність, потім новіші
+SEARCH_ORDERING = ("-search_rank", "-id")
+
+
 class TrainingListView(ListView):
     """Відображення списку всіх тренувань з пошуком та фільтрацією"""
 
@@ -232,10 +314,16 @@ class TrainingListView(ListView):
     ordering = ["date"]
 
     def get_queryset(self):
-        queryset = (
-            TrainingEvent.objects.select_related("created_by")
-            .prefetch_related("distances", "registrations", "ratings")
-        ).order_by("-date")
+        # Лічильники учасників і рейтингів зберігаються в самому
+        # тренуванні, а дистанції завантажуються лише для карток,
+        # яких немає в кеші
+        queryset = TrainingEvent.objects.select_related("created_by").annotate(
+            capacity=Subquery(
+                TrainingDistance.objects.filter(training=OuterRef("pk"))
+                .order_by("id")
+                .values("max_participants")[:1]
+            )
+        )
 
         # Фільтрація за статусом
         status = self.request.GET.get("status")
@@ -252,16 +340,10 @@ class TrainingListView(ListView):
                 date__gte=timezone.now(), is_cancelled=False
             )
 
-        # Пошук
+        # Повнотекстовий пошук з ранжуванням за релевантністю
         search_query = self.request.GET.get("search")
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query)
-                | Q(description__icontains=search_query)
-                | Q(location__icontains=search_query)
-                | Q(created_by__first_name__icontains=search_query)
-                | Q(created_by__last_name__icontains=search_query)
-            )
+            queryset = TrainingSearch.search(queryset, search_query)
 
         # Фільтрація за місцем
         location = self.request.GET.get("location")
@@ -279,7 +361,13 @@ class TrainingListView(ListView):
             # Заміна коми на крапку
             distance = distance.replace(",", ".")
             distance = float(distance)
-            queryset = queryset.filter(distances__distance=distance)
+            queryset = queryset.filter(
+                Exists(
+                    TrainingDistance.objects.filter(
+                        training=OuterRef("pk"), distance=distance
+                    )
+                )
+            )
 
         # Фільтрація за датою
         date_from = self.request.GET.get("date_from")
@@ -289,11 +377,71 @@ class TrainingListView(ListView):
         if date_to:
             queryset = queryset.filter(date__lte=date_to)
 
-        return queryset.distinct()
+        return queryset
+
+    async def get(self, request, *args, **kwargs):
+        # Пошук може звертатися до бази даних під час побудови запиту
+        self.object_list = await sync_to_async(self.get_queryset)()
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def apaginate(self, queryset, page_size):
+        """
+        Список гортається курсором за (date, id), а результати пошуку
+        за релевантністю, тож глибокі сторінки не потребують OFFSET.
+        """
+        if self.request.GET.get("search"):
+            ordering = SEARCH_ORDERING
+        else:
+            ordering = LIST_ORDERING
+        return await apaginate_keyset(
+            queryset,
+            ordering,
+            self.request.GET.get("cursor"),
+            page_size,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        # Сторінку вже завантажено в aget_context_data
+        page = self.page
+        return None, page, page.object_list, page.has_next or page.has_previous
+
+    async def aget_context_data(self, **kwargs):
+        # Сторінка тренувань і статистика не залежать одне від одного,
+        # тож очікуються одночасно
+        self.page, counts = await asyncio.gather(
+            self.apaginate(self.object_list, self.paginate_by),
+            sync_to_async(StatisticsService.get_training_counts)(),
+        )
+        context = self.get_context_data(
+            object_list=self.page.object_list, **kwargs
+        )
+        context["training_cards"] = await sync_to_async(
+            self.get_training_cards
+        )(self.page.object_list)
+
+        # Статистика з кешу; значення фільтрів завантажує сторінка
+        # з TrainingFacetsView
+        context.update(counts)
+        return context
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
+        # Посилання на сусідні сторінки зі збереженням фільтрів
+        page = context["page_obj"]
+        query = self.request.GET.copy()
+        query.pop("cursor", None)
+        query.pop("page", None)
+        context["first_page_query"] = query.urlencode()
+        for name, cursor in (
+            ("previous_page_query", page.previous_cursor),
+            ("next_page_query", page.next_cursor),
+        ):
+            if cursor:
+                query["cursor"] = cursor
+                context[name] = query.urlencode()
+
         # Передаємо параметри пошуку в контекст для збереження в формі
         context["search_query"] = self.request.GET.get("search", "")
         context["selected_status"] = self.request.GET.get("status", "")
@@ -303,39 +451,39 @@ class TrainingListView(ListView):
         context["date_from"] = self.request.GET.get("date_from", "")
         context["date_to"] = self.request.GET.get("date_to", "")
 
-        # Додаємо статистику
-        context["total_trainings"] = TrainingEvent.objects.count()
-        context["upcoming_trainings"] = TrainingEvent.objects.filter(
-            date__gte=timezone.now(), is_cancelled=False
-        ).count()
-        context["past_trainings"] = TrainingEvent.objects.filter(
-            date__lt=timezone.now()
-        ).count()
-
-        # Унікальні локації для фільтра
-        context["locations"] = (
-            TrainingEvent.objects.values_list("location", flat=True)
-            .distinct()
-            .order_by("location")
-        )
-
-        # Унікальні дистанції для фільтра
-        context["distances"] = (
-            TrainingDistance.objects.values_list("distance", flat=True)
-            .distinct()
-            .order_by("distance")
-        )
+        return context
 
-        # Організатори для фільтра
-        context["organizers"] = (
-            TrainingEvent.objects.select_related("created_by")
-            .values(
-                "created_by__id",
-                "created_by__first_name",
-                "created_by__last_name",
+    @staticmethod
+    def get_training_cards(trainings):
+        """HTML карток тренувань сторінки з кешу або щойно відрендерені"""
+        trainings = {training.pk: training for training in trainings}
+        now = timezone.now()
+
+        # Час до початку на картці точний до години
+        variants = {}
+        for training in trainings.values():
+            hours = (training.date - now) // timedelta(hours=1)
+            variants[training.pk] = "past" if hours < 0 else f"h{hours}"
+
+        def load(training_ids):
+            missing = [trainings[pk] for pk in training_ids]
+            prefetch_related_objects(
+                missing,
+                Prefetch(
+                    "distances",
+                    queryset=TrainingDistance.objects.order_by("distance"),
+                ),
             )
-            .distinct()
-            .order_by("created_by__first_name")
+            return missing
+
+        return render_training_cards(
+            "training_events/training_card.html", trainings, load, variants
         )
 
-        return context
+
+class TrainingFacetsView(View):
+    """Значення фільтрів списку тренувань з кількістю тренувань (JSON)."""
+
+    async def get(self, request, *args, **kwargs):
+        facets = await sync_to_async(FacetService.get_facets)()
+        return JsonResponse(facets)